@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import BulkImportResult, BulkRowResult
+
+# Content types accepted by the bulk import endpoints
+JSON_TYPES = ("application/json",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv", "application/csv")
+
+# OpenAPI description of the raw upload body, which FastAPI can't infer
+BULK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+def parse_rows(content_type: str, body: bytes) -> List[Dict[str, Any]]:
+    """Parse a JSON array, NDJSON or CSV upload into raw row dicts"""
+    media_type = content_type.split(";")[0].strip().lower()
+    text = body.decode("utf-8-sig")
+
+    if media_type in NDJSON_TYPES:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    if media_type in CSV_TYPES:
+        # Empty cells mean "use the default", not an empty string
+        return [
+            {key: value for key, value in row.items() if value != ""}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+
+    if media_type in JSON_TYPES or not media_type:
+        rows = json.loads(text)
+        if not isinstance(rows, list):
+            raise ValueError("Expected a JSON array of objects")
+        return rows
+
+    raise ValueError(f"Unsupported content type '{media_type}'")
+
+
+def validate_rows(
+    schema: Type[BaseModel], rows: List[Any]
+) -> Tuple[List[Tuple[int, BaseModel]], List[BulkRowResult]]:
+    """Validate raw rows against a schema.
+
+    Returns the (row index, model) pairs that passed and an error result
+    for each row that did not.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+                for err in e.errors()
+            )
+            errors.append(BulkRowResult(index=index, status="error", error=message))
+    return valid, errors
+
+
+async def run_import(
+    db: AsyncSession,
+    schema: Type[BaseModel],
+    rows: List[Any],
+    create_many: Callable[..., Awaitable[Tuple[List[BulkRowResult], bool]]],
+    atomic: bool,
+    progress: Optional[Callable[[int, int], None]] = None,
+    chunk_size: int = 1000,
+) -> BulkImportResult:
+    """Validate rows and hand the valid ones to a crud bulk create function.
+
+    With `progress`, partial imports are handed over `chunk_size` rows at
+    a time and progress(rows done, total rows) is called after each
+    chunk is committed. Atomic imports are all one transaction, so
+    progress is only reported once they are done.
+    """
+    valid, results = validate_rows(schema, rows)
+
+    if atomic and results:
+        # All-or-nothing: a single invalid row means nothing is written
+        results += [BulkRowResult(index=index, status="skipped") for index, _ in valid]
+        committed = False
+    elif progress is None or atomic:
+        created, committed = await create_many(db, valid, atomic=atomic)
+        results += created
+    else:
+        # Each chunk commits on its own either way; emails repeated in a
+        # later chunk are then caught as already existing
+        committed = False
+        done = len(results)
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            created, chunk_committed = await create_many(db, chunk, atomic=False)
+            results += created
+            committed = committed or chunk_committed
+            done += len(chunk)
+            progress(done, len(rows))
+
+    if progress is not None:
+        progress(len(rows), len(rows))
+    results.sort(key=lambda result: result.index)
+    created_count = sum(1 for result in results if result.status == "created")
+    return BulkImportResult(
+        created=created_count,
+        failed=sum(1 for result in results if result.status == "error"),
+        committed=committed,
+        results=results,
+    )
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol
+
+
+class CacheBackend(Protocol):
+    """The subset of the redis.asyncio client API the caches rely on"""
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> Any: ...
+
+    async def delete(self, *keys: str) -> int: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class MemoryBackend:
+    """In-process backend with per-entry TTL and LRU eviction.
+
+    Each worker process gets its own copy, so a write in one worker only
+    invalidates that worker's entries; others see it once their TTL lapses.
+    Use a shared backend such as Redis when that staleness matters.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Counters live outside the LRU so a generation number is never evicted
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        if key in self._counters:
+            return str(self._counters[key])
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(
+            (self._entries.pop(key, None) or self._counters.pop(key, None)) is not None
+            for key in keys
+        )
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReadThroughCache:
+    """JSON read-through cache over a CacheBackend with hit/miss counters.
+
+    Invalidation is generational: every key embeds the current generation
+    number, and `invalidate()` bumps it so all earlier entries are ignored
+    and left to expire. This keeps invalidation a single write even when
+    the affected keys (e.g. a renamed department's old name) are unknown.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend, ttl: int):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def generation(self) -> str:
+        """The current generation, to read under and then fill a miss under"""
+        return await self.backend.get(f"{self.namespace}:generation") or "0"
+
+    async def _key(self, key: str, generation: Optional[str]) -> str:
+        if generation is None:
+            generation = await self.generation()
+        return f"{self.namespace}:{generation}:{key}"
+
+    async def get(self, key: str, generation: Optional[str] = None) -> Optional[Any]:
+        raw = await self.backend.get(await self._key(key, generation))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, generation: Optional[str] = None) -> None:
+        """Store a value loaded after a miss.
+
+        Pass the generation read before the value was loaded: if the
+        cache is invalidated in between, the value lands under the old
+        generation, where nobody reads it, instead of passing a stale
+        row off as current.
+        """
+        await self.backend.set(await self._key(key, generation), json.dumps(value, default=str), ex=self.ttl)
+
+    async def invalidate(self) -> None:
+        await self.backend.incr(f"{self.namespace}:generation")
+
+    async def reset(self) -> None:
+        """Drop all entries and zero the counters"""
+        await self.invalidate()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+        }
+
+
+def backend_from_env() -> CacheBackend:
+    """Redis when CACHE_REDIS_URL is set, otherwise an in-process backend"""
+    redis_url = os.getenv("CACHE_REDIS_URL")
+    if redis_url:
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' package is not installed")
+        return redis.from_url(redis_url, decode_responses=True)
+    return MemoryBackend(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1024")))
+
+
+department_cache = ReadThroughCache(
+    "hrms:departments",
+    backend_from_env(),
+    ttl=int(os.getenv("DEPARTMENT_CACHE_TTL", "60")),
+)
+
+# Dashboard aggregates; employee and department writes invalidate them,
+# and the short TTL bounds staleness from writes made by other processes
+stats_cache = ReadThroughCache(
+    "hrms:stats",
+    department_cache.backend,
+    ttl=int(os.getenv("STATS_CACHE_TTL", "15")),
+)
@@ -1,75 +1,738 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from sqlalchemy import (
+    ARRAY, Integer, Row, any_, bindparam, case, delete, insert, literal_column, or_, select, func, text,
+    tuple_, update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, selectinload
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple,
+)
 
 from app.models import Department, Employee
-from app.schemas import DepartmentCreate, EmployeeCreate
+from app import history
+from app.replicas import reads_replica
+from app.cache import department_cache, stats_cache
+from app.schemas import (
+    BulkRowResult, CompanyStats, DepartmentCreate, DepartmentHeadcount, DepartmentResponse,
+    DepartmentStats, DepartmentUpdate, EmployeeCreate, EmployeeFilter, EmployeeUpdate,
+)
+from app.pagination import EMPLOYEE_SORT_COLUMNS, parse_sort
+from app.search import FIELD_WEIGHTS, search_index
+from app.dataloader import session_loader
+
+# Rows per multi-row INSERT / transaction in bulk imports
+BULK_CHUNK_SIZE = 1000
+
+# How long an employee total stays cached before it is recounted
+EMPLOYEE_COUNT_TTL_SECONDS = 30.0
+# Filtered counts are keyed by client input, so only the most recently
+# used ones are kept
+EMPLOYEE_COUNT_CACHE_SIZE = 128
+
+_employee_count_cache: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+# Deepest reporting line the org chart queries follow. It also stops them
+# if a cycle ever got into the data some other way than through crud.
+MAX_REPORTING_DEPTH = 100
+
+# Serializes manager changes on Postgres, so two concurrent updates can't
+# each pass the cycle check and close a loop between them
+_ORG_CHART_LOCK_KEY = 0x4F52_4743
+
+# SQLSTATE codes (Postgres) and message fragments (SQLite) for constraint errors
+UNIQUE_VIOLATION = "unique"
+FOREIGN_KEY_VIOLATION = "foreign_key"
+_PG_CONSTRAINT_CODES = {"23505": UNIQUE_VIOLATION, "23503": FOREIGN_KEY_VIOLATION}
+_SQLITE_CONSTRAINT_MESSAGES = {
+    "UNIQUE constraint failed": UNIQUE_VIOLATION,
+    "FOREIGN KEY constraint failed": FOREIGN_KEY_VIOLATION,
+}
+
+
+class ReportingCycleError(ValueError):
+    """The new manager reports, directly or not, to the employee being updated.
+
+    Also raised when the new manager's reporting line is too deep to
+    follow to the top, since a cycle can't then be ruled out.
+    """
+
+
+def integrity_violation(error: IntegrityError) -> Optional[str]:
+    """Classify an IntegrityError as a unique or foreign key violation"""
+    code = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    if code in _PG_CONSTRAINT_CODES:
+        return _PG_CONSTRAINT_CODES[code]
+    message = str(error.orig)
+    for fragment, kind in _SQLITE_CONSTRAINT_MESSAGES.items():
+        if fragment in message:
+            return kind
+    return None
 
 
 # =============== Department CRUD ===============
 
+async def _departments_changed() -> None:
+    """Drop the cached departments and dashboard stats after a committed department write"""
+    await department_cache.invalidate()
+    await stats_cache.invalidate()
+
+
 async def create_department(db: AsyncSession, department: DepartmentCreate) -> Department:
-    """Create a new department"""
-    db_department = Department(**department.model_dump())
-    db.add(db_department)
-    await db.commit()
-    await db.refresh(db_department)
+    """Create a new department.
+
+    Uniqueness is enforced by the INSERT itself; on a duplicate name the
+    transaction is rolled back and the IntegrityError is re-raised.
+    """
+    try:
+        db_department = await db.scalar(
+            insert(Department).values(**department.model_dump()).returning(Department)
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    await _departments_changed()
     return db_department
 
 
-async def get_departments(db: AsyncSession) -> List[Department]:
-    """Get all departments"""
-    result = await db.execute(select(Department))
-    return result.scalars().all()
+async def get_departments(db: AsyncSession) -> List[DepartmentResponse]:
+    """Get all departments, served from the department cache when warm"""
+    generation = await department_cache.generation()
+    cached = await department_cache.get("all", generation)
+    if cached is not None:
+        return [DepartmentResponse(**data) for data in cached]
+
+    result = await db.execute(select(Department).order_by(Department.id))
+    departments = [DepartmentResponse.model_validate(d) for d in result.scalars().all()]
+    if not reads_replica(db):
+        await department_cache.set("all", [d.model_dump() for d in departments], generation)
+    return departments
+
+
+async def _cached_department(db: AsyncSession, key: str, condition) -> Optional[DepartmentResponse]:
+    generation = await department_cache.generation()
+    cached = await department_cache.get(key, generation)
+    if cached is not None:
+        return DepartmentResponse(**cached)
+
+    result = await db.execute(select(Department).where(condition))
+    department = result.scalar_one_or_none()
+    if department is None:
+        # Misses aren't cached, so a department created elsewhere shows up at once
+        return None
+    response = DepartmentResponse.model_validate(department)
+    if not reads_replica(db):
+        await department_cache.set(key, response.model_dump(), generation)
+    return response
+
+
+def id_in(db: AsyncSession, column, ids: Sequence[int]):
+    """`column = ANY(:ids)` on PostgreSQL, `column IN (...)` elsewhere.
+
+    The array form binds every id as one parameter, so the statement
+    text (and asyncpg's prepared statement for it) is the same whatever
+    the number of ids.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return column == any_(bindparam("ids", list(ids), type_=ARRAY(Integer), unique=True))
+    return column.in_(ids)
+
+
+async def get_departments_by_ids(db: AsyncSession, ids: Iterable[int]) -> Dict[int, DepartmentResponse]:
+    """Departments keyed by id; ids that don't exist are left out.
+
+    Cached departments are served from the cache and the rest are
+    fetched with one query.
+    """
+    found: Dict[int, DepartmentResponse] = {}
+    misses = []
+    generation = await department_cache.generation()
+    for department_id in dict.fromkeys(ids):
+        cached = await department_cache.get(f"id:{department_id}", generation)
+        if cached is not None:
+            found[department_id] = DepartmentResponse(**cached)
+        else:
+            misses.append(department_id)
+    if misses:
+        result = await db.execute(select(Department).where(id_in(db, Department.id, misses)))
+        for department in result.scalars():
+            response = DepartmentResponse.model_validate(department)
+            if not reads_replica(db):
+                await department_cache.set(f"id:{department.id}", response.model_dump(), generation)
+            found[department.id] = response
+    return found
+
+
+async def get_department_by_id(db: AsyncSession, department_id: int) -> Optional[DepartmentResponse]:
+    """Get a department by ID.
+
+    Lookups made concurrently on one session (e.g. under asyncio.gather)
+    are merged into a single get_departments_by_ids call.
+    """
+    return await session_loader(db, "departments", get_departments_by_ids).load(department_id)
+
+
+async def get_department_by_name(db: AsyncSession, name: str) -> Optional[DepartmentResponse]:
+    """Get a department by name"""
+    return await _cached_department(db, f"name:{name}", Department.name == name)
+
+
+async def update_department(
+    db: AsyncSession, department_id: int, changes: DepartmentUpdate
+) -> Optional[Department]:
+    """Apply a partial update; returns None if the department doesn't exist.
+
+    Re-raises IntegrityError (after rolling back) on a duplicate name.
+    """
+    values = changes.model_dump(exclude_unset=True)
+    if not values:
+        result = await db.execute(select(Department).where(Department.id == department_id))
+        return result.scalar_one_or_none()
+    try:
+        department = await db.scalar(
+            update(Department).where(Department.id == department_id).values(**values).returning(Department)
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    if department is not None:
+        await _departments_changed()
+    return department
+
+
+async def delete_department(db: AsyncSession, department_id: int, actor: Optional[str] = None) -> bool:
+    """Delete a department and its employees.
+
+    The employees are deleted first with DELETE ... RETURNING id, so each
+    gets a "deleted" event without being loaded into the session; ON
+    DELETE CASCADE still covers any added in between. Their reports in
+    other departments are left without a manager, with events of their own.
+    """
+    now = datetime.now(timezone.utc)
+    members = select(Employee.id).where(Employee.department_id == department_id)
+    await _update_recording_events(
+        db,
+        update(Employee).where(Employee.manager_id.in_(members), Employee.department_id != department_id),
+        {"manager_id": None},
+        actor,
+    )
+    employee_ids = (await db.execute(
+        delete(Employee).where(Employee.department_id == department_id).returning(Employee.id)
+    )).scalars().all()
+    result = await db.execute(delete(Department).where(Department.id == department_id))
+    await history.record(db, [history.deleted(employee_id, now, actor) for employee_id in employee_ids])
+    await db.commit()
+    if not result.rowcount:
+        return False
+    await department_cache.invalidate()
+    await _employees_changed()
+    for employee_id in employee_ids:
+        search_index.track_remove(employee_id)
+    return True
 
 
-async def get_department_by_id(db: AsyncSession, department_id: int) -> Optional[Department]:
-    """Get a department by ID"""
+async def get_department_employees(
+    db: AsyncSession, department_ids: List[int], per_department: int = 100
+) -> Dict[int, List[Employee]]:
+    """Get the first `per_department` employees of each department.
+
+    A single query ranks employees within their department with
+    ROW_NUMBER() and keeps the top rows, so embedding employees in a
+    department listing costs one query rather than one per department.
+    """
+    ranked = (
+        select(
+            Employee,
+            func.row_number().over(
+                partition_by=Employee.department_id, order_by=Employee.id
+            ).label("position"),
+        )
+        .where(Employee.department_id.in_(department_ids))
+        .subquery()
+    )
+    ranked_employee = aliased(Employee, ranked)
     result = await db.execute(
-        select(Department).where(Department.id == department_id)
+        select(ranked_employee)
+        .where(ranked.c.position <= per_department)
+        .order_by(ranked.c.department_id, ranked.c.id)
     )
-    return result.scalar_one_or_none()
 
+    grouped: Dict[int, List[Employee]] = {department_id: [] for department_id in department_ids}
+    for employee in result.scalars():
+        grouped[employee.department_id].append(employee)
+    return grouped
 
-async def get_department_by_name(db: AsyncSession, name: str) -> Optional[Department]:
-    """Get a department by name"""
+
+async def get_department_stats(db: AsyncSession, department_id: int) -> DepartmentStats:
+    """Headcount, active count and role breakdown in one GROUP BY query"""
     result = await db.execute(
-        select(Department).where(Department.name == name)
+        select(
+            Employee.role,
+            func.count(),
+            func.sum(case((Employee.is_active, 1), else_=0)),
+        )
+        .where(Employee.department_id == department_id)
+        .group_by(Employee.role)
+    )
+    roles, headcount, active = {}, 0, 0
+    for role, count, active_count in result.all():
+        roles[role] = count
+        headcount += count
+        active += active_count or 0
+    return DepartmentStats(
+        department_id=department_id,
+        headcount=headcount,
+        active_count=active,
+        inactive_count=headcount - active,
+        roles=roles,
     )
-    return result.scalar_one_or_none()
 
 
 # =============== Employee CRUD ===============
 
-async def create_employee(db: AsyncSession, employee: EmployeeCreate) -> Employee:
-    """Create a new employee"""
-    db_employee = Employee(**employee.model_dump())
-    db.add(db_employee)
-    await db.commit()
-    await db.refresh(db_employee)
+async def create_employee(db: AsyncSession, employee: EmployeeCreate, actor: Optional[str] = None) -> Employee:
+    """Create a new employee.
+
+    Email uniqueness and the department foreign key are enforced by the
+    INSERT itself, and generated columns come back via RETURNING, so this
+    is a single round trip plus the "created" event and the commit. On a
+    constraint violation the transaction is rolled back and the
+    IntegrityError is re-raised.
+    """
+    try:
+        db_employee = await db.scalar(
+            insert(Employee).values(**employee.model_dump()).returning(Employee)
+        )
+        await history.record(db, [history.created(db_employee, actor)])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    await _employees_changed()
+    _index_employee(db_employee)
     return db_employee
 
 
-async def get_employees(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Employee]:
-    """Get all employees with pagination"""
-    result = await db.execute(
-        select(Employee)
-        .options(selectinload(Employee.department))
-        .offset(skip)
-        .limit(limit)
-    )
+async def _employees_changed() -> None:
+    """Drop the cached counts and dashboard stats after a committed employee write"""
+    _employee_count_cache.clear()
+    await stats_cache.invalidate()
+
+
+def _index_employee(employee: Employee) -> None:
+    """Keep the in-memory search index (if built) in step with a write"""
+    search_index.track_add(employee.id, employee.full_name, employee.email, employee.role)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filter_employees(query, filters: Optional[EmployeeFilter]):
+    """Apply the listing filters to an employee query"""
+    if filters is None:
+        return query
+    if filters.department_id is not None:
+        query = query.where(Employee.department_id == filters.department_id)
+    if filters.manager_id is not None:
+        query = query.where(Employee.manager_id == filters.manager_id)
+    if filters.role is not None:
+        query = query.where(Employee.role == filters.role)
+    if filters.is_active is not None:
+        query = query.where(Employee.is_active == filters.is_active)
+    if filters.joined_after is not None:
+        query = query.where(Employee.joined_date >= filters.joined_after)
+    if filters.joined_before is not None:
+        query = query.where(Employee.joined_date < filters.joined_before)
+    if filters.name:
+        query = query.where(
+            Employee.full_name.ilike(_escape_like(filters.name) + "%", escape="\\")
+        )
+    if filters.email:
+        query = query.where(
+            Employee.email.ilike(_escape_like(filters.email) + "%", escape="\\")
+        )
+    return query
+
+
+def paginate_employees(
+    query,
+    skip: int = 0,
+    limit: int = 100,
+    sort: str = "id",
+    after: Optional[Tuple[Any, int]] = None,
+):
+    """Order an employee query and apply offset or keyset pagination.
+
+    When `after` is given as a decoded (sort value, id) cursor, rows are
+    fetched with a `WHERE (sort_col, id) > (value, id)` seek instead of an
+    OFFSET, so the cost of a page does not grow with its depth.
+    """
+    column_name, descending = parse_sort(sort)
+    column = EMPLOYEE_SORT_COLUMNS[column_name]
+
+    if after is not None:
+        value, last_id = after
+        if column_name == "id":
+            key, bound = Employee.id, last_id
+        else:
+            key, bound = tuple_(column, Employee.id), tuple_(value, last_id)
+        query = query.where(key < bound if descending else key > bound)
+    elif skip:
+        query = query.offset(skip)
+
+    if column_name == "id":
+        order_by = [Employee.id.desc() if descending else Employee.id]
+    elif descending:
+        order_by = [column.desc(), Employee.id.desc()]
+    else:
+        order_by = [column, Employee.id]
+
+    return query.order_by(*order_by).limit(limit)
+
+
+async def get_employees(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    sort: str = "id",
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[EmployeeFilter] = None,
+) -> List[Employee]:
+    """Get employees matching the filters, with offset or keyset pagination"""
+    query = select(Employee).options(selectinload(Employee.department))
+    query = paginate_employees(filter_employees(query, filters), skip, limit, sort, after)
+    result = await db.execute(query)
     return result.scalars().all()
 
 
+async def get_employee_rows(
+    db: AsyncSession,
+    fields: List[str],
+    skip: int = 0,
+    limit: int = 100,
+    sort: str = "id",
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[EmployeeFilter] = None,
+) -> List[Row]:
+    """Get employees as rows holding only the requested columns.
+
+    The id and sort column are always selected as well so the caller can
+    build a cursor for the next page, and updated_at for the page's ETag.
+    """
+    column_name, _ = parse_sort(sort)
+    names = list(dict.fromkeys(["id", column_name, "updated_at", *fields]))
+    query = select(*(getattr(Employee, name) for name in names))
+    query = paginate_employees(filter_employees(query, filters), skip, limit, sort, after)
+    result = await db.execute(query)
+    return result.all()
+
+
+async def stream_employee_rows(
+    db: AsyncSession,
+    fields: List[str],
+    filters: Optional[EmployeeFilter] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[List[Row]]:
+    """Stream matching employees in id order as batches of column rows.
+
+    Uses a server-side cursor, so only one batch is held in memory at a
+    time no matter how many rows match.
+    """
+    query = filter_employees(
+        select(*(getattr(Employee, name) for name in fields)), filters
+    ).order_by(Employee.id)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+async def search_employees(db: AsyncSession, q: str, limit: int = 20) -> List[Tuple[Employee, float]]:
+    """Rank employees by fuzzy match of `q` against name, email and role.
+
+    On PostgreSQL this is a trigram word-similarity query served by the
+    GIN trigram indexes (matches are cut off at the server's
+    pg_trgm.word_similarity_threshold). Elsewhere the in-process
+    TrigramIndex from app.search is used, built from the table on first
+    search. Returns (employee, score) pairs, best first.
+    """
+    if db.bind.dialect.name == "postgresql":
+        scores = [
+            func.word_similarity(q, getattr(Employee, field)) * weight
+            for field, weight in FIELD_WEIGHTS.items()
+        ]
+        score = func.greatest(*scores).label("score")
+        result = await db.execute(
+            select(Employee, score)
+            .where(or_(*(getattr(Employee, field).op("%>")(q) for field in FIELD_WEIGHTS)))
+            .order_by(score.desc(), Employee.id)
+            .limit(limit)
+        )
+        return [(employee, round(value, 4)) for employee, value in result.all()]
+
+    await search_index.ensure_loaded(
+        lambda: stream_employee_rows(db, ["id", "full_name", "email", "role"], batch_size=5000)
+    )
+    ranked = search_index.search(q, limit)
+    if not ranked:
+        return []
+    result = await db.execute(select(Employee).where(Employee.id.in_([id_ for id_, _ in ranked])))
+    employees = {employee.id: employee for employee in result.scalars()}
+    return [(employees[id_], score) for id_, score in ranked if id_ in employees]
+
+
+async def count_employees(
+    db: AsyncSession,
+    exact: bool = False,
+    filters: Optional[EmployeeFilter] = None,
+) -> Tuple[int, bool]:
+    """Count employees, returning (total, is_estimate).
+
+    On PostgreSQL the planner's row estimate from pg_class is used for the
+    unfiltered total unless an exact count is requested. Exact counts are
+    cached for a short TTL so a dashboard polling the total does not
+    trigger a full scan per request.
+    """
+    has_filters = filters is not None and filters.is_set()
+    if not exact and not has_filters and db.bind.dialect.name == "postgresql":
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'employees'")
+        )
+        estimate = result.scalar_one_or_none()
+        # reltuples is -1 until the table has been vacuumed/analyzed
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+
+    cache_key = filters.model_dump_json() if has_filters else "total"
+    cached = _employee_count_cache.get(cache_key)
+    if cached:
+        if time.monotonic() - cached[1] < EMPLOYEE_COUNT_TTL_SECONDS:
+            _employee_count_cache.move_to_end(cache_key)
+            return cached[0], False
+        del _employee_count_cache[cache_key]
+
+    query = filter_employees(select(func.count()).select_from(Employee), filters)
+    total = (await db.execute(query)).scalar_one()
+    _employee_count_cache[cache_key] = (total, time.monotonic())
+    _employee_count_cache.move_to_end(cache_key)
+    while len(_employee_count_cache) > EMPLOYEE_COUNT_CACHE_SIZE:
+        _employee_count_cache.popitem(last=False)
+    return total, False
+
+
+async def get_employees_by_ids(
+    db: AsyncSession, ids: Iterable[int], with_department: bool = False
+) -> Dict[int, Employee]:
+    """Employees keyed by id, fetched with one query; missing ids are left out"""
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return {}
+    query = select(Employee).where(id_in(db, Employee.id, ids))
+    if with_department:
+        query = query.options(selectinload(Employee.department))
+    result = await db.execute(query)
+    return {employee.id: employee for employee in result.scalars()}
+
+
+async def _load_employees(db: AsyncSession, ids: List[int]) -> Dict[int, Employee]:
+    return await get_employees_by_ids(db, ids, with_department=True)
+
+
 async def get_employee_by_id(db: AsyncSession, employee_id: int) -> Optional[Employee]:
-    """Get an employee by ID"""
+    """Get an employee by ID, with its department loaded.
+
+    Lookups made concurrently on one session are merged into one query.
+    """
+    return await session_loader(db, "employees", _load_employees).load(employee_id)
+
+
+async def update_employee(
+    db: AsyncSession, employee_id: int, changes: EmployeeUpdate, actor: Optional[str] = None
+) -> Optional[Employee]:
+    """Apply a partial update as one UPDATE ... RETURNING plus its event.
+
+    Returns None if the employee doesn't exist. Like create_employee, a
+    duplicate email or unknown department or manager surfaces as an
+    IntegrityError. Raises ReportingCycleError if the new manager is the
+    employee or one of their (indirect) reports.
+    """
+    values = changes.model_dump(exclude_unset=True)
+    if not values:
+        return await get_employee_by_id(db, employee_id)
+    if values.get("manager_id") is not None:
+        if db.bind.dialect.name == "postgresql":
+            await db.execute(select(func.pg_advisory_xact_lock(_ORG_CHART_LOCK_KEY)))
+        below = await reports_to(db, values["manager_id"], employee_id)
+        if below is not False:
+            await db.rollback()
+            raise ReportingCycleError(
+                f"Employee {values['manager_id']} reports to employee {employee_id}" if below else
+                f"Employee {values['manager_id']} is more than {MAX_REPORTING_DEPTH} levels below the top"
+            )
+    try:
+        employee = await db.scalar(
+            update(Employee).where(Employee.id == employee_id).values(**values).returning(Employee)
+        )
+        if employee is not None:
+            await history.record(db, [history.updated(employee.id, values, employee.updated_at, actor)])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    if employee is not None:
+        await _employees_changed()
+        _index_employee(employee)
+    return employee
+
+
+async def delete_employee(db: AsyncSession, employee_id: int, actor: Optional[str] = None) -> bool:
+    """Delete an employee; returns False if it didn't exist.
+
+    Their direct reports are left without a manager (as ON DELETE SET
+    NULL would), with an event each.
+    """
+    await _update_recording_events(
+        db, update(Employee).where(Employee.manager_id == employee_id), {"manager_id": None}, actor
+    )
+    deleted_id = await db.scalar(delete(Employee).where(Employee.id == employee_id).returning(Employee.id))
+    if deleted_id is None:
+        # Nobody reports to an employee that doesn't exist, so nothing changed
+        await db.rollback()
+        return False
+    await history.record(db, [history.deleted(deleted_id, datetime.now(timezone.utc), actor)])
+    await db.commit()
+    await _employees_changed()
+    search_index.track_remove(employee_id)
+    return True
+
+
+async def _update_recording_events(db: AsyncSession, query, values: dict, actor: Optional[str]) -> int:
+    """Run a set-based UPDATE and record an event for every row it changed.
+
+    RETURNING hands back only the ids and new timestamps; their events
+    go in with one executemany, in the same transaction. The caller commits.
+    """
     result = await db.execute(
-        select(Employee)
-        .options(selectinload(Employee.department))
+        query.values(**values)
+        .returning(Employee.id, Employee.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    await history.record(db, [history.updated(id_, values, at, actor) for id_, at in rows])
+    return len(rows)
+
+
+async def deactivate_employees(db: AsyncSession, filters: EmployeeFilter, actor: Optional[str] = None) -> int:
+    """Deactivate every active employee matching the filters in one UPDATE"""
+    query = filter_employees(update(Employee), filters).where(Employee.is_active.is_(True))
+    affected = await _update_recording_events(db, query, {"is_active": False}, actor)
+    await db.commit()
+    await _employees_changed()
+    return affected
+
+
+async def reassign_employees(
+    db: AsyncSession,
+    from_department_id: int,
+    to_department_id: int,
+    actor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> int:
+    """Move every employee of one department to another in one UPDATE.
+
+    With `limit`, only the first `limit` of them (by id) are moved, so a
+    large department can be moved in short transactions by repeating
+    the call until it moves fewer than `limit`.
+    """
+    query = update(Employee).where(Employee.department_id == from_department_id)
+    if limit is not None:
+        query = query.where(Employee.id.in_(
+            select(Employee.id)
+            .where(Employee.department_id == from_department_id)
+            .order_by(Employee.id)
+            .limit(limit)
+        ))
+    affected = await _update_recording_events(db, query, {"department_id": to_department_id}, actor)
+    await db.commit()
+    await _employees_changed()
+    return affected
+
+
+# =============== Org Chart ===============
+
+def _chain_cte(employee_id: int):
+    """The employee (depth 0), their manager (depth 1) and so on up to the top"""
+    chain = (
+        select(Employee.id, Employee.manager_id, literal_column("0", Integer).label("depth"))
         .where(Employee.id == employee_id)
+        .cte("chain", recursive=True)
+    )
+    return chain.union_all(
+        select(Employee.id, Employee.manager_id, chain.c.depth + 1)
+        .where(Employee.id == chain.c.manager_id, chain.c.depth < MAX_REPORTING_DEPTH)
     )
-    return result.scalar_one_or_none()
+
+
+async def reports_to(db: AsyncSession, employee_id: int, manager_id: int) -> Optional[bool]:
+    """Whether `employee_id` is `manager_id` or somewhere below them.
+
+    None if neither `manager_id` nor the top of the chain turns up within
+    MAX_REPORTING_DEPTH levels, so the answer isn't known.
+    """
+    chain = _chain_cte(employee_id)
+    found, cut_off = (await db.execute(select(
+        func.count().filter(chain.c.id == manager_id),
+        func.count().filter(chain.c.depth == MAX_REPORTING_DEPTH, chain.c.manager_id.is_not(None)),
+    ))).one()
+    if found:
+        return True
+    return None if cut_off else False
+
+
+async def get_reporting_chain(db: AsyncSession, employee_id: int, fields: List[str]) -> List[Row]:
+    """An employee's managers, nearest first, in one recursive query"""
+    chain = _chain_cte(employee_id)
+    result = await db.execute(
+        select(*(getattr(Employee, name) for name in fields), chain.c.depth)
+        .join(chain, Employee.id == chain.c.id)
+        .where(chain.c.depth > 0)
+        .order_by(chain.c.depth)
+    )
+    return result.all()
+
+
+async def get_org_subtree(
+    db: AsyncSession, employee_id: int, fields: List[str], max_depth: Optional[int] = None
+) -> List[Row]:
+    """Everyone reporting to an employee, directly or not, level by level.
+
+    A recursive CTE walks down the manager_id index inside the database,
+    so a subtree of any size costs one round trip; only the id and depth
+    are carried through the recursion and the requested columns are
+    joined on once at the end.
+    """
+    depth_limit = min(max_depth or MAX_REPORTING_DEPTH, MAX_REPORTING_DEPTH)
+    tree = (
+        select(Employee.id, literal_column("1", Integer).label("depth"))
+        .where(Employee.manager_id == employee_id)
+        .cte("subtree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(Employee.id, tree.c.depth + 1)
+        .where(Employee.manager_id == tree.c.id, tree.c.depth < depth_limit)
+    )
+    result = await db.execute(
+        select(*(getattr(Employee, name) for name in fields), tree.c.depth)
+        .join(tree, Employee.id == tree.c.id)
+        .order_by(tree.c.depth, Employee.id)
+    )
+    return result.all()
 
 
 async def get_employee_by_email(db: AsyncSession, email: str) -> Optional[Employee]:
@@ -78,3 +741,238 @@ async def get_employee_by_email(db: AsyncSession, email: str) -> Optional[Employ
         select(Employee).where(Employee.email == email)
     )
     return result.scalar_one_or_none()
+
+
+# =============== Stats ===============
+
+async def get_company_stats(db: AsyncSession, recent_days: int = 30) -> CompanyStats:
+    """Company-wide counts and breakdowns, computed with COUNT/GROUP BY.
+
+    Results are cached for a short TTL so dashboard polling doesn't
+    re-aggregate the employees table on every page view.
+    """
+    cache_key = f"company:{recent_days}"
+    generation = await stats_cache.generation()
+    cached = await stats_cache.get(cache_key, generation)
+    if cached is not None:
+        return CompanyStats(**cached)
+
+    is_active = case((Employee.is_active, 1), else_=0)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=recent_days)
+    total, active, recent = (await db.execute(
+        select(
+            func.count(Employee.id),
+            func.coalesce(func.sum(is_active), 0),
+            func.coalesce(func.sum(case((Employee.joined_date >= cutoff, 1), else_=0)), 0),
+        )
+    )).one()
+
+    by_role = dict((await db.execute(
+        select(Employee.role, func.count()).group_by(Employee.role).order_by(Employee.role)
+    )).all())
+
+    per_department = (await db.execute(
+        select(
+            Department.id,
+            Department.name,
+            func.count(Employee.id),
+            func.coalesce(func.sum(is_active), 0),
+        )
+        .outerjoin(Employee, Employee.department_id == Department.id)
+        .group_by(Department.id, Department.name)
+        .order_by(Department.id)
+    )).all()
+
+    stats = CompanyStats(
+        total_departments=len(per_department),
+        total_employees=total,
+        active_employees=active,
+        inactive_employees=total - active,
+        recent_joiners=recent,
+        recent_days=recent_days,
+        by_role=by_role,
+        by_department=[
+            DepartmentHeadcount(department_id=id_, name=name, headcount=count, active_count=active_count)
+            for id_, name, count, active_count in per_department
+        ],
+    )
+    if not reads_replica(db):
+        await stats_cache.set(cache_key, stats.model_dump(), generation)
+    return stats
+
+
+# =============== Bulk Import ===============
+
+ConflictCheck = Callable[[AsyncSession, list, Set[Any]], Awaitable[Dict[int, str]]]
+AfterInsert = Callable[[AsyncSession, List[Row]], Awaitable[None]]
+
+
+async def _bulk_insert(
+    db: AsyncSession,
+    model,
+    items: List[Tuple[int, Any]],
+    find_conflicts: ConflictCheck,
+    atomic: bool,
+    chunk_size: int,
+    after_insert: Optional[AfterInsert] = None,
+) -> Tuple[List[BulkRowResult], bool]:
+    """Insert validated rows in chunks with multi-row INSERT ... RETURNING.
+
+    `find_conflicts` checks one chunk with set-based queries and returns
+    {row index: error}. In atomic mode every chunk is checked before
+    anything is written and all chunks share one transaction; otherwise
+    each chunk is committed on its own and bad rows are skipped.
+    `after_insert` gets each chunk's inserted rows (every column) before
+    the chunk is committed.
+    Returns the per-row results and whether anything was committed.
+    """
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results: Dict[int, BulkRowResult] = {}
+    seen: Set[Any] = set()
+
+    if atomic:
+        for chunk in chunks:
+            for index, error in (await find_conflicts(db, chunk, seen)).items():
+                results[index] = BulkRowResult(index=index, status="error", error=error)
+        if results:
+            await db.rollback()
+            for index, _ in items:
+                results.setdefault(index, BulkRowResult(index=index, status="skipped"))
+            return list(results.values()), False
+
+    committed = False
+    for chunk in chunks:
+        conflicts = {} if atomic else await find_conflicts(db, chunk, seen)
+        for index, error in conflicts.items():
+            results[index] = BulkRowResult(index=index, status="error", error=error)
+        rows = [(index, item) for index, item in chunk if index not in conflicts]
+        if not rows:
+            continue
+
+        try:
+            result = await db.execute(
+                insert(model).returning(*model.__table__.c, sort_by_parameter_order=True),
+                [item.model_dump() for _, item in rows],
+            )
+            inserted = result.all()
+            ids = [row.id for row in inserted]
+            if after_insert is not None:
+                await after_insert(db, inserted)
+            if not atomic:
+                await db.commit()
+                committed = True
+        except IntegrityError:
+            # Lost a race with a concurrent writer between check and insert
+            await db.rollback()
+            failed = chunks if atomic else [rows]
+            for batch in failed:
+                for index, _ in batch:
+                    results[index] = BulkRowResult(
+                        index=index, status="error", error="Conflicting concurrent write, retry"
+                    )
+            if atomic:
+                return list(results.values()), False
+            continue
+
+        for (index, _), new_id in zip(rows, ids):
+            results[index] = BulkRowResult(index=index, status="created", id=new_id)
+
+    if atomic and items:
+        await db.commit()
+        committed = True
+    return list(results.values()), committed
+
+
+async def _employee_conflicts(
+    db: AsyncSession, chunk: List[Tuple[int, EmployeeCreate]], seen: Set[Any]
+) -> Dict[int, str]:
+    """Find duplicate emails and missing departments or managers for a chunk of employees"""
+    emails = {item.email for _, item in chunk}
+    department_ids = {item.department_id for _, item in chunk}
+    manager_ids = {item.manager_id for _, item in chunk if item.manager_id is not None}
+    taken = set((await db.execute(
+        select(Employee.email).where(Employee.email.in_(emails))
+    )).scalars())
+    existing_departments = set((await db.execute(
+        select(Department.id).where(Department.id.in_(department_ids))
+    )).scalars())
+    existing_managers = set((await db.execute(
+        select(Employee.id).where(Employee.id.in_(manager_ids))
+    )).scalars()) if manager_ids else set()
+
+    conflicts = {}
+    for index, item in chunk:
+        if item.email in taken or item.email in seen:
+            conflicts[index] = f"Employee with email '{item.email}' already exists"
+        elif item.department_id not in existing_departments:
+            conflicts[index] = f"Department with id {item.department_id} not found"
+        elif item.manager_id is not None and item.manager_id not in existing_managers:
+            conflicts[index] = f"Manager with id {item.manager_id} not found"
+        else:
+            # Only rows that will be inserted claim their email
+            seen.add(item.email)
+    return conflicts
+
+
+async def _department_conflicts(
+    db: AsyncSession, chunk: List[Tuple[int, DepartmentCreate]], seen: Set[Any]
+) -> Dict[int, str]:
+    """Find duplicate names for a chunk of departments"""
+    names = {item.name for _, item in chunk}
+    taken = set((await db.execute(
+        select(Department.name).where(Department.name.in_(names))
+    )).scalars())
+
+    conflicts = {}
+    for index, item in chunk:
+        if item.name in taken or item.name in seen:
+            conflicts[index] = f"Department with name '{item.name}' already exists"
+        seen.add(item.name)
+    return conflicts
+
+
+async def bulk_create_employees(
+    db: AsyncSession,
+    items: List[Tuple[int, EmployeeCreate]],
+    atomic: bool = False,
+    chunk_size: Optional[int] = None,
+    actor: Optional[str] = None,
+) -> Tuple[List[BulkRowResult], bool]:
+    """Create many employees, given (row index, employee) pairs"""
+    async def record_created(db: AsyncSession, rows: List[Row]) -> None:
+        await history.record(db, [history.created(row, actor) for row in rows])
+
+    results, committed = await _bulk_insert(
+        db, Employee, items, _employee_conflicts, atomic, chunk_size or BULK_CHUNK_SIZE, record_created
+    )
+    if committed:
+        await _employees_changed()
+        employees = dict(items)
+        for result in results:
+            if result.status == "created":
+                employee = employees[result.index]
+                search_index.track_add(result.id, employee.full_name, employee.email, employee.role)
+    return results, committed
+
+
+async def bulk_create_departments(
+    db: AsyncSession,
+    items: List[Tuple[int, DepartmentCreate]],
+    atomic: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Tuple[List[BulkRowResult], bool]:
+    """Create many departments, given (row index, department) pairs"""
+    results, committed = await _bulk_insert(
+        db, Department, items, _department_conflicts, atomic, chunk_size or BULK_CHUNK_SIZE
+    )
+    if committed:
+        await _departments_changed()
+    return results, committed
+
+
+async def reset_caches() -> None:
+    """Empty every crud-level cache"""
+    _employee_count_cache.clear()
+    search_index.clear()
+    await department_cache.reset()
+    await stats_cache.reset()
@@ -1,8 +1,14 @@
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from typing import Callable, List, Optional
 import os
+import time
 from dotenv import load_dotenv
 
+from app.metrics import pool_wait_seconds, pool_waiting
+
 # Load environment variables
 load_dotenv()
 
@@ -12,20 +18,98 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-# Convert postgresql:// to postgresql+asyncpg:// for async support
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-# Create async SQLAlchemy engine
-engine: AsyncEngine = create_async_engine(
-    DATABASE_URL,
-    echo=True,  # Set to False in production
-    future=True
-)
+def async_url(url: str) -> str:
+    """Convert postgresql:// to postgresql+asyncpg:// for async support"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+DATABASE_URL = async_url(DATABASE_URL)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Connection pool settings. Size the pool so that
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under the server's
+# (or pgbouncer's) connection limit.
+POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 5)
+POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 10)
+POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+# asyncpg caches prepared statements per connection. That breaks behind
+# pgbouncer in transaction mode (e.g. Supabase's pooler on port 6543),
+# where it must be set to 0.
+STATEMENT_CACHE_SIZE = _env_int("DB_STATEMENT_CACHE_SIZE", 100)
+ECHO_SQL = _env_bool("DB_ECHO", False)
+
+
+def engine_options(url: str) -> dict:
+    """create_async_engine keyword arguments for a database URL"""
+    options = dict(
+        echo=ECHO_SQL,
+        future=True,
+        pool_pre_ping=POOL_PRE_PING,
+        pool_recycle=POOL_RECYCLE,
+    )
+    if url.startswith("sqlite") and ":memory:" not in url:
+        # aiosqlite defaults to NullPool; use a real pool so local runs pool like production
+        options["poolclass"] = AsyncAdaptedQueuePool
+    if not url.startswith("sqlite") or ":memory:" not in url:
+        options.update(
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+        )
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# Every engine made so far, and callbacks to run on each (see on_engine)
+_engines: List[AsyncEngine] = []
+_engine_hooks: List[Callable[[AsyncEngine], None]] = []
 
-# Create async session factory
+
+def on_engine(hook: Callable[[AsyncEngine], None]) -> None:
+    """Run `hook` on every engine, whether it already exists or is made later"""
+    _engine_hooks.append(hook)
+    for existing in _engines:
+        hook(existing)
+
+
+def make_engine(url: str) -> AsyncEngine:
+    """An async engine (and its own connection pool) for a database URL"""
+    url = async_url(url)
+    new_engine = create_async_engine(url, **engine_options(url))
+    # SQLite (used for local tests/benchmarks) only enforces foreign keys when asked
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    _engines.append(new_engine)
+    for hook in _engine_hooks:
+        hook(new_engine)
+    return new_engine
+
+
+# Create async session factory; it is bound to the engine once that exists
 AsyncSessionLocal = async_sessionmaker(
-    engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -35,11 +119,58 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> AsyncEngine:
+    """The primary engine, which takes every write, created on first use.
+
+    Building it imports the database driver (asyncpg alone takes tens of
+    milliseconds), so it is left out of `import app.main` and made when
+    startup or the first request needs it.
+    """
+    global _engine
+    if _engine is None:
+        _engine = make_engine(DATABASE_URL)
+        AsyncSessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def engine_created() -> bool:
+    return _engine is not None
+
+
+def __getattr__(name: str):
+    # `from app.database import engine` still works; it creates the engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def open_session(bind: Optional[AsyncEngine] = None) -> AsyncSession:
+    """A session with its connection already checked out of the pool.
+
+    Checking out up front means pool wait time is measured, and a
+    database that can't be reached fails here rather than mid-request.
+    """
+    session = AsyncSessionLocal(bind=bind or get_engine())
+    pool_waiting.inc()
+    try:
+        start = time.perf_counter()
+        await session.connection()
+        pool_wait_seconds.observe(time.perf_counter() - start)
+    except BaseException:
+        await session.close()
+        raise
+    finally:
+        pool_waiting.dec()
+    return session
+
 
 # Dependency to get async database session
 async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+    session = await open_session()
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesce loads issued in the same event-loop tick into one batch call.
+
+    Every `load(key)` made before the loop gets round to the dispatch
+    callback (e.g. all the coroutines started by one asyncio.gather) is
+    answered by a single `batch_load(keys)` call, which returns
+    {key: value} and simply omits keys that don't exist. Keys are
+    de-duplicated; results are not cached between batches, so a load
+    after a write sees the write.
+    """
+
+    def __init__(self, batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]]):
+        self.batch_load = batch_load
+        self._pending: Dict[K, List[asyncio.Future]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            loop.call_soon(self._start_dispatch)
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        return future
+
+    async def load_many(self, keys: List[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _start_dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._dispatch(pending))
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, pending: Dict[K, List[asyncio.Future]]) -> None:
+        try:
+            results = await self.batch_load(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(key))
+
+
+def session_loader(db: AsyncSession, name: str, batch_load: Callable[[AsyncSession, list], Awaitable[dict]]) -> DataLoader:
+    """The request's loader called `name`, created on first use.
+
+    Loaders live in the session's `info` dict, and get_db opens one
+    session per request, so batching never crosses requests. Batches
+    for different loaders on the same session take turns, since a
+    session can only run one statement at a time.
+    """
+    loaders = db.info.setdefault("dataloaders", {})
+    loader = loaders.get(name)
+    if loader is None:
+        lock = db.info.setdefault("dataloader_lock", asyncio.Lock())
+
+        async def locked_batch_load(keys):
+            async with lock:
+                return await batch_load(db, keys)
+
+        loader = loaders[name] = DataLoader(locked_batch_load)
+    return loader
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import AsyncSessionLocal, get_engine
+from app.schemas import EmployeeFilter, EmployeeResponse
+from app import crud
+
+EXPORT_FIELDS: List[str] = list(EmployeeResponse.model_fields)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode_ndjson(rows) -> bytes:
+    lines = [
+        json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default, separators=(",", ":"))
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def export_employees(
+    fmt: str,
+    filters: Optional[EmployeeFilter] = None,
+    compress: bool = False,
+    batch_size: int = 1000,
+    bind: Optional[AsyncEngine] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> AsyncIterator[bytes]:
+    """Yield the employee directory as NDJSON or CSV chunks.
+
+    The generator opens its own session because it keeps running after the
+    request handler (and its `get_db` session) has returned. `bind` picks
+    the engine to read from (e.g. a replica); the default is the primary.
+    `progress` is called with the number of rows in each batch written.
+    """
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    # wbits=31 produces a gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(chunk: bytes) -> bytes:
+        return compressor.compress(chunk) if compressor else chunk
+
+    if fmt == "csv":
+        yield emit(_encode_csv([EXPORT_FIELDS]))
+
+    async with AsyncSessionLocal(bind=bind or get_engine()) as db:
+        async for rows in crud.stream_employee_rows(db, EXPORT_FIELDS, filters, batch_size):
+            chunk = emit(encode(rows))
+            if progress is not None:
+                progress(len(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,344 @@
+"""
+Employee change history: an append-only event log plus periodic snapshots.
+
+Every crud write to an employee appends events to employee_events in
+the same transaction as the change, one multi-row INSERT per write, so
+a committed change always has its event and a rolled back one never
+does. `GET /employees/{id}/history` lists them.
+
+`GET /employees?as_of=...` rebuilds the directory at a point in time
+from the latest snapshot taken at or before it plus the events since,
+so its cost depends on the events since that snapshot rather than on
+the whole log. Snapshots and (on Postgres) the monthly partitions of
+employee_events are maintained from cron:
+
+    python -m app.history snapshot            # copy every employee's state
+    python -m app.history partitions          # create the coming months' partitions
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import func, insert, literal, select, text, union
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.models import Employee, EmployeeEvent, EmployeeSnapshot
+from app.ratelimit import client_key
+from app.schemas import EmployeeFilter
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Columns recorded in events and snapshots, besides the id
+STATE_FIELDS = ("email", "full_name", "role", "is_active", "joined_date", "department_id", "manager_id")
+
+# Events this much older than a snapshot are replayed on top of it too:
+# a transaction that stamped its event before the snapshot started but
+# committed after it is missing from the snapshot. Replaying an event
+# the snapshot already reflects is harmless, as events are applied in order.
+SNAPSHOT_OVERLAP_SECONDS = float(os.getenv("HISTORY_SNAPSHOT_OVERLAP_SECONDS", "60"))
+
+# Monthly partitions `python -m app.history partitions` keeps ahead of today
+PARTITION_MONTHS_AHEAD = int(os.getenv("HISTORY_PARTITION_MONTHS_AHEAD", "3"))
+
+
+def request_actor(request: Request) -> str:
+    """Who a write is recorded as: X-Actor if the caller set it, else its API key or address"""
+    return (request.headers.get("x-actor") or client_key(request.scope))[:255]
+
+
+def _utc(value: datetime) -> datetime:
+    """Naive datetimes (as SQLite returns them) are UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# =============== Recording ===============
+
+def created(employee, actor: Optional[str] = None) -> dict:
+    """Event for a new employee; `employee` is a model instance or a RETURNING row"""
+    return {
+        "employee_id": employee.id,
+        "occurred_at": employee.updated_at,
+        "kind": CREATED,
+        "actor": actor,
+        "changes": {field: _json_value(getattr(employee, field)) for field in STATE_FIELDS},
+    }
+
+
+def updated(employee_id: int, changes: Dict[str, Any], at: datetime, actor: Optional[str] = None) -> dict:
+    return {
+        "employee_id": employee_id,
+        "occurred_at": at,
+        "kind": UPDATED,
+        "actor": actor,
+        "changes": {field: _json_value(value) for field, value in changes.items()},
+    }
+
+
+def deleted(employee_id: int, at: datetime, actor: Optional[str] = None) -> dict:
+    return {"employee_id": employee_id, "occurred_at": at, "kind": DELETED, "actor": actor, "changes": {}}
+
+
+async def record(db: AsyncSession, events: List[dict]) -> None:
+    """Append events in the caller's transaction; the caller commits"""
+    if events:
+        await db.execute(insert(EmployeeEvent), events)
+
+
+# =============== Replaying ===============
+
+def apply(state: Optional[dict], event: EmployeeEvent) -> Optional[dict]:
+    """The employee's state after `event`; None once deleted or while unknown"""
+    if event.kind == DELETED:
+        return None
+    if event.kind == CREATED:
+        state = {"id": event.employee_id}
+    elif state is None:
+        # An update to an employee that predates both the log and every snapshot
+        return None
+    state = {**state, **event.changes, "updated_at": event.occurred_at}
+    if isinstance(state["joined_date"], str):
+        state["joined_date"] = datetime.fromisoformat(state["joined_date"])
+    return state
+
+
+def snapshot_state(row: EmployeeSnapshot) -> dict:
+    state = {field: getattr(row, field) for field in STATE_FIELDS}
+    return {"id": row.employee_id, **state, "updated_at": row.updated_at}
+
+
+async def get_history(db: AsyncSession, employee_id: int) -> List[dict]:
+    """An employee's events, oldest first, each with the values it replaced.
+
+    `previous` is empty for a "created" event and holds the final
+    record for a "deleted" one. For employees that predate the log, the
+    values before their first event come from the snapshot before it.
+    """
+    events = (await db.execute(
+        select(EmployeeEvent)
+        .where(EmployeeEvent.employee_id == employee_id)
+        .order_by(EmployeeEvent.occurred_at, EmployeeEvent.id)
+    )).scalars().all()
+
+    state = None
+    if events and events[0].kind != CREATED:
+        snapshot = await db.scalar(
+            select(EmployeeSnapshot)
+            .where(
+                EmployeeSnapshot.employee_id == employee_id,
+                EmployeeSnapshot.snapshot_at <= events[0].occurred_at,
+            )
+            .order_by(EmployeeSnapshot.snapshot_at.desc())
+            .limit(1)
+        )
+        state = snapshot_state(snapshot) if snapshot is not None else None
+
+    history = []
+    for event in events:
+        if event.kind == DELETED:
+            replaced = {field: _json_value(state.get(field)) for field in STATE_FIELDS} if state else {}
+        elif event.kind == UPDATED and state is not None:
+            replaced = {field: _json_value(state.get(field)) for field in event.changes}
+        else:
+            replaced = {}
+        history.append({
+            "id": event.id,
+            "employee_id": event.employee_id,
+            "occurred_at": event.occurred_at,
+            "kind": event.kind,
+            "actor": event.actor,
+            "changes": event.changes,
+            "previous": replaced,
+        })
+        state = apply(state, event)
+    return history
+
+
+async def latest_snapshot(db: AsyncSession, as_of: datetime) -> Optional[datetime]:
+    return await db.scalar(
+        select(func.max(EmployeeSnapshot.snapshot_at)).where(EmployeeSnapshot.snapshot_at <= as_of)
+    )
+
+
+async def employees_as_of(
+    db: AsyncSession, as_of: datetime, limit: int = 100, after_id: Optional[int] = None
+) -> Tuple[List[dict], Optional[int]]:
+    """The employees that existed at `as_of`, in id order, as they were then.
+
+    Pages through the ids in the latest snapshot at or before `as_of`
+    and those hired since, `limit` ids at a time; ids that turn out not
+    to exist at `as_of` are dropped, so a page can be short. Returns the
+    states and the id to continue after, or None on the last page.
+    """
+    as_of = _utc(as_of)
+    snapshot_at = await latest_snapshot(db, as_of)
+
+    window = [EmployeeEvent.occurred_at <= as_of]
+    if snapshot_at is not None:
+        window.append(EmployeeEvent.occurred_at > snapshot_at - timedelta(seconds=SNAPSHOT_OVERLAP_SECONDS))
+    after = [EmployeeEvent.employee_id > after_id] if after_id is not None else []
+
+    # Everyone in the snapshot, plus whoever was hired since: employees
+    # only change in between, and those changes are replayed below. Each
+    # branch is cut to `limit` ids on its own, and the hires come from a
+    # partial index with one entry per employee, however long the log.
+    branches = [
+        select(EmployeeEvent.employee_id.label("employee_id"))
+        .where(EmployeeEvent.kind == CREATED, *window, *after)
+        .order_by(EmployeeEvent.employee_id)
+        .limit(limit)
+        .subquery()
+    ]
+    if snapshot_at is not None:
+        in_snapshot = [EmployeeSnapshot.snapshot_at == snapshot_at]
+        if after_id is not None:
+            in_snapshot.append(EmployeeSnapshot.employee_id > after_id)
+        branches.append(
+            select(EmployeeSnapshot.employee_id.label("employee_id"))
+            .where(*in_snapshot)
+            .order_by(EmployeeSnapshot.employee_id)
+            .limit(limit)
+            .subquery()
+        )
+    candidates = union(*(select(branch.c.employee_id) for branch in branches)).subquery()
+    ids = (await db.execute(
+        select(candidates.c.employee_id).order_by(candidates.c.employee_id).limit(limit)
+    )).scalars().all()
+    if not ids:
+        return [], None
+
+    states: Dict[int, Optional[dict]] = {}
+    if snapshot_at is not None:
+        result = await db.execute(
+            select(EmployeeSnapshot).where(
+                EmployeeSnapshot.snapshot_at == snapshot_at, EmployeeSnapshot.employee_id.in_(ids)
+            )
+        )
+        states = {row.employee_id: snapshot_state(row) for row in result.scalars()}
+    events = await db.execute(
+        select(EmployeeEvent)
+        .where(*window, EmployeeEvent.employee_id.in_(ids))
+        .order_by(EmployeeEvent.employee_id, EmployeeEvent.occurred_at, EmployeeEvent.id)
+    )
+    for event in events.scalars():
+        states[event.employee_id] = apply(states.get(event.employee_id), event)
+
+    employees = [states[id_] for id_ in ids if states.get(id_) is not None]
+    return employees, (ids[-1] if len(ids) == limit else None)
+
+
+def matches(state: dict, filters: Optional[EmployeeFilter]) -> bool:
+    """Whether a reconstructed employee passes the listing filters"""
+    if filters is None:
+        return True
+    for field in ("department_id", "manager_id", "role", "is_active"):
+        wanted = getattr(filters, field)
+        if wanted is not None and state.get(field) != wanted:
+            return False
+    joined = _utc(state["joined_date"]) if state["joined_date"] else None
+    if filters.joined_after is not None and (joined is None or joined < _utc(filters.joined_after)):
+        return False
+    if filters.joined_before is not None and (joined is None or joined >= _utc(filters.joined_before)):
+        return False
+    if filters.name and not state["full_name"].lower().startswith(filters.name.lower()):
+        return False
+    if filters.email and not state["email"].lower().startswith(filters.email.lower()):
+        return False
+    return True
+
+
+# =============== Maintenance ===============
+
+async def take_snapshot(db: AsyncSession, at: Optional[datetime] = None) -> int:
+    """Copy every employee's current state into employee_snapshots in one INSERT ... SELECT"""
+    at = at or datetime.now(timezone.utc)
+    columns = ["snapshot_at", "employee_id", *STATE_FIELDS, "updated_at"]
+    result = await db.execute(
+        insert(EmployeeSnapshot).from_select(
+            columns,
+            select(
+                literal(at, EmployeeSnapshot.snapshot_at.type),
+                Employee.id,
+                *(getattr(Employee, field) for field in STATE_FIELDS),
+                Employee.updated_at,
+            ),
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+def _month_start(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_statements(start: date, months: int) -> List[Tuple[str, str]]:
+    """(name, CREATE TABLE) for the monthly employee_events partitions from `start`'s month on"""
+    statements = []
+    for offset in range(months):
+        lower, upper = _month_start(start, offset), _month_start(start, offset + 1)
+        name = f"employee_events_{lower:%Y_%m}"
+        statements.append((name, (
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF employee_events "
+            f"FOR VALUES FROM ('{lower.isoformat()} 00:00+00') TO ('{upper.isoformat()} 00:00+00')"
+        )))
+    return statements
+
+
+async def create_partitions(conn: AsyncConnection, start: date, months: int) -> List[str]:
+    """Create the monthly partitions (Postgres).
+
+    Run ahead of time so the default partition stays empty: adding a
+    month that already has rows in the default partition means scanning
+    it under lock.
+    """
+    statements = partition_statements(start, months)
+    for _, statement in statements:
+        await conn.execute(text(statement))
+    return [name for name, _ in statements]
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the employee change history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("snapshot", help="record every employee's current state")
+    partitions_parser = commands.add_parser("partitions", help="create upcoming monthly partitions (Postgres)")
+    partitions_parser.add_argument("--months", type=int, default=PARTITION_MONTHS_AHEAD + 1,
+                                   help="months to cover, starting with the current one")
+    args = parser.parse_args(argv)
+
+    from app.database import AsyncSessionLocal, get_engine
+
+    async def run() -> None:
+        engine = get_engine()
+        try:
+            if args.command == "snapshot":
+                async with AsyncSessionLocal() as db:
+                    print(f"Snapshot of {await take_snapshot(db)} employees")
+            elif engine.dialect.name != "postgresql":
+                print("employee_events is only partitioned on Postgres", file=sys.stderr)
+            else:
+                async with engine.begin() as conn:
+                    names = await create_partitions(conn, date.today(), args.months)
+                print(f"Partitions in place: {', '.join(names)}")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
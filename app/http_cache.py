@@ -0,0 +1,116 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.middleware import gzip as starlette_gzip
+from starlette.types import Receive, Scope, Send
+
+# Clients may store responses but must revalidate them (cheaply, via 304)
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers the given ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(",")}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def accepts_gzip(headers: Mapping[str, str]) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (`gzip;q=0` refuses it)"""
+    qualities = {}
+    for item in headers.get("accept-encoding", "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+class GZipMiddleware(starlette_gzip.GZipMiddleware):
+    """Starlette's GZipMiddleware, negotiating with `accepts_gzip`.
+
+    Starlette compresses whenever "gzip" appears anywhere in
+    Accept-Encoding, including `gzip;q=0`.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(Headers(scope=scope)):
+            responder = starlette_gzip.GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def versions_etag(request: Request, versions: Iterable[Any]) -> str:
+    """Weak ETag from the (id, updated_at) pairs behind a response.
+
+    Hashing these few values instead of the rendered body lets a 304 be
+    decided before anything is serialized. Inserts and deletes change
+    the set of ids and every write bumps updated_at; the query string is
+    mixed in because projections and pages of the same rows differ.
+    Times are hashed in UTC: a row fresh from the database and the same
+    row rebuilt from a cache carry different tzinfo objects.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(request.url.query).encode())
+    for id_, updated_at in versions:
+        stamp = _as_utc(updated_at).isoformat() if updated_at is not None else ""
+        digest.update(f"{id_}@{stamp};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, or failing that If-Modified-Since"""
+    if request.headers.get("if-none-match") is not None:
+        return etag_matches(request, etag)
+    since = request.headers.get("if-modified-since")
+    if since and last_modified is not None:
+        try:
+            since_at = parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since_at)
+    return False
+
+
+def conditional(
+    request: Request,
+    etag: str,
+    render: Callable[[], Response],
+    last_modified: Optional[datetime] = None,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response:
+    """`render()`'s response with validators, or a bodiless 304 if the client is current.
+
+    Only pass `last_modified` for single resources: a list's newest
+    updated_at doesn't move when a row is deleted from it.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response = render()
+    response.headers.update(headers)
+    return response
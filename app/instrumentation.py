@@ -0,0 +1,278 @@
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.metrics import (
+    Histogram, pool_stats, pool_wait_seconds, prometheus_histogram, prometheus_metric,
+)
+
+logger = logging.getLogger("app.instrumentation")
+
+# Requests / statements slower than these (seconds) are logged as warnings
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1.0"))
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", "0.25"))
+
+# PROFILING="header" profiles requests sent with `X-Profile: 1`;
+# a number such as "0.01" profiles that fraction of all requests.
+PROFILING = os.getenv("PROFILING", "").strip().lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "hrms-profiles"))
+
+
+class RequestStats:
+    """Database work attributed to the request being served"""
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+class RouteMetrics:
+    """Per-route latency, statement count and DB time"""
+
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.db_time: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.statements: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.responses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.query_duration = Histogram()
+        self.slow_queries = 0
+        self.slow_requests = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        self.latency[key].observe(seconds)
+        self.db_time[key].observe(stats.db_seconds)
+        self.statements[key] += stats.statements
+        self.responses[(method, route, status)] += 1
+
+    def reset(self):
+        self.__init__()
+
+
+route_metrics = RouteMetrics()
+
+
+# =============== SQLAlchemy hooks ===============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    route_metrics.query_duration.observe(elapsed)
+
+    stats = _current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+
+    if elapsed >= SLOW_QUERY_SECONDS:
+        route_metrics.slow_queries += 1
+        logger.warning("Slow query (%.3fs): %s", elapsed, " ".join(statement.split()))
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+def instrument_engine(engine) -> None:
+    """Attach query timing hooks to an (async) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# =============== Profiling ===============
+
+def _should_profile(scope) -> bool:
+    if not PROFILING:
+        return False
+    if PROFILING == "header":
+        return (b"x-profile", b"1") in scope.get("headers", [])
+    try:
+        return random.random() < float(PROFILING)
+    except ValueError:
+        return False
+
+
+class _Profile:
+    """Profile a request with pyinstrument (sampling) if installed, else cProfile.
+
+    cProfile is not task-aware: while it is enabled it also records any
+    other requests interleaved on the event loop.
+    """
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        try:
+            from pyinstrument import Profiler
+            self._profiler = Profiler(async_mode="enabled")
+            self._sampling = True
+        except ImportError:
+            self._profiler = cProfile.Profile()
+            self._sampling = False
+
+    def start(self):
+        self._profiler.start() if self._sampling else self._profiler.enable()
+
+    def stop_and_save(self, label: str) -> str:
+        if self._sampling:
+            self._profiler.stop()
+            report = self._profiler.output_text(unicode=True)
+        else:
+            self._profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(self._profiler, stream=buffer).sort_stats("cumulative").print_stats(40)
+            report = buffer.getvalue()
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{self.id}.txt")
+        with open(path, "w") as f:
+            f.write(f"{label}\n\n{report}")
+        logger.info("Saved profile of %s to %s", label, path)
+        return path
+
+
+# =============== Middleware ===============
+
+class InstrumentationMiddleware:
+    """ASGI middleware recording per-route latency and database work.
+
+    Routes are labelled by their path template (e.g. /api/v1/employees/{employee_id})
+    so metrics don't fan out per id. Profiled responses carry an
+    X-Profile-Id header naming the report saved under PROFILE_DIR.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        status_code = 500
+        profile = _Profile() if _should_profile(scope) else None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if profile:
+                    message["headers"] = [
+                        *message.get("headers", []), (b"x-profile-id", profile.id.encode())
+                    ]
+            await send(message)
+
+        start = time.perf_counter()
+        if profile:
+            profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_request.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            route_metrics.record(method, route, status_code, elapsed, stats)
+            if profile:
+                profile.stop_and_save(f"{method} {scope['path']}")
+            if elapsed >= SLOW_REQUEST_SECONDS:
+                route_metrics.slow_requests += 1
+                logger.warning(
+                    "Slow request %s %s: %.3fs, %d statements, %.3fs in database",
+                    method, scope["path"], elapsed, stats.statements, stats.db_seconds,
+                )
+
+
+def render_prometheus(engine, caches: Dict[str, object], admission=None) -> str:
+    """All API metrics in the Prometheus text exposition format"""
+    def route_labels(key):
+        return {"method": key[0], "route": key[1]}
+
+    lines = []
+    lines += prometheus_metric(
+        "hrms_http_requests_total", "counter", "HTTP responses by route and status",
+        [({"method": m, "route": r, "status": s}, n) for (m, r, s), n in route_metrics.responses.items()],
+    )
+    lines += prometheus_histogram(
+        "hrms_http_request_duration_seconds", "HTTP request latency",
+        [(route_labels(key), h) for key, h in route_metrics.latency.items()],
+    )
+    lines += prometheus_histogram(
+        "hrms_http_request_db_seconds", "Time spent in SQL per request",
+        [(route_labels(key), h) for key, h in route_metrics.db_time.items()],
+    )
+    lines += prometheus_metric(
+        "hrms_db_statements_total", "counter", "SQL statements executed, by route",
+        [(route_labels(key), n) for key, n in route_metrics.statements.items()],
+    )
+    lines += prometheus_histogram(
+        "hrms_db_query_duration_seconds", "Duration of individual SQL statements",
+        [({}, route_metrics.query_duration)],
+    )
+    lines += prometheus_metric(
+        "hrms_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_SECONDS",
+        [({}, route_metrics.slow_queries)],
+    )
+    lines += prometheus_metric(
+        "hrms_slow_requests_total", "counter", "Requests slower than SLOW_REQUEST_SECONDS",
+        [({}, route_metrics.slow_requests)],
+    )
+
+    pool = pool_stats(engine)
+    for field in ("size", "checked_out", "checked_in", "overflow", "saturation"):
+        if field in pool:
+            lines += prometheus_metric(
+                f"hrms_db_pool_{field}", "gauge", f"Connection pool {field.replace('_', ' ')}",
+                [({}, pool[field])],
+            )
+    lines += prometheus_metric(
+        "hrms_db_pool_waiting", "gauge", "Requests waiting for a pooled connection",
+        [({}, pool["waiting"])],
+    )
+    lines += prometheus_histogram(
+        "hrms_db_pool_wait_seconds", "Time waiting for a pooled connection",
+        [({}, pool_wait_seconds)],
+    )
+
+    if admission is not None:
+        lines += prometheus_metric(
+            "hrms_rate_limited_total", "counter", "Requests rejected by the per-client rate limit",
+            [({"route": route}, n) for route, n in admission.limited.items()],
+        )
+        lines += prometheus_metric(
+            "hrms_shed_total", "counter", "Requests shed because the pool queue or the route was full",
+            [({"route": route, "reason": reason}, n) for (route, reason), n in admission.shed.items()],
+        )
+
+    for kind in ("hits", "misses"):
+        lines += prometheus_metric(
+            f"hrms_cache_{kind}_total", "counter", f"Read-through cache {kind}",
+            [({"cache": name}, getattr(cache, kind)) for name, cache in caches.items()],
+        )
+    return "\n".join(lines) + "\n"
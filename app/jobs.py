@@ -0,0 +1,449 @@
+"""
+Background jobs: work too long to run inside a request.
+
+Bulk imports, directory exports and department reassignments can
+outlast the load balancer's request timeout, and would hold a pooled
+connection all the while. `POST /jobs/...` stores the job in the jobs
+table and answers 202 with its id straight away; a worker picks it up,
+and `GET /jobs/{id}` reports its progress and, once it is done, its
+result and where to download the artifact it produced.
+
+Each API process runs JOB_WORKERS jobs at a time (0 to disable), and
+workers can also run on their own:
+
+    python -m app.jobs worker --concurrency 4
+
+Any number of workers can share the table. Each claims the oldest
+queued job with one UPDATE whose subquery picks it FOR UPDATE SKIP
+LOCKED, so concurrent claimers skip past a row another has locked
+instead of waiting on it, and no job is handed out twice. While a job
+runs, its worker refreshes heartbeat_at (saving progress with it). A
+job whose heartbeat goes quiet for JOB_LEASE_SECONDS, because its
+worker died or lost the database, is queued again, up to
+JOB_MAX_ATTEMPTS runs. A job can therefore run more than once, so
+handlers are written to be safe to repeat: a repeated import reports
+the rows it already created as existing, and a repeated reassignment
+or export has the same outcome.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bulk import run_import
+from app.database import AsyncSessionLocal, get_engine
+from app.export import MEDIA_TYPES, export_employees
+from app.models import Job, JobFile
+from app.schemas import EmployeeCreate, EmployeeFilter
+from app import crud
+
+logger = logging.getLogger("app.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Names of a job's files
+INPUT = "input"
+RESULT = "result"
+
+IMPORT_EMPLOYEES = "import_employees"
+EXPORT_EMPLOYEES = "export_employees"
+REASSIGN_EMPLOYEES = "reassign_employees"
+
+# Jobs each API process runs at once; 0 leaves them to `python -m app.jobs worker`
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+# Seconds an idle worker waits before looking for queued jobs again
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+# Seconds between a running job's heartbeats, which also save its progress
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "2"))
+# A running job that has not heartbeated for this long is given to another worker
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Seconds shutdown lets running jobs finish before handing them back to the queue
+JOB_SHUTDOWN_WAIT = float(os.getenv("JOB_SHUTDOWN_WAIT", "10"))
+# Employees a reassignment job moves per transaction
+REASSIGN_BATCH_SIZE = int(os.getenv("JOB_REASSIGN_BATCH_SIZE", "1000"))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _session() -> AsyncSession:
+    return AsyncSessionLocal(bind=get_engine())
+
+
+def gzip(content: bytes) -> bytes:
+    # wbits=31 produces a gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(wbits=31)
+    return compressor.compress(content) + compressor.flush()
+
+
+def gunzip(content: bytes) -> bytes:
+    return zlib.decompress(content, wbits=31)
+
+
+# =============== Queue ===============
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    params: Dict[str, Any],
+    actor: Optional[str] = None,
+    input: Optional[bytes] = None,
+) -> Job:
+    """Queue a job, storing `input` (JSON) alongside it, and commit"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    job = Job(kind=kind, params=params, actor=actor, status=QUEUED, processed=0, attempts=0)
+    db.add(job)
+    await db.flush()
+    if input is not None:
+        db.add(JobFile(
+            job_id=job.id, name=INPUT, media_type="application/json", filename="input.json", content=gzip(input),
+        ))
+    await db.commit()
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Tuple[Job, bool]]:
+    """A job and whether it has a result artifact, without reading any file contents"""
+    has_artifact = exists().where(JobFile.job_id == Job.id, JobFile.name == RESULT)
+    row = (await db.execute(select(Job, has_artifact).where(Job.id == job_id))).first()
+    return (row[0], row[1]) if row else None
+
+
+async def get_file(db: AsyncSession, job_id: int, name: str) -> Optional[JobFile]:
+    return await db.get(JobFile, (job_id, name))
+
+
+def progress_percent(job: Job) -> float:
+    if job.status == SUCCEEDED:
+        return 100.0
+    if not job.total:
+        return 0.0
+    # Rows written since the job counted them can take it past its total
+    return round(min(100.0, 100.0 * job.processed / job.total), 1)
+
+
+def claim_statement(worker: str, now: datetime):
+    """UPDATE the oldest queued job to running, locking it FOR UPDATE SKIP LOCKED"""
+    oldest = (
+        select(Job.id)
+        .where(Job.status == QUEUED)
+        .order_by(Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(Job)
+        # Rechecking the status is what makes the claim safe where FOR
+        # UPDATE is a no-op (SQLite, which runs one writer at a time)
+        .where(Job.id == oldest, Job.status == QUEUED)
+        .values(status=RUNNING, worker=worker, attempts=Job.attempts + 1, started_at=now, heartbeat_at=now)
+        .returning(Job.id, Job.kind, Job.params, Job.actor)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim(db: AsyncSession, worker: str) -> Optional[Row]:
+    """Take the oldest queued job for `worker`, or None if there is none"""
+    row = (await db.execute(claim_statement(worker, _now()))).first()
+    await db.commit()
+    return row
+
+
+async def requeue_expired(db: AsyncSession) -> int:
+    """Queue again the running jobs whose worker stopped heartbeating.
+
+    Jobs that have used up their attempts fail instead. Returns how
+    many were queued again.
+    """
+    now = _now()
+    expired = (Job.status == RUNNING, Job.heartbeat_at < now - timedelta(seconds=JOB_LEASE_SECONDS))
+    await db.execute(
+        update(Job)
+        .where(*expired, Job.attempts >= JOB_MAX_ATTEMPTS)
+        .values(status=FAILED, error="Worker stopped responding", worker=None, finished_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(
+        update(Job).where(*expired).values(status=QUEUED, worker=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.warning("Queued %d jobs again after their workers stopped responding", result.rowcount)
+    return result.rowcount
+
+
+# =============== Running Jobs ===============
+
+class JobContext:
+    """A claimed job as its handler sees it: parameters, progress and files"""
+
+    def __init__(self, job_id: int, kind: str, params: Dict[str, Any], actor: Optional[str], worker: str):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.actor = actor
+        self.worker = worker
+        self.processed = 0
+        self.total: Optional[int] = None
+
+    def progress(self, processed: int, total: Optional[int] = None) -> None:
+        """Record progress; it is saved with the next heartbeat"""
+        self.processed = processed
+        if total is not None:
+            self.total = total
+
+    async def read_input(self) -> bytes:
+        async with _session() as db:
+            file = await get_file(db, self.id, INPUT)
+        if file is None:
+            raise ValueError(f"Job {self.id} has no input")
+        return gunzip(file.content)
+
+    async def save_artifact(self, content: bytes, media_type: str, filename: str, compressed: bool = False) -> None:
+        """Store the job's result file, replacing one from an earlier attempt"""
+        async with _session() as db:
+            await db.merge(JobFile(
+                job_id=self.id, name=RESULT, media_type=media_type, filename=filename,
+                content=content if compressed else gzip(content),
+            ))
+            await db.commit()
+
+    async def _update(self, **values) -> bool:
+        """Write to the job while this worker still holds it"""
+        async with _session() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == self.id, Job.worker == self.worker, Job.status == RUNNING)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount and values.get("status") in (SUCCEEDED, FAILED):
+                await db.execute(delete(JobFile).where(JobFile.job_id == self.id, JobFile.name == INPUT))
+            await db.commit()
+        return result.rowcount == 1
+
+    async def heartbeat(self) -> bool:
+        return await self._update(heartbeat_at=_now(), processed=self.processed, total=self.total)
+
+    async def keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await self.heartbeat():
+                    logger.warning("Job %s was given to another worker while %s ran it", self.id, self.worker)
+                    return
+            except Exception as e:
+                logger.warning("Heartbeat for job %s failed: %s", self.id, e)
+
+    async def finish(self, result: Optional[Dict[str, Any]], error: Optional[str]) -> bool:
+        """Record the outcome and drop the input"""
+        return await self._update(
+            status=FAILED if error is not None else SUCCEEDED, result=result, error=error,
+            processed=self.processed, total=self.total, heartbeat_at=_now(), finished_at=_now(),
+        )
+
+    async def release(self) -> bool:
+        """Hand the job back to the queue; stopping it doesn't use up an attempt"""
+        return await self._update(status=QUEUED, worker=None, attempts=Job.attempts - 1)
+
+
+Handler = Callable[[JobContext], Awaitable[Dict[str, Any]]]
+# Job kind -> the coroutine that runs it and returns its result
+HANDLERS: Dict[str, Handler] = {}
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+class Worker:
+    """Claims and runs jobs, `concurrency` at a time"""
+
+    def __init__(self, concurrency: int = JOB_WORKERS, name: Optional[str] = None):
+        self.concurrency = concurrency
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def execute(self, job: JobContext) -> None:
+        run = HANDLERS.get(job.kind)
+        keep_alive = asyncio.create_task(job.keep_alive())
+        try:
+            if run is None:
+                raise ValueError(f"Unknown job kind '{job.kind}'")
+            result, error = await run(job), None
+        except asyncio.CancelledError:
+            keep_alive.cancel()
+            await job.release()
+            raise
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            result, error = None, str(e) or type(e).__name__
+        finally:
+            keep_alive.cancel()
+        await job.finish(result, error)
+
+    async def run_one(self, name: str) -> bool:
+        """Claim the oldest queued job and run it; False when the queue was empty"""
+        async with _session() as db:
+            claimed = await claim(db, name)
+        if claimed is None:
+            return False
+        await self.execute(JobContext(claimed.id, claimed.kind, claimed.params, claimed.actor, name))
+        return True
+
+    async def _slot(self, name: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_one(name)
+                if not ran:
+                    async with _session() as db:
+                        await requeue_expired(db)
+            except Exception as e:
+                # e.g. the database is unreachable or not migrated yet
+                logger.error("Job worker %s: %s", name, e)
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self) -> None:
+        """Run jobs until stopped"""
+        await asyncio.gather(*(self._slot(f"{self.name}/{slot}") for slot in range(self.concurrency)))
+
+    async def drain(self) -> int:
+        """Run jobs until the queue is empty; returns how many ran"""
+        async def until_empty(name: str) -> int:
+            ran = 0
+            while await self.run_one(name):
+                ran += 1
+            return ran
+
+        return sum(await asyncio.gather(*(until_empty(f"{self.name}/{slot}") for slot in range(self.concurrency))))
+
+    def start(self) -> asyncio.Task:
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def request_stop(self) -> None:
+        """Claim no more jobs; `run` returns once the running ones finish"""
+        self._stopping.set()
+
+    async def stop(self, timeout: float = JOB_SHUTDOWN_WAIT) -> None:
+        """Let running jobs finish for `timeout` seconds, then hand them back to the queue"""
+        self.request_stop()
+        if self._task is None:
+            return
+        await asyncio.wait([self._task], timeout=timeout)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+# =============== Handlers ===============
+
+@handler(IMPORT_EMPLOYEES)
+async def import_employees(job: JobContext) -> Dict[str, Any]:
+    """Create employees from the uploaded rows; the per-row results are the artifact"""
+    rows = json.loads(await job.read_input())
+    create_many = partial(crud.bulk_create_employees, actor=job.actor)
+    async with _session() as db:
+        outcome = await run_import(
+            db, EmployeeCreate, rows, create_many, job.params["atomic"],
+            progress=job.progress, chunk_size=crud.BULK_CHUNK_SIZE,
+        )
+    await job.save_artifact(outcome.model_dump_json().encode(), "application/json", "import-results.json")
+    return outcome.model_dump(exclude={"results"})
+
+
+@handler(EXPORT_EMPLOYEES)
+async def export_employee_directory(job: JobContext) -> Dict[str, Any]:
+    """Write the matching employees to an NDJSON or CSV artifact"""
+    fmt = job.params["format"]
+    filters = EmployeeFilter(**job.params["filters"])
+    async with _session() as db:
+        total, _ = await crud.count_employees(db, exact=True, filters=filters)
+    job.progress(0, total)
+
+    def advance(rows: int) -> None:
+        job.progress(job.processed + rows)
+
+    # Held compressed, so even the whole directory is a few megabytes
+    chunks = [chunk async for chunk in export_employees(fmt, filters, compress=True, progress=advance)]
+    await job.save_artifact(b"".join(chunks), MEDIA_TYPES[fmt], f"employees.{fmt}", compressed=True)
+    return {"rows": job.processed}
+
+
+@handler(REASSIGN_EMPLOYEES)
+async def reassign_department(job: JobContext) -> Dict[str, Any]:
+    """Move a department's employees to another, REASSIGN_BATCH_SIZE per transaction"""
+    from_id, to_id = job.params["from_department_id"], job.params["to_department_id"]
+    if from_id == to_id:
+        return {"affected": 0}
+    moved = 0
+    async with _session() as db:
+        total, _ = await crud.count_employees(db, exact=True, filters=EmployeeFilter(department_id=from_id))
+        job.progress(0, total)
+        while True:
+            batch = await crud.reassign_employees(db, from_id, to_id, actor=job.actor, limit=REASSIGN_BATCH_SIZE)
+            moved += batch
+            job.progress(moved)
+            if batch < REASSIGN_BATCH_SIZE:
+                break
+    return {"affected": moved}
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker_parser = commands.add_parser("worker", help="claim and run jobs until interrupted")
+    worker_parser.add_argument("--concurrency", type=int, default=max(JOB_WORKERS, 1),
+                               help="jobs to run at once")
+    worker_parser.add_argument("--once", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    async def run() -> None:
+        worker = Worker(args.concurrency)
+        try:
+            if args.once:
+                print(f"Ran {await worker.drain()} jobs")
+            else:
+                loop = asyncio.get_running_loop()
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    loop.add_signal_handler(sig, worker.request_stop)
+                logger.info("Worker %s running %d jobs at a time", worker.name, worker.concurrency)
+                await worker.run()
+        finally:
+            await get_engine().dispose()
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,73 @@
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
+from sqlalchemy import text
+
+from app.database import Base, engine_created, get_engine, on_engine
+from app.cache import department_cache, stats_cache
+from app.http_cache import GZipMiddleware
+from app.jobs import JOB_SHUTDOWN_WAIT, JOB_WORKERS, Worker
+from app.instrumentation import InstrumentationMiddleware, instrument_engine, render_prometheus
+from app.metrics import pool_stats
+from app.ratelimit import AdmissionMiddleware, admission
+from app.replicas import ReadYourWritesMiddleware, replica_set
+from app.startup import prepare, readiness
+from app.routers import employees, departments, jobs, stats
 
-from app.database import engine, Base
-from app.routers import employees, departments
+# Pool saturation (checked out / capacity) at which /health reports degraded
+HEALTH_SATURATION_THRESHOLD = float(os.getenv("HEALTH_SATURATION_THRESHOLD", "0.9"))
+HEALTH_DB_TIMEOUT = float(os.getenv("HEALTH_DB_TIMEOUT", "2"))
+# Responses smaller than this (bytes) aren't worth compressing
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "5"))
+# What each worker does with the schema at startup:
+#   verify - stay unready (/health/ready) unless migrations are at the latest revision
+#   create - create_all the tables (throwaway local/test databases only)
+#   skip   - nothing
+SCHEMA_STARTUP = os.getenv("SCHEMA_STARTUP", "verify").strip().lower()
+# Seconds shutdown waits for unfinished startup work (e.g. pool warm-up)
+STARTUP_SHUTDOWN_WAIT = 5.0
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    # Startup: Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    readiness.reset()
+    if SCHEMA_STARTUP == "create":
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Migrations are applied once per deploy (python -m app.migrate
+    # upgrade), so workers only confirm the schema version. That and
+    # warming the pool happen in the background: the worker serves
+    # /health/live at once and reports ready when they are done.
+    startup = asyncio.create_task(prepare(verify_schema=SCHEMA_STARTUP == "verify"))
+    # Keep read replicas' health (and lag) current in the background
+    monitor = asyncio.create_task(replica_set.monitor()) if replica_set.configured else None
+    # Run queued background jobs in this process too (see app.jobs)
+    job_worker = Worker(JOB_WORKERS) if JOB_WORKERS > 0 else None
+    if job_worker:
+        job_worker.start()
     
     yield
     
     # Shutdown: Clean up resources
-    await engine.dispose()
+    readiness.stopping = True
+    if job_worker:
+        await job_worker.stop(JOB_SHUTDOWN_WAIT)
+    if monitor:
+        monitor.cancel()
+    # Cancelling the warm-up mid-connect would strand connections outside
+    # the pool, so give it a moment to finish first
+    await asyncio.wait([startup], timeout=STARTUP_SHUTDOWN_WAIT)
+    startup.cancel()
+    await replica_set.dispose()
+    if engine_created():
+        await get_engine().dispose()
 
 
 # Initialize FastAPI app with lifespan
@@ -27,6 +78,28 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limits and load shedding. Middleware added later wraps what came
+# before, so this runs inside the instrumentation and rejections are counted.
+app.add_middleware(AdmissionMiddleware, router=app.router)
+
+# Per-route latency and SQL instrumentation, on each engine as it is created
+on_engine(instrument_engine)
+app.add_middleware(InstrumentationMiddleware)
+
+# Pin clients that just wrote to the primary (only matters with replicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress JSON bodies; Brotli when brotli-asgi is installed, with gzip
+# as the fallback. Responses that already set Content-Encoding (the
+# gzipped export) are passed through untouched.
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(
+        BrotliMiddleware, quality=COMPRESSION_LEVEL, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True
+    )
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=COMPRESSION_LEVEL)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +112,8 @@ app.add_middleware(
 # Include routers
 app.include_router(departments.router, prefix="/api/v1")
 app.include_router(employees.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -52,7 +127,77 @@ def root():
     }
 
 
+@app.get("/health/live")
+def liveness():
+    """Liveness: the process is up and serving. Never touches the database."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+def readiness_check():
+    """Readiness: startup checks passed and the pool is warm (503 until then)"""
+    body = readiness.status()
+    return body if readiness.ready else JSONResponse(status_code=503, content=body)
+
+
 @app.get("/health")
-def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "database": "connected"}
+async def health_check():
+    """Health check endpoint.
+
+    Runs a trivial query against the database and reports pool saturation
+    and, when configured, the state of each read replica. Returns 503 when
+    the primary can't be reached.
+    """
+    engine = get_engine()
+    pool = pool_stats(engine)
+    saturation = pool.get("saturation", 0.0)
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # The timeout covers checking a connection out too: with the pool
+    # exhausted that alone would wait for the whole DB_POOL_TIMEOUT
+    try:
+        await asyncio.wait_for(ping(), HEALTH_DB_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "database": "unreachable", "error": str(e) or type(e).__name__},
+        )
+
+    status = "degraded" if saturation >= HEALTH_SATURATION_THRESHOLD else "healthy"
+    body = {"status": status, "database": "connected", "pool_saturation": saturation}
+    if replica_set.configured:
+        # Reads fall back to the primary, so a replica outage only degrades
+        body["replicas"] = replica_set.status()
+        if not replica_set.healthy():
+            body["status"] = "degraded"
+    return body
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Request, database, pool and cache metrics in Prometheus text format"""
+    return PlainTextResponse(
+        render_prometheus(get_engine(), {"departments": department_cache, "stats": stats_cache}, admission),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/metrics/pool")
+def pool_metrics():
+    """Live connection pool statistics"""
+    return pool_stats(get_engine())
+
+
+@app.get("/metrics/cache")
+def cache_metrics():
+    """Department cache hit/miss counters"""
+    return {"departments": department_cache.stats(), "stats": stats_cache.stats()}
+
+
+@app.get("/metrics/limits")
+def limit_metrics():
+    """Rate limit and load shedding settings, in-flight requests and rejection counts"""
+    return admission.stats()
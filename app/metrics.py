@@ -0,0 +1,109 @@
+import bisect
+import threading
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# Default latency buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram in the Prometheus style (cumulative buckets)"""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def snapshot(self) -> Dict:
+        """Cumulative bucket counts plus total count and sum"""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+class Gauge:
+    """A value that goes up and down; only touched from the event loop"""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        self.value -= amount
+
+
+# Time spent waiting for a pooled connection at the start of a request
+pool_wait_seconds = Histogram()
+# Requests currently waiting for a pooled connection
+pool_waiting = Gauge()
+
+
+def pool_stats(engine) -> Dict:
+    """Live statistics for an engine's connection pool"""
+    pool = engine.sync_engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            saturation=round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+        )
+    stats["waiting"] = pool_waiting.value
+    stats["wait_seconds"] = pool_wait_seconds.snapshot()
+    return stats
+
+
+# =============== Prometheus text format ===============
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Mapping[str, object]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def prometheus_metric(
+    name: str, kind: str, help_text: str, samples: Iterable[Tuple[Mapping[str, object], float]]
+) -> List[str]:
+    """Exposition lines for a counter or gauge"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in samples]
+    return lines
+
+
+def prometheus_histogram(
+    name: str, help_text: str, series: Iterable[Tuple[Mapping[str, object], Histogram]]
+) -> List[str]:
+    """Exposition lines for one or more labelled histograms"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in series:
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {snapshot['sum']}")
+        lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+    return lines
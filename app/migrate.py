@@ -0,0 +1,207 @@
+"""
+Schema migrations (Alembic).
+
+Apply pending migrations once per deploy, before starting the workers:
+
+    python -m app.migrate upgrade            # to the latest revision
+    python -m app.migrate upgrade --sql      # print the SQL instead
+    python -m app.migrate current            # revision the database is at
+    python -m app.migrate check              # exit 1 unless at the latest
+    python -m app.migrate revision -m "add employees.manager_id"
+
+Workers then only check the recorded revision at startup (see
+SCHEMA_STARTUP in app.main) instead of each running create_all.
+
+Alembic is imported inside the functions that use it: it adds well over
+100 ms to `import app.main`, and workers only need it for that check.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from sqlalchemy import inspect
+
+if TYPE_CHECKING:
+    from alembic.config import Config
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Revision matching the tables create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database is not at the revision this code expects"""
+
+
+def alembic_config() -> "Config":
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    # Resolve the scripts relative to alembic.ini, not the working directory
+    config.set_main_option(
+        "script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations")
+    )
+    return config
+
+
+def head_revision() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def _database_state(sync_conn) -> tuple:
+    """(current revision, whether the app's tables already exist)"""
+    from alembic.runtime.migration import MigrationContext
+
+    revision = MigrationContext.configure(sync_conn).get_current_revision()
+    return revision, inspect(sync_conn).has_table("departments")
+
+
+async def database_state(engine) -> tuple:
+    async with engine.connect() as conn:
+        return await conn.run_sync(_database_state)
+
+
+async def verify_schema(engine) -> None:
+    """Raise SchemaVersionError unless the database is at the head revision"""
+    current, _ = await database_state(engine)
+    expected = head_revision()
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current or 'none'}, expected {expected}; "
+            "run `python -m app.migrate upgrade`"
+        )
+
+
+def include_object_for(dialect_name: str):
+    """Autogenerate filter skipping objects limited to other dialects.
+
+    Indexes declared with `.ddl_if(dialect="postgresql")` (the trigram
+    ones) are never created on SQLite, so they must not show up there as
+    missing.
+    """
+    def include_object(obj, name, type_, reflected, compare_to):
+        ddl_if = getattr(obj, "_ddl_if", None)
+        return ddl_if is None or ddl_if.dialect in (None, dialect_name)
+
+    return include_object
+
+
+# =============== Helpers for revisions ===============
+
+def create_index_concurrently(name: str, table: str, columns: List[str], **kw: Any) -> None:
+    """Create an index without blocking writes to the table.
+
+    On Postgres this runs CREATE INDEX CONCURRENTLY outside the migration's
+    transaction; elsewhere it is a plain CREATE INDEX. IF NOT EXISTS lets
+    it run against databases whose indexes were made by create_all. If a
+    concurrent build fails it leaves an INVALID index behind, which must be
+    dropped before retrying.
+    """
+    from alembic import op
+
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+    else:
+        op.create_index(name, table, columns, if_not_exists=True, **kw)
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """Drop an index without blocking writes to the table (see create_index_concurrently)"""
+    from alembic import op
+
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+# =============== CLI ===============
+
+def upgrade(revision: str = "head", sql: bool = False) -> None:
+    """Apply migrations up to `revision`.
+
+    A database created by create_all before migrations existed has the
+    tables but no version record; it is stamped at the baseline first.
+    """
+    from alembic import command
+
+    config = alembic_config()
+    if not sql:
+        from app.database import engine
+
+        async def state():
+            try:
+                return await database_state(engine)
+            finally:
+                await engine.dispose()
+
+        current, has_tables = asyncio.run(state())
+        if current is None and has_tables:
+            print(f"Existing unversioned schema found; stamping it at {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision, sql=sql)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the HRMS database schema")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    upgrade_parser = commands.add_parser("upgrade", help="apply pending migrations")
+    upgrade_parser.add_argument("revision", nargs="?", default="head")
+    upgrade_parser.add_argument("--sql", action="store_true", help="print the SQL instead of running it")
+
+    downgrade_parser = commands.add_parser("downgrade", help="revert to an earlier revision")
+    downgrade_parser.add_argument("revision")
+    downgrade_parser.add_argument("--sql", action="store_true", help="print the SQL instead of running it")
+
+    commands.add_parser("current", help="show the database's revision")
+    commands.add_parser("check", help="exit 1 unless the database is at the latest revision")
+    commands.add_parser("history", help="list revisions")
+
+    revision_parser = commands.add_parser("revision", help="create a new revision")
+    revision_parser.add_argument("-m", "--message", required=True)
+    revision_parser.add_argument("--autogenerate", action="store_true",
+                                 help="diff app.models against the database")
+
+    args = parser.parse_args(argv)
+    from alembic import command
+
+    config = alembic_config()
+
+    if args.command == "upgrade":
+        upgrade(args.revision, sql=args.sql)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision, sql=args.sql)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    elif args.command == "revision":
+        command.revision(config, message=args.message, autogenerate=args.autogenerate)
+    elif args.command == "check":
+        from app.database import engine
+
+        async def check():
+            try:
+                await verify_schema(engine)
+            finally:
+                await engine.dispose()
+
+        try:
+            asyncio.run(check())
+        except SchemaVersionError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Database schema is at {head_revision()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,33 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, Column, DateTime, DDL, ForeignKey, Index, Integer, LargeBinary,
+    PrimaryKeyConstraint, String, Text, event, text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def updated_at_column() -> Column:
+    """Last-change timestamp, the basis of the API's ETags and Last-Modified.
+
+    It is set by SQLAlchemy on every insert and update (including bulk
+    UPDATE statements) rather than by the database alone, so it has
+    sub-second precision on SQLite too; the server default covers rows
+    written outside the app.
+    """
+    return Column(
+        DateTime(timezone=True), nullable=False,
+        default=_utcnow, onupdate=_utcnow, server_default=func.now(),
+    )
+
+
 class Department(Base):
     """Department model - One department has many employees"""
     __tablename__ = "departments"
@@ -11,9 +35,14 @@ class Department(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
+    updated_at = updated_at_column()
     
-    # Relationship: One Department has many Employees
-    employees = relationship("Employee", back_populates="department", cascade="all, delete-orphan")
+    # Relationship: One Department has many Employees.
+    # passive_deletes leaves removing employees to the FK's ON DELETE CASCADE
+    # instead of loading every child row into the session first.
+    employees = relationship(
+        "Employee", back_populates="department", cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<Department(id={self.id}, name='{self.name}')>"
@@ -28,11 +57,166 @@ class Employee(Base):
     full_name = Column(String(200), nullable=False)
     role = Column(String(100), nullable=False, default="Employee")
     is_active = Column(Boolean, default=True, nullable=False)
-    joined_date = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python like updated_at: SQLite's now() has no fractional
+    # seconds, and its text wouldn't compare with the cursor and filter
+    # values SQLAlchemy binds (which always carry them)
+    joined_date = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     department_id = Column(Integer, ForeignKey("departments.id", ondelete="CASCADE"), nullable=False)
+    # Reporting line; the org chart is walked with recursive CTEs over this index
+    manager_id = Column(Integer, ForeignKey("employees.id", ondelete="SET NULL"), nullable=True, index=True)
+    updated_at = updated_at_column()
     
     # Relationship: Employee belongs to one Department
     department = relationship("Department", back_populates="employees")
 
+    __table_args__ = (
+        # Composite (sort column, id) indexes backing keyset pagination
+        Index("ix_employees_full_name_id", "full_name", "id"),
+        Index("ix_employees_joined_date_id", "joined_date", "id"),
+        # Equality filters on the listing endpoint
+        Index("ix_employees_department_id_is_active", "department_id", "is_active"),
+        Index("ix_employees_role_is_active", "role", "is_active"),
+        # Trigram indexes serve case-insensitive prefix search (ILIKE 'x%') on Postgres
+        Index(
+            "ix_employees_full_name_trgm", "full_name",
+            postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_employees_email_trgm", "email",
+            postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Lets /employees/search match roles without a sequential scan
+        Index(
+            "ix_employees_role_trgm", "role",
+            postgresql_using="gin", postgresql_ops={"role": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<Employee(id={self.id}, email='{self.email}', full_name='{self.full_name}')>"
+
+
+# The trigram indexes need the pg_trgm extension in place first
+event.listen(
+    Employee.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class EmployeeEvent(Base):
+    """One change to an employee, appended in the same transaction as the change.
+
+    `changes` holds the new values of the fields that changed; a
+    "created" event holds the whole record. Rows are never updated or
+    deleted, and there is deliberately no foreign key: the history of
+    an employee outlives the employee.
+
+    On Postgres the table is range-partitioned by month on occurred_at
+    (see app.history.create_partitions). A partitioned table's unique
+    constraints must include the partition key, and nothing looks an
+    event up by id alone, so there the table has no primary key.
+    """
+    __tablename__ = "employee_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), autoincrement=True)
+    employee_id = Column(Integer, nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    kind = Column(String(16), nullable=False)
+    actor = Column(String(255), nullable=True)
+    changes = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id").ddl_if(dialect="sqlite"),
+        # An employee's history, and replaying it up to a point in time
+        Index("ix_employee_events_employee_id_occurred_at", "employee_id", "occurred_at", "id"),
+        # One entry per employee: who was hired since a snapshot, in id order
+        Index(
+            "ix_employee_events_created", "employee_id", "occurred_at",
+            sqlite_where=text("kind = 'created'"), postgresql_where=text("kind = 'created'"),
+        ),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    def __repr__(self):
+        return f"<EmployeeEvent(id={self.id}, employee_id={self.employee_id}, kind='{self.kind}')>"
+
+
+class EmployeeSnapshot(Base):
+    """Every employee's state at snapshot_at, the starting point for as-of queries"""
+    __tablename__ = "employee_snapshots"
+
+    snapshot_at = Column(DateTime(timezone=True), primary_key=True)
+    employee_id = Column(Integer, primary_key=True)
+    email = Column(String(255), nullable=False)
+    full_name = Column(String(200), nullable=False)
+    role = Column(String(100), nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    joined_date = Column(DateTime(timezone=True))
+    department_id = Column(Integer, nullable=False)
+    manager_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# Rows outside every monthly partition land here rather than failing the write
+event.listen(
+    EmployeeEvent.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS employee_events_default PARTITION OF employee_events DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class Job(Base):
+    """A unit of background work (see app.jobs), from queued to succeeded or failed.
+
+    Workers claim queued jobs with FOR UPDATE SKIP LOCKED and keep
+    heartbeat_at current while they run one; a running job whose
+    heartbeat lapses is handed to another worker.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(32), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")
+    params = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    actor = Column(String(255), nullable=True)
+    # Items processed so far out of total (unknown until the job counts them)
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    result = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only unfinished jobs are indexed, so claiming stays cheap however
+        # many finished jobs the table keeps
+        Index(
+            "ix_jobs_unfinished", "status", "id",
+            sqlite_where=text("status IN ('queued', 'running')"),
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}')>"
+
+
+class JobFile(Base):
+    """A job's input upload or result artifact, stored gzip-compressed.
+
+    Kept out of the jobs table so claiming and polling jobs never read them.
+    """
+    __tablename__ = "job_files"
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String(16), primary_key=True)
+    media_type = Column(String(100), nullable=False)
+    filename = Column(String(255), nullable=False)
+    content = Column(LargeBinary, nullable=False)
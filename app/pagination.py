@@ -0,0 +1,69 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from app.models import Employee
+
+
+# Columns the employee listing can be ordered by. Each one is paired with
+# Employee.id as a tie-breaker so the (sort column, id) pair is unique and
+# can be used as a keyset cursor.
+EMPLOYEE_SORT_COLUMNS = {
+    "id": Employee.id,
+    "email": Employee.email,
+    "full_name": Employee.full_name,
+    "joined_date": Employee.joined_date,
+}
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """Split a sort parameter like '-joined_date' into (column, descending)"""
+    descending = sort.startswith("-")
+    column = sort.lstrip("-")
+    if column not in EMPLOYEE_SORT_COLUMNS:
+        raise ValueError(
+            f"Cannot sort by '{column}'. Allowed: {', '.join(EMPLOYEE_SORT_COLUMNS)}"
+        )
+    return column, descending
+
+
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    """Build an opaque cursor pointing just past the given row"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Decode a cursor into (sort value, last id), validating it matches the sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_sort, value, last_id = payload["s"], payload["v"], int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Malformed cursor")
+
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+
+    column, _ = parse_sort(sort)
+    # Ids are JSON numbers and the other columns strings; anything else
+    # would only fail once it reached the query
+    if value is not None and type(value) is not (int if column == "id" else str):
+        raise ValueError("Malformed cursor")
+    if column == "joined_date" and value is not None:
+        try:
+            value = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise ValueError("Malformed cursor")
+    return value, last_id
+
+
+def next_cursor(sort: str, last_row: Optional[Employee]) -> Optional[str]:
+    """Cursor for the page after the one ending with last_row"""
+    if last_row is None:
+        return None
+    column, _ = parse_sort(sort)
+    return encode_cursor(sort, getattr(last_row, column), last_row.id)
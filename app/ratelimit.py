@@ -0,0 +1,258 @@
+"""
+Admission control for the API: per-client rate limits and load shedding.
+
+Every /api request passes three checks before it reaches its handler:
+
+1. Rate limit (429). Each client gets a token bucket of
+   RATE_LIMIT_BURST requests refilled at RATE_LIMIT_PER_SECOND. Clients
+   are told apart by their X-API-Key header, or by address without one.
+   Buckets are kept in process unless RATE_LIMIT_REDIS_URL is set, in
+   which case every worker shares them. RATE_LIMIT_PER_SECOND=0 (the
+   default) disables the limit.
+
+2. Pool shedding (503). Once more than DB_POOL_SHED_THRESHOLD requests
+   are already queued for a database connection, new ones are turned
+   away at once instead of joining the queue and timing out.
+
+3. Route concurrency (503). Each route may have at most
+   ROUTE_CONCURRENCY_DEFAULT requests in flight per worker, so one busy
+   endpoint can't take every pooled connection. ROUTE_CONCURRENCY
+   overrides it per route, e.g. "GET /api/v1/employees/export=2".
+
+Rejections carry Retry-After and are counted per route in /metrics.
+"""
+import hashlib
+import math
+import os
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional, Protocol, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from app.database import MAX_OVERFLOW, POOL_SIZE
+from app.metrics import pool_waiting
+
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "0")) or max(1, math.ceil(RATE_LIMIT_PER_SECOND * 2))
+# Pool waiters beyond which new requests are shed, 0 to never shed
+DB_POOL_SHED_THRESHOLD = int(os.getenv("DB_POOL_SHED_THRESHOLD", str(POOL_SIZE + MAX_OVERFLOW)))
+# In-flight requests allowed per route and worker, 0 for no limit
+ROUTE_CONCURRENCY_DEFAULT = int(
+    os.getenv("ROUTE_CONCURRENCY_DEFAULT", str(max(1, (POOL_SIZE + MAX_OVERFLOW) * 2 // 3)))
+)
+# Exports hold a connection for the whole download
+ROUTE_CONCURRENCY = os.getenv("ROUTE_CONCURRENCY", "GET /api/v1/employees/export=2")
+SHED_RETRY_AFTER_SECONDS = int(os.getenv("SHED_RETRY_AFTER_SECONDS", "1"))
+
+API_PREFIX = "/api/"
+
+
+class RateLimitBackend(Protocol):
+    """Token-bucket storage; in process or shared between workers"""
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take a token from `key`'s bucket; 0 if granted, else seconds until one is available"""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """Per-process token buckets, evicting the least recently used clients"""
+
+    def __init__(self, max_keys: int = 10_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = self.clock()
+        tokens, updated = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated) * rate)
+        granted = tokens >= 1
+        if granted:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0.0 if granted else (1 - tokens) / rate
+
+
+# KEYS[1] bucket; ARGV rate, burst. Uses the server clock so workers agree.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets in Redis, updated atomically by a Lua script"""
+
+    def __init__(self, client, prefix: str = "hrms:ratelimit:"):
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        return float(await self._take(keys=[self.prefix + key], args=[rate, burst]))
+
+
+def rate_limit_backend_from_env() -> RateLimitBackend:
+    """Redis when RATE_LIMIT_REDIS_URL is set, otherwise an in-process backend"""
+    redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+    if redis_url:
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the 'redis' package is not installed")
+        return RedisRateLimitBackend(redis.from_url(redis_url, decode_responses=True))
+    return MemoryRateLimitBackend()
+
+
+def parse_route_limits(spec: str) -> Dict[str, int]:
+    """Read comma-separated `METHOD /path=limit` pairs"""
+    limits = {}
+    for part in spec.split(","):
+        route, _, limit = part.rpartition("=")
+        if route.strip():
+            limits[" ".join(route.split())] = int(limit)
+    return limits
+
+
+def client_key(scope) -> str:
+    """Who a request is rate limited as: its API key, else its address"""
+    for name, value in scope.get("headers", []):
+        if name == b"x-api-key":
+            # Only a digest of the key is kept, in memory or in Redis
+            return "key:" + hashlib.blake2b(value, digest_size=12).hexdigest()
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class Admission:
+    """The admission rules and their counters, shared by every request in a worker"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: int = RATE_LIMIT_BURST,
+        shed_threshold: int = DB_POOL_SHED_THRESHOLD,
+        route_default: int = ROUTE_CONCURRENCY_DEFAULT,
+        route_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.backend = backend
+        self.rate = rate
+        self.burst = burst
+        self.shed_threshold = shed_threshold
+        self.route_default = route_default
+        self.route_limits = route_limits if route_limits is not None else parse_route_limits(ROUTE_CONCURRENCY)
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.limited: Dict[str, int] = defaultdict(int)
+        self.shed: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def route_limit(self, route: str) -> int:
+        return self.route_limits.get(route, self.route_default)
+
+    async def check(self, scope, route: str) -> Optional[JSONResponse]:
+        """The rejection for this request, or None to let it through"""
+        if self.rate > 0:
+            wait = await self.backend.take(client_key(scope), self.rate, self.burst)
+            if wait > 0:
+                self.limited[route] += 1
+                return _reject(429, "Rate limit exceeded", wait)
+
+        if self.shed_threshold and pool_waiting.value >= self.shed_threshold:
+            self.shed[(route, "pool")] += 1
+            return _reject(503, "Server is overloaded", SHED_RETRY_AFTER_SECONDS)
+
+        limit = self.route_limit(route)
+        if limit and self.in_flight[route] >= limit:
+            self.shed[(route, "concurrency")] += 1
+            return _reject(503, "Too many concurrent requests for this endpoint", SHED_RETRY_AFTER_SECONDS)
+        return None
+
+    def stats(self) -> Dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "pool_waiting": pool_waiting.value,
+            "shed_threshold": self.shed_threshold,
+            "in_flight": {route: n for route, n in self.in_flight.items() if n},
+            "limited": dict(self.limited),
+            "shed": {f"{route} ({reason})": n for (route, reason), n in self.shed.items()},
+        }
+
+    def reset(self) -> None:
+        self.in_flight.clear()
+        self.limited.clear()
+        self.shed.clear()
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+admission = Admission(rate_limit_backend_from_env())
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying `admission` to /api requests.
+
+    Routes are identified by method and path template (as in the
+    metrics), so GET /api/v1/employees/1 and /2 share one limit.
+    """
+
+    def __init__(self, app, router):
+        self.app = app
+        self.router = router
+
+    def _route(self, scope):
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(API_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        matched = self._route(scope)
+        if matched is None:
+            # Unknown paths 404 without touching the database
+            await self.app(scope, receive, send)
+            return
+        route = f"{scope['method']} {matched.path}"
+
+        rejection = await admission.check(scope, route)
+        if rejection is not None:
+            # Label the rejection with its route in the request metrics
+            scope["route"] = matched
+            await rejection(scope, receive, send)
+            return
+
+        admission.in_flight[route] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.in_flight[route] -= 1
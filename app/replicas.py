@@ -0,0 +1,268 @@
+"""
+Routing of read-only requests to read replicas.
+
+Set DATABASE_READ_URL to one or more comma-separated replica URLs. GET
+handlers take their session from `get_read_db`, which picks a healthy
+replica round-robin; everything else keeps using the primary through
+`get_db`. Without DATABASE_READ_URL every read goes to the primary.
+
+A replica is taken out of rotation when a connection to it fails or,
+on PostgreSQL, when it falls more than DB_REPLICA_MAX_LAG_SECONDS
+behind. The background check (started in the app's lifespan) puts it
+back once it answers again; reads fall back to the primary while no
+replica is healthy.
+
+Replicas lag, so a client reading right after its own write could miss
+it. After any successful POST/PUT/PATCH/DELETE (other than endpoints
+marked `read_only`, such as batch lookups) the response sets a
+short-lived cookie, and requests carrying it read from the primary for
+READ_YOUR_WRITES_SECONDS. Clients that don't keep cookies can send the
+same cookie themselves, or `X-Read-Primary: 1`, to force a primary read.
+
+To try it locally, point DATABASE_URL and DATABASE_READ_URL at two
+SQLite files (or two Postgres databases) standing in for the primary
+and its replica.
+"""
+import asyncio
+import logging
+import os
+import time
+from itertools import count
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.database import get_engine, make_engine, open_session
+
+logger = logging.getLogger("app.replicas")
+
+READ_URLS = [url.strip() for url in os.getenv("DATABASE_READ_URL", "").split(",") if url.strip()]
+# Seconds between background health checks of each replica
+REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "10"))
+# How long a replica that failed stays out of rotation before it is tried again
+REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+# Replicas further behind the primary than this are skipped (PostgreSQL only)
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "30"))
+REPLICA_CHECK_TIMEOUT = float(os.getenv("DB_REPLICA_CHECK_TIMEOUT", "2"))
+# How long a client that just wrote keeps reading from the primary, 0 to disable
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+PIN_COOKIE = "read_primary"
+PIN_HEADER = "x-read-primary"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Seconds of replay lag; 0 when the replica has replayed everything it received
+_PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """The primary engine plus the replica engines reads are spread across.
+
+    Engines can be given directly or as `urls`; those are only turned
+    into engines when first needed, like the primary (app.database).
+    """
+
+    def __init__(
+        self,
+        primary: Optional[AsyncEngine] = None,
+        replicas: Optional[List[AsyncEngine]] = None,
+        urls: Sequence[str] = (),
+        retry_after: float = REPLICA_RETRY_SECONDS,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+    ):
+        self._primary = primary
+        self._replicas = replicas
+        self.urls = list(urls)
+        self.retry_after = retry_after
+        self.max_lag = max_lag
+        # replica index -> monotonic time until which it is skipped
+        self._down_until: Dict[int, float] = {}
+        self._errors: Dict[int, str] = {}
+        self._turn = count()
+
+    @property
+    def primary(self) -> AsyncEngine:
+        return self._primary or get_engine()
+
+    @property
+    def replicas(self) -> List[AsyncEngine]:
+        if self._replicas is None:
+            self._replicas = [make_engine(url) for url in self.urls]
+        return self._replicas
+
+    @property
+    def configured(self) -> bool:
+        """Whether there are replicas, without creating their engines"""
+        return bool(self._replicas or self.urls)
+
+    def healthy(self) -> List[AsyncEngine]:
+        now = time.monotonic()
+        return [
+            replica for i, replica in enumerate(self.replicas)
+            if self._down_until.get(i, 0.0) <= now
+        ]
+
+    def pick(self) -> AsyncEngine:
+        """The next healthy replica, or the primary if there is none"""
+        healthy = self.healthy()
+        if not healthy:
+            return self.primary
+        return healthy[next(self._turn) % len(healthy)]
+
+    def is_replica(self, bind) -> bool:
+        """Whether `bind` is one of the replica engines, without creating them"""
+        return any(bind is replica for replica in self._replicas or ())
+
+    def mark_down(self, replica: AsyncEngine, reason: str) -> None:
+        i = self.replicas.index(replica)
+        if self._down_until.get(i, 0.0) <= time.monotonic():
+            logger.warning("Replica %s taken out of rotation: %s", _label(replica), reason)
+        self._down_until[i] = time.monotonic() + self.retry_after
+        self._errors[i] = reason
+
+    def mark_up(self, replica: AsyncEngine) -> None:
+        i = self.replicas.index(replica)
+        if self._down_until.pop(i, None) is not None:
+            logger.info("Replica %s back in rotation", _label(replica))
+        self._errors.pop(i, None)
+
+    async def check(self, replica: AsyncEngine) -> bool:
+        """Probe one replica and update its place in the rotation"""
+        try:
+            async with replica.connect() as conn:
+                if replica.dialect.name == "postgresql":
+                    lag = float(await asyncio.wait_for(conn.scalar(_PG_REPLICA_LAG), REPLICA_CHECK_TIMEOUT))
+                else:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), REPLICA_CHECK_TIMEOUT)
+                    lag = 0.0
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            self.mark_down(replica, str(e) or type(e).__name__)
+            return False
+        if lag > self.max_lag:
+            self.mark_down(replica, f"{lag:.1f}s behind the primary")
+            return False
+        self.mark_up(replica)
+        return True
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def monitor(self, interval: float = REPLICA_CHECK_SECONDS) -> None:
+        """Re-check every replica forever; run as a background task"""
+        while True:
+            await self.check_all()
+            await asyncio.sleep(interval)
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "replica": _label(replica),
+                "healthy": self._down_until.get(i, 0.0) <= now,
+                "error": self._errors.get(i),
+            }
+            for i, replica in enumerate(self.replicas)
+        ]
+
+    async def dispose(self) -> None:
+        for replica in self._replicas or []:
+            await replica.dispose()
+
+
+def _label(replica: AsyncEngine) -> str:
+    return replica.url.render_as_string(hide_password=True)
+
+
+replica_set = ReplicaSet(urls=READ_URLS)
+
+
+def read_only(endpoint: Callable) -> Callable:
+    """Mark a non-GET endpoint as a read, e.g. a POST whose body is the query.
+
+    It may then be served from a replica and doesn't pin the client to
+    the primary. Apply it beneath the route decorator.
+    """
+    endpoint.read_only = True
+    return endpoint
+
+
+def is_read(scope) -> bool:
+    """Whether a request only reads: a safe method, or a `read_only` endpoint.
+
+    The endpoint is only known once the request has been routed.
+    """
+    return scope["method"] in SAFE_METHODS or getattr(scope.get("endpoint"), "read_only", False)
+
+
+def wants_primary(request: Request) -> bool:
+    """Whether this request must read from the primary"""
+    return (
+        not is_read(request.scope)
+        or PIN_COOKIE in request.cookies
+        or request.headers.get(PIN_HEADER) == "1"
+    )
+
+
+def reads_replica(db: AsyncSession) -> bool:
+    """Whether `db` is bound to a replica rather than the primary.
+
+    What a lagging replica returns may predate a write whose
+    invalidation has already happened, so such reads mustn't fill the
+    shared caches (app.cache).
+    """
+    return replica_set.is_replica(db.bind)
+
+
+def read_engine(request: Request) -> AsyncEngine:
+    """Dependency: the engine a read-only request should use"""
+    return replica_set.primary if wants_primary(request) else replica_set.pick()
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency: a session on a replica for reads, falling back to the primary"""
+    bind = read_engine(request)
+    try:
+        session = await open_session(bind)
+    except (SQLAlchemyError, OSError) as e:
+        if bind is replica_set.primary:
+            raise
+        replica_set.mark_down(bind, str(e))
+        session = await open_session(replica_set.primary)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning a client to the primary just after it writes"""
+
+    def __init__(self, app, seconds: int = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.cookie = f"{PIN_COOKIE}=1; Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax".encode()
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not self.seconds
+            or not replica_set.configured
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            # By the time the response starts, routing has filled in scope["endpoint"]
+            if message["type"] == "http.response.start" and message["status"] < 400 and not is_read(scope):
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
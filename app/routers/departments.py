@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 
 from app.database import get_db
-from app.schemas import DepartmentCreate, DepartmentResponse
+from app.replicas import get_read_db
+from app.schemas import (
+    BulkImportResult, DepartmentCreate, DepartmentResponse, DepartmentStats, DepartmentUpdate,
+    DepartmentWithEmployees, EmployeeFilter, EmployeeResponse,
+)
+from app.pagination import decode_cursor, next_cursor, parse_sort
+from app.http_cache import conditional, versions_etag
+from app.serialization import FastJSONResponse
+from app.bulk import parse_rows, run_import, BULK_REQUEST_BODY
+from app.history import request_actor
 from app import crud
 
 router = APIRouter(
@@ -18,33 +28,184 @@ async def create_department(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new department"""
-    # Check if department name already exists
-    existing_dept = await crud.get_department_by_name(db, department.name)
-    if existing_dept:
+    try:
+        return await crud.create_department(db, department)
+    except IntegrityError as e:
+        if crud.integrity_violation(e) == crud.UNIQUE_VIOLATION:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Department with name '{department.name}' already exists"
+            )
+        raise
+
+
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=BULK_REQUEST_BODY)
+async def bulk_create_departments(
+    request: Request,
+    atomic: bool = Query(False, description="Reject the whole upload if any row fails"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many departments from a JSON array, NDJSON or CSV upload.
+
+    Rows are checked and inserted in chunks. In the default partial mode
+    each valid row is created and failures are reported per row; with
+    `atomic=true` nothing is written unless every row succeeds.
+    """
+    try:
+        rows = parse_rows(request.headers.get("content-type", ""), await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return await run_import(db, DepartmentCreate, rows, crud.bulk_create_departments, atomic)
+
+
+async def get_department_or_404(db: AsyncSession, department_id: int) -> DepartmentResponse:
+    """Fetch a department or raise a 404"""
+    department = await crud.get_department_by_id(db, department_id)
+    if not department:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Department with name '{department.name}' already exists"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Department with id {department_id} not found"
         )
-    
-    return await crud.create_department(db, department)
+    return department
+
+
+def content_versions(departments: List[DepartmentResponse]):
+    """(id, updated_at) of the departments and any embedded employees"""
+    for department in departments:
+        yield department.id, department.updated_at
+        for employee in getattr(department, "employees", ()):
+            yield employee.id, employee.updated_at
+
+
+def embed_employees(department: DepartmentResponse, employees) -> DepartmentWithEmployees:
+    return DepartmentWithEmployees(
+        **department.model_dump(),
+        employees=[EmployeeResponse.model_validate(employee) for employee in employees],
+    )
 
 
-@router.get("/", response_model=List[DepartmentResponse])
-async def get_departments(db: AsyncSession = Depends(get_db)):
-    """Get all departments"""
-    return await crud.get_departments(db)
+@router.get("/", response_model=Union[List[DepartmentWithEmployees], List[DepartmentResponse]])
+async def get_departments(
+    request: Request,
+    include: Optional[str] = Query(None, pattern="^employees$", description="Embed each department's employees"),
+    employees_limit: int = Query(100, ge=1, le=1000, description="Max employees embedded per department"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get all departments.
+
+    With `include=employees`, the first `employees_limit` employees of every
+    department are embedded, loaded together in a single query.
+    Responses carry an ETag; send it back in If-None-Match to get a 304.
+    """
+    departments = await crud.get_departments(db)
+    if include:
+        employees = await crud.get_department_employees(
+            db, [department.id for department in departments], employees_limit
+        )
+        departments = [embed_employees(d, employees[d.id]) for d in departments]
+    etag = versions_etag(request, content_versions(departments))
+    return conditional(request, etag, lambda: FastJSONResponse([d.model_dump() for d in departments]))
 
 
-@router.get("/{department_id}", response_model=DepartmentResponse)
+@router.get("/{department_id}", response_model=Union[DepartmentWithEmployees, DepartmentResponse])
 async def get_department(
     department_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    include: Optional[str] = Query(None, pattern="^employees$", description="Embed the department's employees"),
+    employees_limit: int = Query(100, ge=1, le=1000, description="Max employees to embed"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a department by ID"""
-    department = await crud.get_department_by_id(db, department_id)
+    department = await get_department_or_404(db, department_id)
+    # Only the bare department has a meaningful modification time
+    last_modified = department.updated_at
+    if include:
+        employees = await crud.get_employees(
+            db, limit=employees_limit, filters=EmployeeFilter(department_id=department_id)
+        )
+        department = embed_employees(department, employees)
+        last_modified = None
+    etag = versions_etag(request, content_versions([department]))
+    return conditional(
+        request, etag, lambda: FastJSONResponse(department.model_dump()), last_modified=last_modified
+    )
+
+
+@router.patch("/{department_id}", response_model=DepartmentResponse)
+async def update_department(
+    department_id: int,
+    changes: DepartmentUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a department's name or description"""
+    try:
+        department = await crud.update_department(db, department_id, changes)
+    except IntegrityError as e:
+        if crud.integrity_violation(e) == crud.UNIQUE_VIOLATION:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Department with name '{changes.name}' already exists"
+            )
+        raise
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Department with id {department_id} not found"
         )
     return department
+
+
+@router.delete("/{department_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_department(
+    department_id: int,
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a department together with all of its employees"""
+    if not await crud.delete_department(db, department_id, actor=actor):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Department with id {department_id} not found"
+        )
+
+
+@router.get("/{department_id}/employees", response_model=List[EmployeeResponse])
+async def get_department_employees(
+    department_id: int,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    sort: str = Query("id", description="Sort column, prefix with '-' for descending"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a department's employees with offset or cursor pagination"""
+    try:
+        parse_sort(sort)
+        after = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await get_department_or_404(db, department_id)
+
+    employees = await crud.get_employees(
+        db, skip=skip, limit=limit, sort=sort, after=after,
+        filters=EmployeeFilter(department_id=department_id),
+    )
+    etag = versions_etag(request, ((e.id, e.updated_at) for e in employees))
+    response = conditional(request, etag, lambda: FastJSONResponse(
+        [EmployeeResponse.model_validate(employee).model_dump() for employee in employees]
+    ))
+    if len(employees) == limit:
+        response.headers["X-Next-Cursor"] = next_cursor(sort, employees[-1])
+    return response
+
+
+@router.get("/{department_id}/stats", response_model=DepartmentStats)
+async def get_department_stats(
+    department_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get headcount, active count and role breakdown for a department"""
+    await get_department_or_404(db, department_id)
+    return await crud.get_department_stats(db, department_id)
@@ -1,9 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+import asyncio
+from datetime import datetime
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from typing import List, Optional
 
 from app.database import get_db
-from app.schemas import EmployeeCreate, EmployeeResponse
+from app.replicas import get_read_db, read_engine, read_only
+from app.schemas import (
+    BatchGetRequest, BulkImportResult, BulkUpdateResult, EmployeeBatch, EmployeeCreate, EmployeeResponse, EmployeeCount,
+    EmployeeEvent, EmployeeFilter, EmployeeReassign, EmployeeSearchResult, EmployeeUpdate, OrgChartEntry,
+)
+from app.pagination import decode_cursor, encode_cursor, next_cursor, parse_sort
+from app.serialization import FastJSONResponse, rows_to_dicts
+from app.http_cache import accepts_gzip, conditional, versions_etag
+from app.bulk import parse_rows, run_import, BULK_REQUEST_BODY
+from app.export import MEDIA_TYPES, export_employees
+from app.history import employees_as_of, get_history, matches, request_actor
 from app import crud
 
 router = APIRouter(
@@ -12,47 +27,326 @@ router = APIRouter(
 )
 
 
+def employee_filters(
+    department_id: Optional[int] = None,
+    manager_id: Optional[int] = Query(None, description="Direct reports of this employee"),
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    joined_after: Optional[datetime] = Query(None, description="Joined on or after this time"),
+    joined_before: Optional[datetime] = Query(None, description="Joined before this time"),
+    name: Optional[str] = Query(None, description="Case-insensitive full name prefix"),
+    email: Optional[str] = Query(None, description="Case-insensitive email prefix"),
+) -> EmployeeFilter:
+    """Collect the employee listing filters from the query string"""
+    return EmployeeFilter(
+        department_id=department_id,
+        manager_id=manager_id,
+        role=role,
+        is_active=is_active,
+        joined_after=joined_after,
+        joined_before=joined_before,
+        name=name,
+        email=email,
+    )
+
+
+# Every column of EmployeeResponse, in schema order
+EMPLOYEE_FIELDS = list(EmployeeResponse.model_fields)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated `fields` projection"""
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in EmployeeResponse.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return requested
+
+
+async def missing_reference(db: AsyncSession, department_id: Optional[int], manager_id: Optional[int]) -> HTTPException:
+    """404 for a write that broke a foreign key: the department, else the manager"""
+    if department_id is not None and not await crud.get_department_by_id(db, department_id):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Department with id {department_id} not found"
+        )
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Manager with id {manager_id} not found"
+    )
+
+
 @router.post("/", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
 async def create_employee(
     employee: EmployeeCreate,
+    actor: str = Depends(request_actor),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new employee"""
-    # Check if email already exists
-    existing_employee = await crud.get_employee_by_email(db, employee.email)
-    if existing_employee:
+    try:
+        return await crud.create_employee(db, employee, actor=actor)
+    except IntegrityError as e:
+        violation = crud.integrity_violation(e)
+        if violation == crud.FOREIGN_KEY_VIOLATION:
+            raise await missing_reference(db, employee.department_id, employee.manager_id)
+        if violation == crud.UNIQUE_VIOLATION:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Employee with email '{employee.email}' already exists"
+            )
+        raise
+
+
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=BULK_REQUEST_BODY)
+async def bulk_create_employees(
+    request: Request,
+    atomic: bool = Query(False, description="Reject the whole upload if any row fails"),
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many employees from a JSON array, NDJSON or CSV upload.
+
+    Rows are checked and inserted in chunks. In the default partial mode
+    each valid row is created and failures are reported per row; with
+    `atomic=true` nothing is written unless every row succeeds.
+    """
+    try:
+        rows = parse_rows(request.headers.get("content-type", ""), await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    create_many = partial(crud.bulk_create_employees, actor=actor)
+    return await run_import(db, EmployeeCreate, rows, create_many, atomic)
+
+
+@router.post("/batch-get", response_model=EmployeeBatch)
+@read_only
+async def batch_get_employees(
+    batch: BatchGetRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get many employees by id with one query.
+
+    Employees come back in the order their ids were requested (repeated
+    ids once each), and ids with no employee are listed in `missing`.
+    """
+    ids = list(dict.fromkeys(batch.ids))
+    found = await crud.get_employees_by_ids(db, ids)
+    return FastJSONResponse({
+        "employees": [EmployeeResponse.model_validate(found[id_]).model_dump() for id_ in ids if id_ in found],
+        "missing": [id_ for id_ in ids if id_ not in found],
+    })
+
+
+@router.post("/deactivate", response_model=BulkUpdateResult)
+async def deactivate_employees(
+    filters: EmployeeFilter = Depends(employee_filters),
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Deactivate every active employee matching the filters.
+
+    Runs as a single UPDATE ... WHERE. At least one filter is required so
+    an empty query string can't deactivate the whole company.
+    """
+    if not filters.is_set():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Employee with email '{employee.email}' already exists"
+            detail="At least one filter is required"
         )
-    
-    # Check if department exists
-    department = await crud.get_department_by_id(db, employee.department_id)
-    if not department:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Department with id {employee.department_id} not found"
-        )
-    
-    return await crud.create_employee(db, employee)
+    return BulkUpdateResult(affected=await crud.deactivate_employees(db, filters, actor=actor))
+
+
+@router.post("/reassign", response_model=BulkUpdateResult)
+async def reassign_employees(
+    reassign: EmployeeReassign,
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Move every employee of one department to another in a single UPDATE"""
+    departments = await asyncio.gather(
+        crud.get_department_by_id(db, reassign.from_department_id),
+        crud.get_department_by_id(db, reassign.to_department_id),
+    )
+    for department_id, department in zip((reassign.from_department_id, reassign.to_department_id), departments):
+        if not department:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Department with id {department_id} not found"
+            )
+    affected = await crud.reassign_employees(
+        db, reassign.from_department_id, reassign.to_department_id, actor=actor
+    )
+    return BulkUpdateResult(affected=affected)
 
 
 @router.get("/", response_model=List[EmployeeResponse])
 async def get_employees(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    sort: str = Query("id", description="Sort column, prefix with '-' for descending"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,email"),
+    as_of: Optional[datetime] = Query(None, description="List the employees as they were at this time"),
+    filters: EmployeeFilter = Depends(employee_filters),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get employees with filtering, projection and offset or cursor pagination.
+
+    When the page is full, the `X-Next-Cursor` response header carries a
+    cursor for the following page. Passing it back as `cursor` seeks
+    directly to the next row instead of scanning past `skip` rows.
+    With `fields`, only the listed columns are selected and returned.
+
+    Rows are selected as plain column tuples and encoded straight to JSON,
+    skipping ORM hydration and response-model re-validation; the output
+    is identical to serializing them through EmployeeResponse.
+    The ETag is derived from the page's ids and updated_at values, so an
+    unchanged page is answered with a 304 before it is serialized.
+
+    With `as_of`, the directory is rebuilt from the change history as it
+    stood at that time. Those listings are ordered by id and paged with
+    the cursor only, and filters are applied to each page after it is
+    rebuilt, so a page may hold fewer than `limit` employees; keep
+    following X-Next-Cursor until it is absent.
+    """
+    try:
+        parse_sort(sort)
+        after = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    columns = parse_fields(fields) or EMPLOYEE_FIELDS
+
+    if as_of is not None:
+        if sort != "id" or skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="as_of listings are sorted by id and paged with cursor, not skip"
+            )
+        employees, last_id = await employees_as_of(
+            db, as_of, limit=limit, after_id=after[1] if after else None
+        )
+        response = FastJSONResponse([
+            # Events from before a field existed don't mention it
+            {name: employee.get(name) for name in columns} for employee in employees if matches(employee, filters)
+        ])
+        if last_id is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(sort, last_id, last_id)
+        return response
+
+    rows = await crud.get_employee_rows(
+        db, columns, skip=skip, limit=limit, sort=sort, after=after, filters=filters
+    )
+    etag = versions_etag(request, ((row.id, row.updated_at) for row in rows))
+    response = conditional(request, etag, lambda: FastJSONResponse(rows_to_dicts(rows, columns)))
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = next_cursor(sort, rows[-1])
+    return response
+
+
+@router.get("/count", response_model=EmployeeCount)
+async def count_employees(
+    exact: bool = Query(False, description="Force an exact COUNT(*) instead of the planner estimate"),
+    filters: EmployeeFilter = Depends(employee_filters),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the number of employees matching the filters"""
+    total, estimated = await crud.count_employees(db, exact=exact, filters=filters)
+    return EmployeeCount(total=total, estimated=estimated)
+
+
+@router.get("/search", response_model=List[EmployeeSearchResult])
+async def search_employees(
+    q: str = Query(..., min_length=1, max_length=200, description="Partial name, email or role"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fuzzy search over name, email and role, best matches first.
+
+    Matching is by trigram similarity, so partial words and small typos
+    still find the employee. Name matches rank above email matches,
+    which rank above role matches.
+    """
+    results = await crud.search_employees(db, q, limit=limit)
+    return [
+        EmployeeSearchResult(**EmployeeResponse.model_validate(employee).model_dump(), score=score)
+        for employee, score in results
+    ]
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_employee_directory(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: EmployeeFilter = Depends(employee_filters),
+    bind: AsyncEngine = Depends(read_engine),
 ):
-    """Get all employees with pagination"""
-    return await crud.get_employees(db, skip=skip, limit=limit)
+    """Stream every matching employee as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written out batch by
+    batch, so memory use stays flat regardless of directory size. The
+    body is gzip-encoded when the client sends `Accept-Encoding: gzip`.
+    """
+    compress = accepts_gzip(request.headers)
+    headers = {"Content-Disposition": f'attachment; filename="employees.{format}"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_employees(format, filters, compress=compress, bind=bind),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
 
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 async def get_employee(
     employee_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get an employee by ID"""
+    """Get an employee by ID, honouring If-None-Match and If-Modified-Since"""
+    employee = await crud.get_employee_by_id(db, employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with id {employee_id} not found"
+        )
+    etag = versions_etag(request, [(employee.id, employee.updated_at)])
+    return conditional(
+        request, etag,
+        lambda: FastJSONResponse(EmployeeResponse.model_validate(employee).model_dump()),
+        last_modified=employee.updated_at,
+    )
+
+
+@router.get("/{employee_id}/history", response_model=List[EmployeeEvent])
+async def get_employee_history(
+    employee_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Every recorded change to an employee, oldest first.
+
+    Each event carries the fields it set (`changes`), the values they
+    replaced (`previous`) and who made the change (`actor`). History is
+    kept after the employee is deleted.
+    """
+    events = await get_history(db, employee_id)
+    if not events and not await crud.get_employee_by_id(db, employee_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with id {employee_id} not found"
+        )
+    return events
+
+
+async def get_employee_or_404(db: AsyncSession, employee_id: int):
+    """Fetch an employee or raise a 404"""
     employee = await crud.get_employee_by_id(db, employee_id)
     if not employee:
         raise HTTPException(
@@ -60,3 +354,112 @@ async def get_employee(
             detail=f"Employee with id {employee_id} not found"
         )
     return employee
+
+
+@router.get("/{employee_id}/reports", response_model=List[EmployeeResponse])
+async def get_direct_reports(
+    employee_id: int,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    sort: str = Query("id", description="Sort column, prefix with '-' for descending"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the employees reporting directly to an employee, with offset or cursor pagination"""
+    try:
+        parse_sort(sort)
+        after = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await get_employee_or_404(db, employee_id)
+
+    employees = await crud.get_employees(
+        db, skip=skip, limit=limit, sort=sort, after=after,
+        filters=EmployeeFilter(manager_id=employee_id),
+    )
+    etag = versions_etag(request, ((e.id, e.updated_at) for e in employees))
+    response = conditional(request, etag, lambda: FastJSONResponse(
+        [EmployeeResponse.model_validate(employee).model_dump() for employee in employees]
+    ))
+    if len(employees) == limit:
+        response.headers["X-Next-Cursor"] = next_cursor(sort, employees[-1])
+    return response
+
+
+@router.get("/{employee_id}/subtree", response_model=List[OrgChartEntry])
+async def get_org_subtree(
+    employee_id: int,
+    max_depth: Optional[int] = Query(None, ge=1, description="Stop this many levels down"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,full_name"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Everyone who reports to an employee, directly or indirectly.
+
+    Ordered level by level (`depth` 1 is the direct reports), then by
+    id. The whole subtree comes from one recursive query however large
+    it is; use `fields` to keep big subtrees small on the wire.
+    """
+    columns = parse_fields(fields) or EMPLOYEE_FIELDS
+    rows = await crud.get_org_subtree(db, employee_id, columns, max_depth=max_depth)
+    if not rows:
+        await get_employee_or_404(db, employee_id)
+    return FastJSONResponse(rows_to_dicts(rows, [*columns, "depth"]))
+
+
+@router.get("/{employee_id}/chain", response_model=List[OrgChartEntry])
+async def get_chain_of_command(
+    employee_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,full_name"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """An employee's manager, their manager and so on up to the top, nearest first"""
+    columns = parse_fields(fields) or EMPLOYEE_FIELDS
+    rows = await crud.get_reporting_chain(db, employee_id, columns)
+    if not rows:
+        await get_employee_or_404(db, employee_id)
+    return FastJSONResponse(rows_to_dicts(rows, [*columns, "depth"]))
+
+
+@router.patch("/{employee_id}", response_model=EmployeeResponse)
+async def update_employee(
+    employee_id: int,
+    changes: EmployeeUpdate,
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update some of an employee's fields"""
+    try:
+        employee = await crud.update_employee(db, employee_id, changes, actor=actor)
+    except crud.ReportingCycleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except IntegrityError as e:
+        violation = crud.integrity_violation(e)
+        if violation == crud.FOREIGN_KEY_VIOLATION:
+            raise await missing_reference(db, changes.department_id, changes.manager_id)
+        if violation == crud.UNIQUE_VIOLATION:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Employee with email '{changes.email}' already exists"
+            )
+        raise
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with id {employee_id} not found"
+        )
+    return employee
+
+
+@router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_employee(
+    employee_id: int,
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete an employee"""
+    if not await crud.delete_employee(db, employee_id, actor=actor):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with id {employee_id} not found"
+        )
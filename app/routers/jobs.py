@@ -0,0 +1,152 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas import EmployeeFilter, EmployeeReassign, JobResponse
+from app.bulk import parse_rows, BULK_REQUEST_BODY
+from app.history import request_actor
+from app.http_cache import accepts_gzip
+from app.models import Job
+from app.routers.employees import employee_filters
+from app import crud, jobs
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
+
+def job_response(request: Request, job: Job, has_artifact: bool) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=jobs.progress_percent(job),
+        processed=job.processed,
+        total=job.total,
+        attempts=job.attempts,
+        result=job.result,
+        error=job.error,
+        artifact_url=str(request.url_for("get_job_artifact", job_id=job.id)) if has_artifact else None,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def accepted(request: Request, response: Response, job: Job) -> JobResponse:
+    """202 body for a newly queued job, with Location pointing at its status"""
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return job_response(request, job, has_artifact=False)
+
+
+@router.post(
+    "/employees/import", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=BULK_REQUEST_BODY,
+)
+async def enqueue_employee_import(
+    request: Request,
+    response: Response,
+    atomic: bool = Query(False, description="Reject the whole upload if any row fails"),
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a bulk import of employees from a JSON array, NDJSON or CSV upload.
+
+    The upload is parsed here, so a malformed one is rejected straight
+    away; the rows are checked and created by a worker. The finished
+    job's artifact holds the per-row results that `POST /employees/bulk`
+    would have returned.
+    """
+    try:
+        rows = parse_rows(request.headers.get("content-type", ""), await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    job = await jobs.enqueue(
+        db, jobs.IMPORT_EMPLOYEES, {"atomic": atomic, "rows": len(rows)}, actor=actor,
+        input=json.dumps(rows, separators=(",", ":")).encode(),
+    )
+    return accepted(request, response, job)
+
+
+@router.post("/employees/export", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_employee_export(
+    request: Request,
+    response: Response,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: EmployeeFilter = Depends(employee_filters),
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue an export of every matching employee; the file is the job's artifact"""
+    job = await jobs.enqueue(
+        db, jobs.EXPORT_EMPLOYEES,
+        {"format": format, "filters": filters.model_dump(mode="json", exclude_none=True)}, actor=actor,
+    )
+    return accepted(request, response, job)
+
+
+@router.post("/employees/reassign", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_employee_reassign(
+    reassign: EmployeeReassign,
+    request: Request,
+    response: Response,
+    actor: str = Depends(request_actor),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue moving every employee of one department to another.
+
+    The worker moves them in batches, each its own short transaction,
+    rather than in one UPDATE holding every row's lock at once.
+    """
+    for department_id in (reassign.from_department_id, reassign.to_department_id):
+        if not await crud.get_department_by_id(db, department_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Department with id {department_id} not found"
+            )
+    job = await jobs.enqueue(db, jobs.REASSIGN_EMPLOYEES, reassign.model_dump(), actor=actor)
+    return accepted(request, response, job)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a job's status, progress and, once it has finished, its result"""
+    found = await jobs.get_job(db, job_id)
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+    return job_response(request, *found)
+
+
+@router.get("/{job_id}/artifact")
+async def get_job_artifact(
+    job_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Download the file a finished job produced.
+
+    Files are stored gzipped and sent as they are to clients that send
+    `Accept-Encoding: gzip`; others get them decompressed.
+    """
+    artifact = await jobs.get_file(db, job_id, jobs.RESULT)
+    if not artifact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} has no artifact"
+        )
+    headers = {"Content-Disposition": f'attachment; filename="{artifact.filename}"', "Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers):
+        headers["Content-Encoding"] = "gzip"
+        return Response(artifact.content, media_type=artifact.media_type, headers=headers)
+    return Response(jobs.gunzip(artifact.content), media_type=artifact.media_type, headers=headers)
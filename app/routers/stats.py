@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas import CompanyStats
+from app import crud
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["stats"]
+)
+
+
+@router.get("", response_model=CompanyStats)
+async def get_stats(
+    recent_days: int = Query(30, ge=1, le=365, description="Window for counting recent joiners"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get company-wide headcounts and breakdowns for the dashboard"""
+    return await crud.get_company_stats(db, recent_days=recent_days)
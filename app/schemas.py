@@ -1,6 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Any, Dict, Literal, Optional, List
+from datetime import datetime, timezone
+
+
+def _not_null(value: Any) -> Any:
+    """For PATCH fields that may be left out but can't be cleared"""
+    if value is None:
+        raise ValueError("may be omitted but not null")
+    return value
 
 
 # =============== Department Schemas ===============
@@ -16,9 +23,18 @@ class DepartmentCreate(DepartmentBase):
     pass
 
 
+class DepartmentUpdate(BaseModel):
+    """Schema for partially updating a department"""
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    description: Optional[str] = None
+
+    _name_not_null = field_validator("name", mode="before")(_not_null)
+
+
 class DepartmentResponse(DepartmentBase):
     """Schema for department response"""
     id: int
+    updated_at: datetime
 
     class Config:
         from_attributes = True
@@ -32,6 +48,15 @@ class DepartmentWithEmployees(DepartmentResponse):
         from_attributes = True
 
 
+class DepartmentStats(BaseModel):
+    """Schema for per-department aggregates"""
+    department_id: int
+    headcount: int
+    active_count: int
+    inactive_count: int
+    roles: Dict[str, int]
+
+
 # =============== Employee Schemas ===============
 
 class EmployeeBase(BaseModel):
@@ -41,6 +66,7 @@ class EmployeeBase(BaseModel):
     role: str = Field(default="Employee", max_length=100)
     is_active: bool = True
     department_id: int
+    manager_id: Optional[int] = None
 
 
 class EmployeeCreate(EmployeeBase):
@@ -48,6 +74,27 @@ class EmployeeCreate(EmployeeBase):
     pass
 
 
+class EmployeeUpdate(BaseModel):
+    """Schema for partially updating an employee"""
+    email: Optional[EmailStr] = None
+    full_name: Optional[str] = Field(None, min_length=1, max_length=200)
+    role: Optional[str] = Field(None, max_length=100)
+    is_active: Optional[bool] = None
+    department_id: Optional[int] = None
+    # null moves the employee to the top of the org chart
+    manager_id: Optional[int] = None
+
+    _fields_not_null = field_validator(
+        "email", "full_name", "role", "is_active", "department_id", mode="before"
+    )(_not_null)
+
+
+class EmployeeReassign(BaseModel):
+    """Schema for moving every employee of one department to another"""
+    from_department_id: int
+    to_department_id: int
+
+
 class EmployeeResponse(BaseModel):
     """Schema for employee response"""
     id: int
@@ -57,11 +104,23 @@ class EmployeeResponse(BaseModel):
     is_active: bool
     joined_date: datetime
     department_id: int
+    manager_id: Optional[int] = None
+    updated_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class EmployeeSearchResult(EmployeeResponse):
+    """Schema for a ranked search hit"""
+    score: float
+
+
+class OrgChartEntry(EmployeeResponse):
+    """Schema for an employee in a reporting chain or subtree"""
+    depth: int = Field(..., description="Levels away from the employee asked about")
+
+
 class EmployeeWithDepartment(EmployeeResponse):
     """Schema for employee with department details"""
     department: DepartmentResponse
@@ -70,5 +129,123 @@ class EmployeeWithDepartment(EmployeeResponse):
         from_attributes = True
 
 
+class EmployeeFilter(BaseModel):
+    """Filters accepted by the employee listing endpoints"""
+    department_id: Optional[int] = None
+    manager_id: Optional[int] = None
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+    joined_after: Optional[datetime] = None
+    joined_before: Optional[datetime] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+
+    @field_validator("joined_after", "joined_before")
+    @classmethod
+    def _in_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Times are stored in UTC; SQLite compares them as text, ignoring any offset"""
+        if value is None:
+            return value
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def is_set(self) -> bool:
+        """Whether any filter was supplied"""
+        return any(value is not None for value in self.model_dump().values())
+
+
+class BulkUpdateResult(BaseModel):
+    """Schema for set-based update/delete responses"""
+    affected: int
+
+
+class BatchGetRequest(BaseModel):
+    """Schema for fetching many resources by id in one request"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class EmployeeBatch(BaseModel):
+    """Schema for batch lookup results, in the order the ids were requested"""
+    employees: List[EmployeeResponse]
+    missing: List[int]
+
+
+class EmployeeEvent(BaseModel):
+    """Schema for one entry of an employee's change history"""
+    id: int
+    employee_id: int
+    occurred_at: datetime
+    kind: Literal["created", "updated", "deleted"]
+    actor: Optional[str] = None
+    changes: Dict[str, Any]
+    previous: Dict[str, Any]
+
+
+class EmployeeCount(BaseModel):
+    """Schema for the employee total"""
+    total: int
+    estimated: bool = False
+
+
+# =============== Bulk Import Schemas ===============
+
+class BulkRowResult(BaseModel):
+    """Outcome of importing a single row"""
+    index: int
+    status: Literal["created", "error", "skipped"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkImportResult(BaseModel):
+    """Schema for bulk import response"""
+    created: int
+    failed: int
+    committed: bool
+    results: List[BulkRowResult]
+
+
+# =============== Job Schemas ===============
+
+class JobResponse(BaseModel):
+    """Schema for a background job's state and progress"""
+    id: int
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: float = Field(..., description="Percent complete")
+    processed: int
+    total: Optional[int] = None
+    attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    artifact_url: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# =============== Stats Schemas ===============
+
+class DepartmentHeadcount(BaseModel):
+    """Headcount of a single department"""
+    department_id: int
+    name: str
+    headcount: int
+    active_count: int
+
+
+class CompanyStats(BaseModel):
+    """Schema for the company-wide dashboard stats"""
+    total_departments: int
+    total_employees: int
+    active_employees: int
+    inactive_employees: int
+    recent_joiners: int
+    recent_days: int
+    by_role: Dict[str, int]
+    by_department: List[DepartmentHeadcount]
+
+
 # Update forward references for circular dependency
 DepartmentWithEmployees.model_rebuild()
@@ -0,0 +1,223 @@
+import asyncio
+import heapq
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from itertools import groupby
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Relative weight of a match in each field when ranking results
+FIELD_WEIGHTS = {"full_name": 1.0, "email": 0.9, "role": 0.5}
+SEARCHABLE_FIELDS = tuple(FIELD_WEIGHTS)
+
+# Fraction of the query's trigrams a field must contain to match
+SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", "0.5"))
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Lower-cased word trigrams, each word padded with two leading spaces.
+
+    Like pg_trgm, but words are not padded at the end, so a query for
+    "ali" shares all of its trigrams with "alice" and prefixes rank as
+    full matches.
+    """
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word}"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-memory trigram inverted index over employees' searchable fields.
+
+    Used where the database has no trigram support (SQLite in local runs
+    and tests). It is built from the table on first use and then kept
+    current by the crud write functions in this process (through
+    `track_add` / `track_remove`, which hold back writes made while the
+    index is loading and apply them once it has); writes made by other
+    processes are only picked up after `invalidate()`.
+
+    A field matches when it contains at least `min_similarity` of the
+    query's trigrams, and scores that share times the field's weight.
+    Roles take few distinct values, so they are indexed once per value
+    rather than once per employee.
+    """
+
+    def __init__(self, min_similarity: float = SEARCH_MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self.loaded = False
+        # field -> trigram -> employee ids (or, for role, role values)
+        self._postings: Dict[str, Dict[str, Set]] = {
+            field: defaultdict(set) for field in SEARCHABLE_FIELDS
+        }
+        self._role_members: Dict[str, Set[int]] = defaultdict(set)
+        self._documents: Dict[int, Tuple[str, str, str]] = {}
+        # Writes made while the index is loading, applied after it
+        self._pending: Optional[List[Tuple[Callable, Tuple]]] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, employee_id: int, full_name: str, email: str, role: str) -> None:
+        """Index an employee, replacing any earlier version of it"""
+        self.remove(employee_id)
+        self._documents[employee_id] = (full_name, email, role)
+        for field, value in (("full_name", full_name), ("email", email)):
+            postings = self._postings[field]
+            for gram in trigrams(value):
+                postings[gram].add(employee_id)
+
+        members = self._role_members[role]
+        if not members:
+            for gram in trigrams(role):
+                self._postings["role"][gram].add(role)
+        members.add(employee_id)
+
+    def remove(self, employee_id: int) -> None:
+        document = self._documents.pop(employee_id, None)
+        if document is None:
+            return
+        full_name, email, role = document
+        for field, value in (("full_name", full_name), ("email", email)):
+            self._discard(field, trigrams(value), employee_id)
+
+        members = self._role_members[role]
+        members.discard(employee_id)
+        if not members:
+            del self._role_members[role]
+            self._discard("role", trigrams(role), role)
+
+    def track_add(self, employee_id: int, full_name: str, email: str, role: str) -> None:
+        """Mirror a committed create or update, if the index is (being) built"""
+        self._track(self.add, (employee_id, full_name, email, role))
+
+    def track_remove(self, employee_id: int) -> None:
+        """Mirror a committed delete, if the index is (being) built"""
+        self._track(self.remove, (employee_id,))
+
+    def _track(self, apply: Callable, args: Tuple) -> None:
+        if self.loaded:
+            apply(*args)
+        elif self._pending is not None:
+            # The load may or may not see this write; replaying writes in
+            # order once it is done gives the same index either way
+            self._pending.append((apply, args))
+
+    def _discard(self, field: str, grams: Set[str], key) -> None:
+        postings = self._postings[field]
+        for gram in grams:
+            keys = postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del postings[gram]
+
+    def clear(self) -> None:
+        self.__init__(self.min_similarity)
+
+    def invalidate(self) -> None:
+        """Drop the index so it is rebuilt from the database on next use"""
+        self.clear()
+
+    async def ensure_loaded(self, load: Callable[[], AsyncIterator[Sequence[Tuple]]]) -> None:
+        """Build the index once from batches of (id, full_name, email, role) rows"""
+        if self.loaded:
+            return
+        async with self._lock:
+            if self.loaded:
+                return
+            pending = self._pending = []
+            try:
+                async for rows in load():
+                    for row in rows:
+                        self.add(*row)
+            finally:
+                cleared = self._pending is not pending
+                self._pending = None
+            if cleared:
+                # Invalidated mid-load: what was read may already be stale
+                self.clear()
+                return
+            for apply, args in pending:
+                apply(*args)
+            self.loaded = True
+
+    def _levels(self, field: str, ranked: List[str]) -> Iterator[Set]:
+        """Yield the keys sharing exactly n, n - 1, ... of the query's n trigrams.
+
+        `ranked` is the query's trigrams, rarest in this field first. Keys
+        sharing `shared` of them all contain one of the rarest
+        n - shared + 1, so each step down adds one posting list to the
+        candidates and only the new candidates are counted. Levels are
+        computed as they are pulled, down to `min_similarity`.
+        """
+        postings = self._postings[field]
+        n = len(ranked)
+
+        # Exact matches are a plain intersection; often they fill the page
+        exact = set.intersection(*(postings.get(gram, set()) for gram in ranked))
+        yield exact
+
+        seen: Set = set(exact)
+        by_shared: Dict[int, Set] = defaultdict(set)
+        for shared in range(n - 1, 0, -1):
+            new = set().union(*(postings.get(gram, ()) for gram in ranked[:n - shared + 1])) - seen
+            if new:
+                seen |= new
+                # Set intersection and Counter.update both run in C
+                counts: Counter = Counter()
+                for gram in ranked:
+                    keys = postings.get(gram)
+                    if keys:
+                        counts.update(keys & new)
+                for key, count in counts.items():
+                    by_shared[count].add(key)
+            yield by_shared.pop(shared, set())
+
+    def search(self, q: str, limit: int = 20) -> List[Tuple[int, float]]:
+        """The best `limit` (employee id, score) matches, best first.
+
+        Ties are broken by id. Every (field, trigrams shared) level has a
+        score known up front, so levels are computed best first and
+        scoring stops as soon as `limit` results are certain.
+        """
+        query = trigrams(q)
+        if not query:
+            return []
+        n = len(query)
+        lowest = max(1, math.ceil(n * self.min_similarity))
+
+        levels = {}
+        schedule = []
+        for field, weight in FIELD_WEIGHTS.items():
+            postings = self._postings[field]
+            ranked = sorted(query, key=lambda gram: len(postings.get(gram, ())))
+            levels[field] = self._levels(field, ranked)
+            schedule += [(round(weight * shared / n, 4), field) for shared in range(n, lowest - 1, -1)]
+        # Stable sort: within a field, levels stay in the order they are yielded
+        schedule.sort(key=lambda entry: -entry[0])
+
+        results: List[Tuple[int, float]] = []
+        taken: Set[int] = set()
+        for score, entries in groupby(schedule, key=lambda entry: entry[0]):
+            if len(results) >= limit:
+                break
+            fresh: Set[int] = set()
+            for _, field in entries:
+                keys = next(levels[field])
+                if field == "role":
+                    keys = set().union(*(self._role_members[role] for role in keys))
+                fresh |= keys
+            # An employee's first (highest) level is its score
+            fresh -= taken
+            taken |= fresh
+            results += [(employee_id, score) for employee_id in heapq.nsmallest(limit - len(results), fresh)]
+        return results
+
+
+search_index = TrigramIndex()
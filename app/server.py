@@ -0,0 +1,117 @@
+"""
+Production entry point for the API.
+
+    python -m app.migrate upgrade        # once per deploy
+    python -m app.server                 # one worker per CPU on :8000
+    python -m app.server --workers 8 --bind 0.0.0.0:8080
+
+gunicorn supervises uvicorn worker processes (restarting any that die)
+and each worker runs the event loop on uvloop and parses HTTP with
+httptools when those are installed (uvicorn[standard] pulls them in).
+
+On SIGTERM the workers stop accepting connections and let in-flight
+requests finish for up to --graceful-timeout seconds. The app's
+lifespan shutdown then disposes the engine's connection pool.
+
+Every option can also be set through the environment variable shown in
+its --help. Size the database pool so that
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under the server's
+connection limit.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY if set, otherwise one async worker per CPU"""
+    return int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1
+
+
+class ApiWorker(UvicornWorker):
+    """uvicorn worker that drains in-flight requests before gunicorn's deadline.
+
+    Without a uvicorn-side timeout, a slow request would run into
+    gunicorn's SIGKILL at graceful_timeout and the lifespan shutdown
+    (which closes the pool's connections) would never run.
+    """
+
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto", "lifespan": "on"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(1, self.cfg.graceful_timeout - 1)
+
+
+class Server(BaseApplication):
+    """gunicorn application serving an import string with the given settings"""
+
+    def __init__(self, app_uri: str, options: dict):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+        return import_app(self.app_uri)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    def env(name, default):
+        return os.getenv(name, default)
+
+    parser = argparse.ArgumentParser(description="Run the HRMS API with gunicorn + uvicorn workers")
+    parser.add_argument("--bind", default=env("BIND", f"0.0.0.0:{env('PORT', '8000')}"),
+                        help="address to listen on (BIND, or PORT)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="worker processes (WEB_CONCURRENCY, default: CPU count)")
+    parser.add_argument("--keepalive", type=int, default=int(env("KEEPALIVE", "5")),
+                        help="seconds to hold idle keep-alive connections (KEEPALIVE)")
+    parser.add_argument("--backlog", type=int, default=int(env("BACKLOG", "2048")),
+                        help="pending connections queued by the kernel (BACKLOG)")
+    parser.add_argument("--graceful-timeout", type=int, default=int(env("GRACEFUL_TIMEOUT", "30")),
+                        help="seconds to drain in-flight requests on shutdown (GRACEFUL_TIMEOUT)")
+    parser.add_argument("--timeout", type=int, default=int(env("WORKER_TIMEOUT", "60")),
+                        help="restart a worker that stops responding for this long (WORKER_TIMEOUT)")
+    parser.add_argument("--max-requests", type=int, default=int(env("MAX_REQUESTS", "0")),
+                        help="recycle each worker after this many requests, 0 to disable (MAX_REQUESTS)")
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction,
+                        default=env("ACCESS_LOG", "1") not in ("0", "false", "no", "off"),
+                        help="log every request (ACCESS_LOG)")
+    parser.add_argument("--app", default="app.main:app", help="ASGI application import string")
+    return parser.parse_args(argv)
+
+
+def gunicorn_options(args: argparse.Namespace) -> dict:
+    return {
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "app.server.ApiWorker",
+        "keepalive": args.keepalive,
+        "backlog": args.backlog,
+        "graceful_timeout": args.graceful_timeout,
+        "timeout": args.timeout,
+        "max_requests": args.max_requests,
+        # Spread restarts out so workers don't all recycle at once
+        "max_requests_jitter": args.max_requests // 10,
+        "accesslog": "-" if args.access_log else None,
+        "forwarded_allow_ips": os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    Server(args.app, gunicorn_options(args)).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
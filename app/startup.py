@@ -0,0 +1,130 @@
+"""
+Work a worker does before it should take traffic, reported by /health/ready.
+
+It runs in the background once the lifespan starts, so the worker is
+listening (and /health/live answers) straight away, and the
+orchestrator only routes requests to it when readiness reports:
+
+- schema    the database is at the latest migration (SCHEMA_STARTUP=verify)
+- pool      DB_POOL_WARM connections are open and parked in the pool, so
+            the first requests don't each pay for connecting and
+            authenticating to a remote database
+- replicas  each read replica was probed and its pool warmed; an
+            unreachable replica is taken out of rotation but doesn't
+            hold readiness back, since reads fall back to the primary
+
+A check that fails (say the database isn't accepting connections yet)
+is retried with backoff until it passes or the worker starts shutting
+down; /health/ready shows its latest error meanwhile.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import POOL_SIZE, get_engine
+from app.replicas import replica_set
+
+logger = logging.getLogger("app.startup")
+
+# Connections each worker opens before reporting ready (at most DB_POOL_SIZE)
+DB_POOL_WARM = min(int(os.getenv("DB_POOL_WARM", str(POOL_SIZE))), POOL_SIZE)
+# Wait before retrying a failed check, doubling each time up to the max
+STARTUP_RETRY_SECONDS = float(os.getenv("STARTUP_RETRY_SECONDS", "1"))
+STARTUP_RETRY_MAX_SECONDS = float(os.getenv("STARTUP_RETRY_MAX_SECONDS", "30"))
+
+PENDING = "pending"
+OK = "ok"
+
+
+class Readiness:
+    """Outcome of each startup check; ready once all of them are ok"""
+
+    def __init__(self):
+        self.checks: Dict[str, str] = {}
+        self.started_at = time.monotonic()
+        self.ready_at: Optional[float] = None
+        self.stopping = False
+
+    def reset(self) -> None:
+        self.__init__()
+
+    @property
+    def ready(self) -> bool:
+        return (
+            not self.stopping
+            and bool(self.checks)
+            and all(result == OK for result in self.checks.values())
+        )
+
+    async def run(self, name: str, check: Callable[[], Awaitable]) -> bool:
+        """Run `check()` until it passes; False if shutdown begins first"""
+        self.checks[name] = PENDING
+        delay = STARTUP_RETRY_SECONDS
+        while not self.stopping:
+            try:
+                await check()
+            except Exception as e:
+                logger.error("Startup check %r failed, retrying in %.1fs: %s", name, delay, e)
+                self.checks[name] = str(e) or type(e).__name__
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, STARTUP_RETRY_MAX_SECONDS)
+                continue
+            self.checks[name] = OK
+            return True
+        return False
+
+    def status(self) -> dict:
+        if self.stopping:
+            state = "stopping"
+        elif self.ready:
+            state = "ready"
+        elif PENDING in self.checks.values() or not self.checks:
+            state = "starting"
+        else:
+            state = "failed"
+        body = {"status": state, "checks": dict(self.checks)}
+        if self.ready_at is not None:
+            body["seconds_to_ready"] = round(self.ready_at - self.started_at, 3)
+        return body
+
+
+readiness = Readiness()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` connections at once and return them to the pool"""
+    opened = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    for conn in opened:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    errors = [conn for conn in opened if isinstance(conn, BaseException)]
+    if errors:
+        raise errors[0]
+
+
+async def _warm_replicas() -> None:
+    for replica in replica_set.replicas:
+        if await replica_set.check(replica):
+            await warm_pool(replica, DB_POOL_WARM)
+
+
+async def prepare(verify_schema: bool) -> None:
+    """Run the startup checks; mark the worker ready when they all pass"""
+    from app.migrate import verify_schema as check_schema
+
+    engine = get_engine()
+    checks = [readiness.run("pool", lambda: warm_pool(engine, DB_POOL_WARM))]
+    if verify_schema:
+        checks.append(readiness.run("schema", lambda: check_schema(engine)))
+    if replica_set.configured:
+        checks.append(readiness.run("replicas", _warm_replicas))
+    await asyncio.gather(*checks)
+    if readiness.ready:
+        readiness.ready_at = time.monotonic()
+        logger.info("Ready in %.3fs", readiness.ready_at - readiness.started_at)
@@ -0,0 +1,45 @@
+"""
+Dashboard data latency as the company grows.
+
+    python -m benchmarks.bench_dashboard [sizes...]
+
+"lists" is what the dashboard used to do: download every department and
+every employee to count them. "stats cold" is GET /api/v1/stats with an
+empty cache (COUNT/GROUP BY in the database); "stats warm" is the cached
+response every other dashboard view within the TTL gets.
+"""
+import asyncio
+import sys
+
+from benchmarks.common import api_client, seed, timed
+from app.database import engine
+from app import crud
+
+
+async def main(sizes):
+    print(f"{'employees':>10} {'lists ms':>10} {'stats cold ms':>14} {'stats warm ms':>14}")
+    async with api_client() as client:
+        for size in sizes:
+            await seed(n_departments=max(size // 100, 1), n_employees=size)
+
+            async def lists():
+                await client.get("/api/v1/departments/")
+                await client.get("/api/v1/employees/", params={"limit": size})
+
+            async def stats_cold():
+                await crud.reset_caches()
+                await client.get("/api/v1/stats")
+
+            async def stats_warm():
+                await client.get("/api/v1/stats")
+
+            lists_s = await timed(lists, repeat=3)
+            cold_s = await timed(stats_cold)
+            warm_s = await timed(stats_warm)
+            print(f"{size:>10} {lists_s * 1000:>10.1f} {cold_s * 1000:>14.1f} {warm_s * 1000:>14.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]))
@@ -0,0 +1,58 @@
+"""
+Latency and query plans for filtered employee listings on a seeded dataset.
+
+    python -m benchmarks.bench_filters [n_employees]
+
+Each filter should resolve through an index (SEARCH ... USING INDEX on
+SQLite, Index/Bitmap scans on Postgres) rather than a full table scan.
+Prefix search relies on the pg_trgm indexes, so it only becomes
+index-driven when run against Postgres via BENCH_DATABASE_URL.
+"""
+import asyncio
+import sys
+
+from benchmarks.common import seed, timed
+from sqlalchemy import select, text
+from app.database import AsyncSessionLocal, engine
+from app.models import Employee
+from app.schemas import EmployeeFilter
+from app import crud
+
+CASES = {
+    "department_id": EmployeeFilter(department_id=42),
+    "department_id+is_active": EmployeeFilter(department_id=42, is_active=True),
+    "role": EmployeeFilter(role="Director"),
+    "name prefix": EmployeeFilter(name="user 01234"),
+    "email prefix": EmployeeFilter(email="USER00999"),
+}
+
+
+async def explain(db, query):
+    compiled = query.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN" if engine.dialect.name == "sqlite" else "EXPLAIN"
+    result = await db.execute(text(f"{prefix} {compiled}"))
+    return [str(row[-1]) for row in result]
+
+
+async def main(n_employees: int):
+    await seed(n_departments=1000, n_employees=n_employees)
+
+    async with AsyncSessionLocal() as db:
+        for label, filters in CASES.items():
+            async def run():
+                await crud.get_employee_rows(db, ["email"], limit=100, filters=filters)
+
+            seconds = await timed(run)
+            query = crud.paginate_employees(
+                crud.filter_employees(select(Employee.id), filters), limit=100
+            )
+            plan = await explain(db, query)
+            print(f"{label:<26} {seconds * 1000:>8.2f} ms")
+            for line in plan:
+                print(f"{'':<28}{line}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
@@ -0,0 +1,110 @@
+"""
+Flask page render latency against a local stub API.
+
+    python -m benchmarks.bench_frontend [latency_ms]
+
+The stub answers every call after `latency_ms` (default 20) to stand in
+for the network hop to the cloud API, and only honours keep-alive the
+way a real server would. "before" replays the old page logic: a fresh
+connection per call via bare requests.get, issued serially. "after" is
+the current app, using the pooled concurrent client and its departments
+cache.
+"""
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend')
+LATENCY = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.02
+
+DEPARTMENTS = [{'id': i, 'name': f'Dept {i}', 'description': None} for i in range(1, 21)]
+EMPLOYEES = [
+    {'id': i, 'email': f'u{i}@company.com', 'full_name': f'User {i}', 'role': 'Employee',
+     'is_active': True, 'joined_date': '2024-01-01T00:00:00', 'department_id': i % 20 + 1}
+    for i in range(1, 101)
+]
+STATS = {'total_departments': 20, 'total_employees': 100, 'active_employees': 100, 'recent_joiners': 0}
+
+
+class StubApi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Like uvicorn, don't let Nagle hold back the body after the headers
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        path = self.path.split('?')[0].rstrip('/')
+        body = {
+            '/api/v1/departments': DEPARTMENTS,
+            '/api/v1/employees': EMPLOYEES,
+            '/api/v1/stats': STATS,
+        }.get(path, {})
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}/api/v1'
+
+
+def measure(fn, repeat=30):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    base_url = start_stub()
+    os.environ['API_BASE_URL'] = base_url
+    sys.path.insert(0, FRONTEND_DIR)
+    from app import app
+    client = app.test_client()
+
+    def old_employees_page():
+        with app.test_request_context():
+            employees = requests.get(f'{base_url}/employees').json()
+            departments = requests.get(f'{base_url}/departments').json()
+            names = {d['id']: d['name'] for d in departments}
+            for emp in employees:
+                emp['department_name'] = names.get(emp['department_id'], 'N/A')
+            app.jinja_env.get_template('employees.html').render(employees=employees)
+
+    def old_add_employee_page():
+        with app.test_request_context():
+            departments = requests.get(f'{base_url}/departments').json()
+            app.jinja_env.get_template('add_employee.html').render(departments=departments)
+
+    pages = {
+        '/employees': (old_employees_page, lambda: client.get('/employees')),
+        '/employees/add': (old_add_employee_page, lambda: client.get('/employees/add')),
+    }
+    print(f"stub latency {LATENCY * 1000:.0f} ms")
+    print(f"{'page':<16} {'before ms':>10} {'after ms':>10}")
+    for page, (before, after) in pages.items():
+        print(f"{page:<16} {measure(before):>10.1f} {measure(after):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Time-travel listings and per-employee history over a large event log.
+
+    python -m benchmarks.bench_history [--employees 20000] [--events 500000] [--months 12]
+
+Seeds an event log spread over the last --months months: a "created"
+event per employee in the first month, then random role, department
+and active-status changes. A snapshot is written at the start of each
+month, as `python -m app.history snapshot` run from cron would leave
+it. Then times, through the API:
+
+  GET /employees?as_of=...   the first page and a page halfway through
+                             the ids, just after a snapshot and just
+                             before the next one, with the snapshots and
+                             again after deleting them (every state then
+                             comes from replaying the log from the start)
+  GET /employees/{id}/history
+
+Point BENCH_DATABASE_URL at a Postgres database to measure it with the
+monthly partitions in place.
+"""
+import argparse
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import api_client, seed, timed
+from sqlalchemy import delete, insert
+
+from app.database import engine
+from app.history import CREATED, STATE_FIELDS, UPDATED, create_partitions
+from app.models import EmployeeEvent, EmployeeSnapshot
+from app.pagination import encode_cursor
+
+N_DEPARTMENTS = 100
+ROLES = ["Employee", "Engineer", "Senior Engineer", "Manager", "Director", "Analyst"]
+BATCH = 10_000
+MONTH = timedelta(days=30)
+
+
+def random_change() -> dict:
+    field = random.choice(["role", "department_id", "is_active"])
+    if field == "role":
+        return {"role": random.choice(ROLES)}
+    if field == "department_id":
+        return {"department_id": random.randint(1, N_DEPARTMENTS)}
+    return {"is_active": random.random() < 0.9}
+
+
+async def seed_history(n_employees: int, n_events: int, start: datetime, months: int) -> list:
+    """Write the event log and the monthly snapshots; returns the snapshot times"""
+    end = start + months * MONTH
+    joined = {i: start + timedelta(seconds=random.uniform(0, MONTH.total_seconds())) for i in range(1, n_employees + 1)}
+    times = sorted(
+        [(at, i) for i, at in joined.items()]
+        + [(start + (end - start) * random.random(), random.randint(1, n_employees))
+           for _ in range(n_events - n_employees)]
+    )
+    snapshots = [start + MONTH * m for m in range(1, months)]
+    states: dict = {}
+    pending = []
+
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            await create_partitions(conn, start.date(), months + 1)
+
+        async def flush():
+            if pending:
+                await conn.execute(insert(EmployeeEvent), pending)
+                pending.clear()
+
+        async def snapshot(at: datetime):
+            await flush()
+            rows = [
+                {"snapshot_at": at, "employee_id": i, **state, "updated_at": state["updated_at"]}
+                for i, state in states.items()
+            ]
+            for offset in range(0, len(rows), BATCH):
+                await conn.execute(insert(EmployeeSnapshot), rows[offset:offset + BATCH])
+
+        next_snapshot = 0
+        for at, employee_id in times:
+            while next_snapshot < len(snapshots) and snapshots[next_snapshot] <= at:
+                await snapshot(snapshots[next_snapshot])
+                next_snapshot += 1
+            if employee_id not in states:
+                if at < joined[employee_id]:
+                    continue
+                changes = {
+                    "email": f"user{employee_id:07d}@company.com", "full_name": f"User {employee_id:07d}",
+                    "role": "Employee", "is_active": True, "joined_date": at,
+                    "department_id": employee_id % N_DEPARTMENTS + 1,
+                }
+                kind = CREATED
+                states[employee_id] = {}
+            else:
+                changes, kind = random_change(), UPDATED
+            states[employee_id].update(changes, updated_at=at)
+            pending.append({
+                "employee_id": employee_id, "occurred_at": at, "kind": kind, "actor": "bench",
+                "changes": {field: value.isoformat() if isinstance(value, datetime) else value
+                            for field, value in changes.items() if field in STATE_FIELDS},
+            })
+            if len(pending) >= BATCH:
+                await flush()
+        await flush()
+    return snapshots
+
+
+async def run(args):
+    print(f"Seeding {args.employees} employees and {args.events} events over {args.months} months...")
+    await seed(n_departments=N_DEPARTMENTS, n_employees=args.employees)
+    start = datetime.now(timezone.utc) - args.months * MONTH
+    snapshots = await seed_history(args.employees, args.events, start, args.months)
+
+    last = snapshots[-1]
+    points = [("after snapshot", last + timedelta(hours=1)), ("before next", last + MONTH - timedelta(hours=1))]
+    middle = args.employees // 2
+    pages = [("first page", None), ("middle page", encode_cursor("id", middle, middle))]
+
+    async with api_client() as client:
+        async def listing(at, cursor):
+            params = {"as_of": at.isoformat(), "limit": 100}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/v1/employees/", params=params)
+            assert response.status_code == 200, response.text
+
+        results = {}
+        for mode in ("snapshots", "log only"):
+            if mode == "log only":
+                async with engine.begin() as conn:
+                    await conn.execute(delete(EmployeeSnapshot))
+            for point, at in points:
+                for page, cursor in pages:
+                    results[(mode, point, page)] = await timed(lambda: listing(at, cursor), repeat=args.repeat)
+
+        print(f"\n{'as_of':<16} {'page':<12} {'snapshots ms':>13} {'log only ms':>12}")
+        for point, _ in points:
+            for page, _ in pages:
+                print(f"{point:<16} {page:<12} {results[('snapshots', point, page)] * 1000:>13.1f} "
+                      f"{results[('log only', point, page)] * 1000:>12.1f}")
+
+        ids = random.sample(range(1, args.employees + 1), 20)
+
+        async def histories():
+            for employee_id in ids:
+                response = await client.get(f"/api/v1/employees/{employee_id}/history")
+                assert response.status_code == 200, response.text
+
+        per_call = await timed(histories, repeat=args.repeat) / len(ids)
+        print(f"\nGET /employees/{{id}}/history: {per_call * 1000:.1f} ms "
+              f"(~{args.events // args.employees} events per employee)")
+    await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    random.seed(1234)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
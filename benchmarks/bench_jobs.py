@@ -0,0 +1,137 @@
+"""
+Background jobs: how long requests take, and how claiming scales across workers.
+
+    python -m benchmarks.bench_jobs [--employees 50000] [--rows 20000] [--jobs 300] [--workers 1,2,4]
+
+First, against a directory of --employees employees, compares the
+request duration of a bulk import of --rows rows and of a full export
+done inside the request with queueing the same work as a job (plus how
+long the job then takes a worker).
+
+Then queues --jobs short jobs and drains them with N separate
+`python -m app.jobs worker --once` processes for each N in --workers,
+reporting jobs per second and checking that every job ran exactly once.
+Row locks only mean something on Postgres; point BENCH_DATABASE_URL at
+one to measure FOR UPDATE SKIP LOCKED under contention. On SQLite the
+workers take turns at the single write lock instead.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.common import api_client, seed
+from sqlalchemy import delete, func, insert, select
+
+from app.database import engine
+from app.jobs import REASSIGN_EMPLOYEES, SUCCEEDED, Worker
+from app.models import Department, Job, JobFile
+
+
+def import_body(n_rows: int, n_departments: int) -> str:
+    return "\n".join(
+        json.dumps({"email": f"new{i:07d}@company.com", "full_name": f"New {i:07d}",
+                    "department_id": i % n_departments + 1})
+        for i in range(n_rows)
+    )
+
+
+async def request_times(args) -> None:
+    body = import_body(args.rows, 100)
+    headers = {"Content-Type": "application/x-ndjson"}
+
+    async with api_client() as client:
+        async def measure(method, url, **kwargs):
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - start
+            assert response.status_code in (200, 202), response.text
+            return response, elapsed
+
+        async def drained():
+            start = time.perf_counter()
+            await Worker(1, name="bench").drain()
+            return time.perf_counter() - start
+
+        _, sync_import = await measure("POST", "/api/v1/employees/bulk", content=body, headers=headers)
+        _, sync_export = await measure("GET", "/api/v1/employees/export")
+
+        body = body.replace("new", "job")
+        queued, enqueue_import = await measure("POST", "/api/v1/jobs/employees/import", content=body, headers=headers)
+        import_run = await drained()
+        assert (await client.get(f"/api/v1/jobs/{queued.json()['id']}")).json()["status"] == SUCCEEDED
+        queued, enqueue_export = await measure("POST", "/api/v1/jobs/employees/export")
+        export_run = await drained()
+        assert (await client.get(f"/api/v1/jobs/{queued.json()['id']}")).json()["status"] == SUCCEEDED
+
+    print(f"\n{'':<28} {'request ms':>11} {'job run ms':>11}")
+    print(f"{f'import {args.rows} rows, in request':<28} {sync_import * 1000:>11.1f}")
+    print(f"{f'import {args.rows} rows, as job':<28} {enqueue_import * 1000:>11.1f} {import_run * 1000:>11.1f}")
+    print(f"{'export, in request':<28} {sync_export * 1000:>11.1f}")
+    print(f"{'export, as job':<28} {enqueue_export * 1000:>11.1f} {export_run * 1000:>11.1f}")
+
+
+async def claim_scaling(args) -> None:
+    # Reassigning between two empty departments: each job is little more
+    # than its claim, a count and its bookkeeping
+    async with engine.begin() as conn:
+        await conn.execute(insert(Department), [{"name": "Empty A"}, {"name": "Empty B"}])
+        empty = (await conn.execute(
+            select(Department.id).where(Department.name.in_(["Empty A", "Empty B"])).order_by(Department.id)
+        )).scalars().all()
+
+    print(f"\n{'workers':>7} {'jobs':>6} {'seconds':>8} {'jobs/s':>8} {'ran once':>9}")
+    for workers in args.workers:
+        async with engine.begin() as conn:
+            await conn.execute(delete(JobFile))
+            await conn.execute(delete(Job))
+            await conn.execute(insert(Job), [
+                {"kind": REASSIGN_EMPLOYEES, "status": "queued", "processed": 0, "attempts": 0,
+                 "params": {"from_department_id": empty[0], "to_department_id": empty[1]}}
+                for _ in range(args.jobs)
+            ])
+
+        start = time.perf_counter()
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-m", "app.jobs", "worker", "--once", "--concurrency", str(args.concurrency)],
+                stdout=subprocess.DEVNULL,
+            )
+            for _ in range(workers)
+        ]
+        codes = [process.wait() for process in processes]
+        elapsed = time.perf_counter() - start
+        assert codes == [0] * workers, codes
+
+        async with engine.connect() as conn:
+            succeeded, once = (await conn.execute(select(
+                func.count().filter(Job.status == SUCCEEDED), func.count().filter(Job.attempts == 1),
+            ))).one()
+        assert succeeded == args.jobs, f"{succeeded} of {args.jobs} jobs succeeded"
+        print(f"{workers:>7} {args.jobs:>6} {elapsed:>8.2f} {args.jobs / elapsed:>8.1f} {once == args.jobs!s:>9}")
+
+
+async def run(args):
+    print(f"Seeding {args.employees} employees...")
+    await seed(n_departments=100, n_employees=args.employees)
+    await request_times(args)
+    await claim_scaling(args)
+    await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--workers", type=lambda value: [int(n) for n in value.split(",")], default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=2, help="jobs each worker process runs at once")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Interactive latency while a batch client hammers the employee listing.
+
+    python -m benchmarks.bench_noisy_neighbour [--duration 15] [--noisy 48]
+
+Runs three phases against the in-process app:
+
+  quiet        interactive traffic alone (the baseline)
+  unprotected  plus a batch client paging through GET /employees with
+               --noisy concurrent requests, admission control off
+  protected    the same, with the rate limit, route concurrency limits
+               and pool shedding from app.ratelimit switched on
+
+Interactive clients fetch single employees and departments with a short
+think time, each with its own API key; the batch client uses one key
+and backs off for Retry-After when it is turned away. The interesting
+number is interactive p99: protected should stay close to quiet while
+unprotected queues behind the batch job's requests for pooled
+connections. Everything shares one process, so the batch requests that
+are admitted still take CPU from the interactive ones.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import api_client, percentiles, seed
+from app.database import MAX_OVERFLOW, POOL_SIZE, engine
+from app.ratelimit import ROUTE_CONCURRENCY, MemoryRateLimitBackend, admission, parse_route_limits
+
+N_EMPLOYEES = 50_000
+N_DEPARTMENTS = 200
+# Pause between an interactive user's requests
+THINK_SECONDS = 0.1
+
+
+def configure(protected: bool, batch_rate: float) -> None:
+    admission.reset()
+    admission.backend = MemoryRateLimitBackend()
+    if protected:
+        admission.rate = batch_rate
+        admission.burst = max(1, int(batch_rate * 2))
+        admission.route_default = max(1, (POOL_SIZE + MAX_OVERFLOW) * 2 // 3)
+        admission.route_limits = parse_route_limits(ROUTE_CONCURRENCY)
+        admission.shed_threshold = POOL_SIZE + MAX_OVERFLOW
+    else:
+        admission.rate = 0
+        admission.route_default = 0
+        admission.route_limits = {}
+        admission.shed_threshold = 0
+
+
+async def run_phase(client, duration: float, interactive: int, noisy: int, ignore_retry_after: bool):
+    deadline = time.perf_counter() + duration
+    latencies = []
+    interactive_errors = Counter()
+    batch = Counter()
+
+    async def interactive_user(n):
+        headers = {"X-API-Key": f"frontend-{n}"}
+        while time.perf_counter() < deadline:
+            if random.random() < 0.5:
+                path = f"/api/v1/employees/{random.randint(1, N_EMPLOYEES)}"
+            else:
+                path = f"/api/v1/departments/{random.randint(1, N_DEPARTMENTS)}/stats"
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                interactive_errors[response.status_code] += 1
+            await asyncio.sleep(THINK_SECONDS)
+
+    async def batch_worker():
+        headers = {"X-API-Key": "nightly-sync"}
+        while time.perf_counter() < deadline:
+            response = await client.get("/api/v1/employees/", headers=headers, params={
+                "limit": 500, "department_id": random.randint(1, N_DEPARTMENTS),
+            })
+            batch[response.status_code] += 1
+            if response.status_code in (429, 503) and not ignore_retry_after:
+                retry_after = float(response.headers.get("Retry-After", "1"))
+                await asyncio.sleep(min(retry_after, max(0.0, deadline - time.perf_counter())))
+
+    await asyncio.gather(
+        *(interactive_user(n) for n in range(interactive)),
+        *(batch_worker() for _ in range(noisy)),
+    )
+    return latencies, interactive_errors, batch
+
+
+async def run(args):
+    print(f"Seeding {N_EMPLOYEES} employees...")
+    await seed(n_departments=N_DEPARTMENTS, n_employees=N_EMPLOYEES)
+
+    phases = [("quiet", False, 0), ("unprotected", False, args.noisy), ("protected", True, args.noisy)]
+    print(f"\n{'phase':<12} {'int. reqs':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'int. err':>8}"
+          f" {'batch ok':>9} {'429':>6} {'503':>6}")
+    async with api_client() as client:
+        for name, protected, noisy in phases:
+            configure(protected, args.batch_rate)
+            latencies, errors, batch = await run_phase(
+                client, args.duration, args.interactive, noisy, args.ignore_retry_after
+            )
+            stats = percentiles(latencies)
+            print(f"{name:<12} {len(latencies):>9} {stats['p50']:>8.1f} {stats['p95']:>8.1f} "
+                  f"{stats['p99']:>8.1f} {sum(errors.values()):>8} {batch[200]:>9} "
+                  f"{batch[429]:>6} {batch[503]:>6}")
+    await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=15, help="seconds per phase")
+    parser.add_argument("--interactive", type=int, default=8, help="concurrent interactive users")
+    parser.add_argument("--noisy", type=int, default=48, help="concurrent batch requests")
+    parser.add_argument("--batch-rate", type=float, default=20,
+                        help="requests/second allowed per client when protected")
+    parser.add_argument("--ignore-retry-after", action="store_true",
+                        help="batch client retries at once instead of backing off")
+    args = parser.parse_args(argv)
+    random.seed(1234)
+    # Unprotected, nearly every batch request is a slow request
+    logging.getLogger("app.instrumentation").setLevel(logging.ERROR)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Org chart queries on a large synthetic reporting tree.
+
+    python -m benchmarks.bench_org_chart [--employees 100000] [--fanout 10]
+
+Seeds --employees employees in a tree where everyone but the first
+reports to one of the level above, --fanout reports per manager (with
+the defaults a VP at level 1 has ~11k people below them). Then times,
+through the API:
+
+  GET /employees/{id}/subtree   for a manager at each level, against
+                                walking the same subtree level by level
+                                (one `manager_id IN (...)` query per level)
+  GET /employees/{id}/chain     from a leaf to the top
+  GET /employees/{id}/reports   a manager's direct reports
+  PATCH manager_id              moving a team, including the cycle check
+"""
+import argparse
+import asyncio
+import sys
+
+from benchmarks.common import api_client, seed, timed
+from sqlalchemy import select, text
+
+from app.database import AsyncSessionLocal, engine
+from app.models import Employee
+
+
+def level_of(employee_id: int, fanout: int) -> int:
+    level = 0
+    while employee_id > 1:
+        employee_id = (employee_id + fanout - 2) // fanout
+        level += 1
+    return level
+
+
+async def walk_by_level(root: int) -> int:
+    """The subtree the way a client without the endpoint would: a query per level"""
+    found, frontier = 0, [root]
+    async with AsyncSessionLocal() as db:
+        while frontier:
+            frontier = (await db.execute(
+                select(Employee.id).where(Employee.manager_id.in_(frontier))
+            )).scalars().all()
+            found += len(frontier)
+    return found
+
+
+async def run(args):
+    print(f"Seeding {args.employees} employees, {args.fanout} reports per manager...")
+    await seed(n_departments=100, n_employees=args.employees)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE employees SET manager_id = (id + :fanout - 2) / :fanout WHERE id > 1"),
+            {"fanout": args.fanout},
+        )
+        if engine.dialect.name == "postgresql":
+            await conn.execute(text("ANALYZE employees"))
+
+    # The first employee at each level heads the largest subtree on it
+    managers, first = [], 1
+    while first <= args.employees and len(managers) < 5:
+        managers.append(first)
+        first = first * args.fanout - (args.fanout - 2)
+    leaf = args.employees
+
+    async with api_client() as client:
+        async def get(path, **params):
+            response = await client.get(path, params=params)
+            assert response.status_code == 200, response.text
+            return response
+
+        print(f"\n{'subtree of':<18} {'people':>8} {'CTE ms':>8} {'per level ms':>13}")
+        for manager in managers:
+            size = len((await get(f"/api/v1/employees/{manager}/subtree", fields="id")).json())
+            assert size == await walk_by_level(manager)
+            cte = await timed(lambda: get(f"/api/v1/employees/{manager}/subtree", fields="id"), repeat=args.repeat)
+            walk = await timed(lambda: walk_by_level(manager), repeat=args.repeat)
+            label = f"level {level_of(manager, args.fanout)} (#{manager})"
+            print(f"{label:<18} {size:>8} {cte * 1000:>8.1f} {walk * 1000:>13.1f}")
+
+        full = await timed(lambda: get(f"/api/v1/employees/{managers[1]}/subtree"), repeat=args.repeat)
+        chain = await timed(lambda: get(f"/api/v1/employees/{leaf}/chain"), repeat=args.repeat)
+        reports = await timed(lambda: get(f"/api/v1/employees/{managers[1]}/reports"), repeat=args.repeat)
+        print(f"\nsubtree of #{managers[1]}, all fields: {full * 1000:.1f} ms")
+        print(f"chain of #{leaf} (level {level_of(leaf, args.fanout)}): {chain * 1000:.1f} ms")
+        print(f"direct reports of #{managers[1]}: {reports * 1000:.1f} ms")
+
+        # Move a level-3 team back and forth between two level-2 managers
+        team, targets = managers[3], [managers[2], managers[2] + 1]
+        moves = iter(targets * args.repeat)
+
+        async def move():
+            response = await client.patch(f"/api/v1/employees/{team}", json={"manager_id": next(moves)})
+            assert response.status_code == 200, response.text
+
+        print(f"PATCH manager_id with cycle check: {await timed(move, repeat=args.repeat) * 1000:.1f} ms")
+    await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
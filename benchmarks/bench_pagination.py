@@ -0,0 +1,44 @@
+"""
+Offset vs keyset pagination latency as page depth grows.
+
+    python -m benchmarks.bench_pagination [n_employees]
+
+Offset pages get slower the deeper they are because the database still
+walks every skipped row; keyset pages seek straight to the cursor.
+"""
+import asyncio
+import sys
+
+from benchmarks.common import seed, timed
+from app.database import AsyncSessionLocal, engine
+from app import crud
+
+PAGE_SIZE = 100
+
+
+async def main(n_employees: int):
+    await seed(n_departments=100, n_employees=n_employees)
+
+    print(f"{'depth':>10} {'offset ms':>12} {'keyset ms':>12}")
+    async with AsyncSessionLocal() as db:
+        depth = PAGE_SIZE
+        while depth < n_employees:
+            async def offset_page():
+                await crud.get_employees(db, skip=depth, limit=PAGE_SIZE)
+                db.expunge_all()
+
+            async def keyset_page():
+                # Cursor for "just after row `depth`", as a client would hold
+                await crud.get_employees(db, limit=PAGE_SIZE, after=(depth, depth))
+                db.expunge_all()
+
+            offset_s = await timed(offset_page)
+            keyset_s = await timed(keyset_page)
+            print(f"{depth:>10} {offset_s * 1000:>12.2f} {keyset_s * 1000:>12.2f}")
+            depth *= 10
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 400_000))
@@ -0,0 +1,90 @@
+"""
+Latency of /employees/search against an unindexed ILIKE '%q%' scan.
+
+    python -m benchmarks.bench_search [n_employees]
+
+Employees get realistic first/last name combinations so trigrams are as
+selective as they would be in production. On SQLite the search runs on
+the in-memory TrigramIndex (its build time and memory are reported);
+against Postgres via BENCH_DATABASE_URL it uses the pg_trgm GIN indexes.
+"""
+import asyncio
+import random
+import sys
+import time
+
+from benchmarks.common import percentiles, seed
+from benchmarks.harness import rss_mb
+from sqlalchemy import or_, select
+from app.database import AsyncSessionLocal, engine
+from app.models import Employee
+from app.search import search_index
+from app import crud
+
+FIRST = ["Alice", "Bruno", "Chen", "Dana", "Emeka", "Fatima", "Gustav", "Hiro", "Ingrid", "Jamal",
+         "Kavya", "Liam", "Mateo", "Noor", "Olga", "Priya", "Quinn", "Rafael", "Sofia", "Tomasz"]
+LAST = ["Anderson", "Brennan", "Castillo", "Dubois", "Eriksen", "Fujimoto", "Gallagher", "Haddad",
+        "Ivanova", "Jovanovic", "Kowalski", "Lindqvist", "Moreau", "Nakamura", "Okafor", "Petrov",
+        "Quintero", "Rossi", "Schneider", "Takahashi", "Umarov", "Vasquez", "Whitfield", "Yilmaz"]
+
+# Prefixes, whole names, typos and email fragments
+QUERIES = ["ali", "nakamura", "kowalsky", "fatima okafor", "gallager", "priya", "dubois",
+           "sofia rossi", "takahasi", "user0012345", "ingrid", "whitfeld"]
+
+
+def realistic_name(i: int) -> str:
+    rng = random.Random(i)
+    return f"{rng.choice(FIRST)} {rng.choice(LAST)}-{rng.choice(LAST)} {i}"
+
+
+async def ilike_scan(db, q: str):
+    pattern = f"%{q}%"
+    result = await db.execute(
+        select(Employee)
+        .where(or_(Employee.full_name.ilike(pattern), Employee.email.ilike(pattern), Employee.role.ilike(pattern)))
+        .order_by(Employee.id)
+        .limit(20)
+    )
+    return result.scalars().all()
+
+
+async def measure(fn, repeat: int = 5):
+    samples = []
+    for _ in range(repeat):
+        for q in QUERIES:
+            start = time.perf_counter()
+            await fn(q)
+            samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+async def main(n_employees: int):
+    await seed(n_departments=1000, n_employees=n_employees, name_for=realistic_name)
+
+    async with AsyncSessionLocal() as db:
+        if engine.dialect.name != "postgresql":
+            before = rss_mb()
+            start = time.perf_counter()
+            await crud.search_employees(db, "warm up")
+            print(f"in-memory index: {len(search_index)} employees indexed in "
+                  f"{time.perf_counter() - start:.2f} s, ~{rss_mb() - before:.0f} MiB")
+
+        cases = {
+            "search": lambda q: crud.search_employees(db, q),
+            "ILIKE '%q%' scan": lambda q: ilike_scan(db, q),
+        }
+        print(f"\n{'':<18} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for label, fn in cases.items():
+            stats = await measure(fn)
+            print(f"{label:<18} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+
+        print("\nTop hits:")
+        for q in QUERIES[:4]:
+            hits = await crud.search_employees(db, q, limit=3)
+            print(f"  {q!r:<16} " + ", ".join(f"{e.full_name} ({score})" for e, score in hits))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
@@ -0,0 +1,49 @@
+"""
+Rows/sec of the employee list endpoint, ORM path vs fast path.
+
+    python -m benchmarks.bench_serialization [n_employees]
+
+"orm" reproduces the previous endpoint: load Employee objects, validate
+each through EmployeeResponse (from_attributes) and encode with the
+stdlib. "fast" is the current GET /api/v1/employees: column tuples
+encoded directly with orjson.
+"""
+import asyncio
+import sys
+from typing import List
+
+from fastapi import Depends
+
+from benchmarks.common import api_client, seed, timed
+from app.database import engine, get_db
+from app.main import app
+from app.schemas import EmployeeResponse
+from app import crud
+
+
+@app.get("/bench/orm-employees", response_model=List[EmployeeResponse], include_in_schema=False)
+async def orm_employees(limit: int = 100, db=Depends(get_db)):
+    return await crud.get_employees(db, limit=limit)
+
+
+async def main(n_employees: int):
+    await seed(n_departments=100, n_employees=n_employees)
+
+    print(f"{'page size':>10} {'orm rows/s':>12} {'fast rows/s':>12} {'speedup':>8}")
+    async with api_client() as client:
+        for page_size in (100, 1_000, 10_000):
+            async def orm():
+                await client.get("/bench/orm-employees", params={"limit": page_size})
+
+            async def fast():
+                await client.get("/api/v1/employees/", params={"limit": page_size})
+
+            orm_s, fast_s = await timed(orm), await timed(fast)
+            print(f"{page_size:>10} {page_size / orm_s:>12.0f} {page_size / fast_s:>12.0f} "
+                  f"{orm_s / fast_s:>7.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
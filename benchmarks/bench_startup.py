@@ -0,0 +1,116 @@
+"""
+How long a fresh worker takes to import the app and become ready.
+
+    python -m benchmarks.bench_startup [--runs 5] [--top 12]
+
+Two measurements, each in fresh processes so nothing is already
+imported or connected:
+
+  imports   `python -X importtime -c "import app.main"`, repeated --runs
+            times; prints the median total and the slowest top-level
+            packages and app modules (cumulative, including what they
+            import)
+  serving   migrates a temporary database, starts the production
+            launcher (app.server, one worker, SCHEMA_STARTUP=verify)
+            and times, from spawning the process, the first 200 from
+            /health/live, from /health/ready and from a real API read
+
+The gap between live and ready is the background work in app.startup
+(schema check, pool warm-up); the first API read after ready should
+cost no more than any later one.
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+PORT = 18100
+
+
+def import_times(runs: int) -> dict:
+    """Median cumulative import time (ms) per module over `runs` fresh interpreters"""
+    samples = defaultdict(list)
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            env={**os.environ, "DATABASE_URL": "sqlite+aiosqlite:///unused.db"},
+            capture_output=True, text=True, check=True,
+        )
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            samples[name.strip()].append(int(cumulative) / 1000)
+    return {name: statistics.median(times) for name, times in samples.items()}
+
+
+def time_to_serve(timeout: float = 30) -> dict:
+    """Seconds from spawning the server to the first 200 of each endpoint"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "startup.db")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+        "SCHEMA_STARTUP": "verify",
+        "ACCESS_LOG": "0",
+    }
+    subprocess.run([sys.executable, "-m", "app.migrate", "upgrade"], env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f"http://127.0.0.1:{PORT}"
+    pending = ["/health/live", "/health/ready", "/api/v1/departments/"]
+    reached = {}
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", "1", "--bind", f"127.0.0.1:{PORT}"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=5) as client:
+            while pending and time.perf_counter() - started < timeout:
+                try:
+                    if client.get(pending[0]).status_code == 200:
+                        reached[pending.pop(0)] = time.perf_counter() - started
+                        continue
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    if pending:
+        raise RuntimeError(f"server never answered {pending[0]}")
+    return reached
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--top", type=int, default=12, help="packages and app modules to list")
+    args = parser.parse_args(argv)
+
+    medians = import_times(args.runs)
+    print(f"import app.main: {medians['app.main']:.0f} ms (median of {args.runs})\n")
+    packages = {name: ms for name, ms in medians.items() if "." not in name and name != "app"}
+    modules = {name: ms for name, ms in medians.items() if name.startswith("app.")}
+    for title, table in (("top-level packages", packages), ("app modules", modules)):
+        print(f"{title:<28} {'ms':>7}")
+        for name, ms in sorted(table.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {name:<26} {ms:>7.1f}")
+        print()
+
+    runs = [time_to_serve() for _ in range(args.runs)]
+    print(f"{'first 200 from':<28} {'median s':>9} {'max s':>7}")
+    for path in runs[0]:
+        times = [run[path] for run in runs]
+        print(f"  {path:<26} {statistics.median(times):>9.3f} {max(times):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+API throughput as the number of server worker processes grows.
+
+    python -m benchmarks.bench_workers [--workers 1,2,4] [--duration 10]
+
+For each worker count, starts the production launcher (app.server) on a
+local port, drives it with several load-generating processes issuing a
+read-heavy mix (employee by id, filtered listing) over keep-alive
+connections, and reports requests/second and the speedup over one
+worker. The load generators run alongside the server, so on a machine
+with few cores they compete with it for CPU; scaling is only
+meaningful up to roughly half the available cores.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import percentiles, seed
+from app.database import engine
+
+N_EMPLOYEES = 50_000
+N_DEPARTMENTS = 100
+
+
+async def drive(base_url: str, concurrency: int, duration: float) -> list:
+    latencies = []
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if random.random() < 0.7:
+                    await client.get(f"/api/v1/employees/{random.randint(1, N_EMPLOYEES)}")
+                else:
+                    await client.get("/api/v1/employees/", params={
+                        "limit": 20, "department_id": random.randint(1, N_DEPARTMENTS),
+                    })
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def prepare():
+    await seed(n_departments=N_DEPARTMENTS, n_employees=N_EMPLOYEES)
+    await engine.dispose()
+
+
+def load_process(base_url, concurrency, duration, results):
+    results.extend(asyncio.run(drive(base_url, concurrency, duration)))
+
+
+def wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def run_level(workers: int, args) -> dict:
+    port = 18000 + workers
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "SCHEMA_STARTUP": "skip", "ACCESS_LOG": "0"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", str(workers), "--bind", f"127.0.0.1:{port}"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(base_url)
+        with multiprocessing.Manager() as manager:
+            results = manager.list()
+            loaders = [
+                multiprocessing.Process(target=load_process, args=(base_url, args.concurrency, args.duration, results))
+                for _ in range(args.clients)
+            ]
+            started = time.perf_counter()
+            for p in loaders:
+                p.start()
+            for p in loaders:
+                p.join()
+            elapsed = time.perf_counter() - started
+            samples = list(results)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return {"requests": len(samples), "rps": len(samples) / elapsed, **percentiles(samples)}
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, max(1, cpus // 2), cpus})))
+    parser.add_argument("--clients", type=int, default=max(2, cpus // 2), help="load-generating processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per load process")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{cpus} CPUs; seeding {N_EMPLOYEES} employees...")
+    asyncio.run(prepare())
+
+    print(f"\n{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    baseline = None
+    for workers in (int(n) for n in args.workers.split(",")):
+        stats = run_level(workers, args)
+        baseline = baseline or stats["rps"]
+        print(f"{workers:>7} {stats['rps']:>9.0f} {stats['rps'] / baseline:>7.2f}x "
+              f"{stats['p50']:>8.1f} {stats['p95']:>8.1f} {stats['p99']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
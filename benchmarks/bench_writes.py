@@ -0,0 +1,82 @@
+"""
+Employee create latency: check-then-insert vs constraint-driven INSERT.
+
+    python -m benchmarks.bench_writes [creates] [concurrency]
+
+The old path issued an email lookup, a department lookup, the INSERT,
+the COMMIT and a refresh SELECT. The new path is INSERT ... RETURNING
+plus COMMIT. Against a remote database each saved round trip is a full
+network RTT, so point BENCH_DATABASE_URL at one for realistic numbers.
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.common import percentiles, seed
+from sqlalchemy import event
+from app.database import AsyncSessionLocal, engine
+from app.models import Employee
+from app.schemas import EmployeeCreate
+from app import crud
+
+
+async def old_create(db, employee: EmployeeCreate):
+    """The write path as it was before constraint-driven inserts"""
+    if await crud.get_employee_by_email(db, employee.email):
+        return None
+    if not await crud.get_department_by_id(db, employee.department_id):
+        return None
+    db_employee = Employee(**employee.model_dump())
+    db.add(db_employee)
+    await db.commit()
+    await db.refresh(db_employee)
+    return db_employee
+
+
+async def run(label, create, creates, concurrency, offset):
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    queue = asyncio.Queue()
+    for i in range(creates):
+        queue.put_nowait(EmployeeCreate(
+            email=f"new{offset + i}@company.com", full_name=f"New {i}", department_id=i % 10 + 1,
+        ))
+
+    latencies = []
+
+    async def worker():
+        async with AsyncSessionLocal() as db:
+            while not queue.empty():
+                employee = queue.get_nowait()
+                start = time.perf_counter()
+                await create(db, employee)
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    stats = percentiles(latencies)
+    print(
+        f"{label:<8} {creates / elapsed:>9.0f}/s  p50 {stats['p50']:.2f} ms  "
+        f"p95 {stats['p95']:.2f} ms  p99 {stats['p99']:.2f} ms  "
+        f"{statements / creates:.1f} statements/create"
+    )
+
+
+async def main(creates: int, concurrency: int):
+    await seed(n_departments=10, n_employees=10_000)
+    await run("old", old_create, creates, concurrency, offset=0)
+    await run("new", crud.create_employee, creates, concurrency, offset=creates)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(*(args + [2000, 16][len(args):])))
@@ -0,0 +1,86 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a local database so results are reproducible:
+by default a temporary SQLite file (via aiosqlite), or whatever
+BENCH_DATABASE_URL points at (e.g. a local Postgres).
+Import this module before anything from `app` so the engine picks up
+the benchmark database.
+"""
+import os
+import statistics
+import tempfile
+import time
+
+if "BENCH_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import engine, Base  # noqa: E402
+from app.models import Department, Employee  # noqa: E402
+
+ROLES = ["Employee", "Engineer", "Senior Engineer", "Manager", "Director", "Analyst"]
+
+
+async def reset_schema():
+    """Drop and recreate all tables"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def numbered_name(i: int) -> str:
+    return f"User {i:07d}"
+
+
+async def seed(n_departments: int, n_employees: int, batch_size: int = 10_000, name_for=numbered_name):
+    """Bulk-insert synthetic departments and employees"""
+    await reset_schema()
+    async with engine.begin() as conn:
+        await conn.execute(insert(Department), [
+            {"id": d + 1, "name": f"Department {d + 1:04d}", "description": None}
+            for d in range(n_departments)
+        ])
+        for start in range(0, n_employees, batch_size):
+            await conn.execute(insert(Employee), [
+                {
+                    "id": i + 1,
+                    "email": f"user{i:07d}@company.com",
+                    "full_name": name_for(i),
+                    "role": ROLES[i % len(ROLES)],
+                    "is_active": i % 10 != 0,
+                    "department_id": i % n_departments + 1,
+                }
+                for i in range(start, min(start + batch_size, n_employees))
+            ])
+
+
+async def timed(fn, repeat: int = 5):
+    """Run an async callable `repeat` times, returning the median seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def percentiles(samples):
+    """p50/p95/p99 of a list of seconds, in milliseconds"""
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def api_client() -> httpx.AsyncClient:
+    """HTTP client that calls the FastAPI app in-process over ASGI"""
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
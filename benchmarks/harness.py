@@ -0,0 +1,228 @@
+"""
+Reproducible load test of the API against a local database.
+
+    python -m benchmarks.harness --employees 100000 --departments 1000 \
+        --concurrency 32 --duration 30 --mix list=40,get=40,create=10,bulk=5,export=5
+
+The FastAPI app runs in-process over ASGI, so the numbers cover routing,
+validation, serialization and the database, without a socket in between.
+It runs against a temporary SQLite file by default; set
+BENCH_DATABASE_URL to benchmark a local Postgres instead.
+
+Results (latency percentiles, throughput and memory, per operation) are
+printed and saved as JSON under benchmarks/results/. Pass --compare with
+an earlier results file to see the change in p95 and throughput between
+commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from benchmarks.common import api_client, percentiles, seed
+from app.database import engine
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_MIX = "list=40,get=40,create=10,bulk=5,export=5"
+
+
+class Workload:
+    """The operations a simulated client can perform"""
+
+    def __init__(self, client, n_employees, n_departments, bulk_size):
+        self.client = client
+        self.n_employees = n_employees
+        self.n_departments = n_departments
+        self.bulk_size = bulk_size
+        self._next_email = 0
+
+    def _email(self):
+        self._next_email += 1
+        return f"load{os.getpid()}-{self._next_email}@company.com"
+
+    async def list(self):
+        return await self.client.get("/api/v1/employees/", params={
+            "limit": 100, "department_id": random.randint(1, self.n_departments),
+        })
+
+    async def get(self):
+        return await self.client.get(f"/api/v1/employees/{random.randint(1, self.n_employees)}")
+
+    async def create(self):
+        return await self.client.post("/api/v1/employees/", json={
+            "email": self._email(), "full_name": "Load Test",
+            "department_id": random.randint(1, self.n_departments),
+        })
+
+    async def bulk(self):
+        return await self.client.post("/api/v1/employees/bulk", json=[
+            {"email": self._email(), "full_name": "Load Test",
+             "department_id": random.randint(1, self.n_departments)}
+            for _ in range(self.bulk_size)
+        ])
+
+    async def export(self):
+        # One department's slice keeps each export bounded on large seeds
+        return await self.client.get("/api/v1/employees/export", params={
+            "department_id": random.randint(1, self.n_departments),
+        })
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Workload, name.strip()):
+            raise SystemExit(f"Unknown operation '{name}' in --mix")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def rss_mb():
+    """Current resident set size in MiB (Linux), falling back to the peak"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args):
+    weights = parse_mix(args.mix)
+    print(f"Seeding {args.employees} employees across {args.departments} departments...")
+    seed_start = time.perf_counter()
+    await seed(n_departments=args.departments, n_employees=args.employees)
+    seed_seconds = time.perf_counter() - seed_start
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    memory_samples = []
+
+    async with api_client() as client:
+        workload = Workload(client, args.employees, args.departments, args.bulk_size)
+        names, cumulative = list(weights), list(weights.values())
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = random.choices(names, weights=cumulative)[0]
+                start = time.perf_counter()
+                try:
+                    response = await getattr(workload, name)()
+                    failed = response.status_code >= 400
+                except Exception:
+                    failed = True
+                latencies[name].append(time.perf_counter() - start)
+                if failed:
+                    errors[name] += 1
+
+        async def sample_memory():
+            while time.perf_counter() < deadline:
+                memory_samples.append(rss_mb())
+                await asyncio.sleep(0.5)
+
+        started = time.perf_counter()
+        await asyncio.gather(sample_memory(), *(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await engine.dispose()
+
+    operations = {
+        name: {
+            "count": len(samples),
+            "errors": errors[name],
+            "throughput_per_s": round(len(samples) / elapsed, 2),
+            **{k: round(v, 3) for k, v in percentiles(samples).items()},
+        }
+        for name, samples in sorted(latencies.items())
+    }
+    every = [s for samples in latencies.values() for s in samples]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database": engine.dialect.name,
+        "config": {
+            "employees": args.employees, "departments": args.departments,
+            "concurrency": args.concurrency, "duration_s": args.duration,
+            "mix": weights, "bulk_size": args.bulk_size,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "total": {
+            "count": len(every),
+            "throughput_per_s": round(len(every) / elapsed, 2),
+            **{k: round(v, 3) for k, v in percentiles(every).items()},
+        },
+        "operations": operations,
+        "memory_mb": {
+            "peak_rss": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "max_sampled_rss": round(max(memory_samples, default=0), 1),
+        },
+    }
+
+
+def report(results, baseline=None):
+    print(f"\n{'operation':<10} {'count':>7} {'err':>5} {'ops/s':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}" + ("  p95 vs base" if baseline else ""))
+    rows = list(results["operations"].items()) + [("TOTAL", results["total"])]
+    for name, stats in rows:
+        line = (f"{name:<10} {stats['count']:>7} {stats.get('errors', 0):>5} "
+                f"{stats['throughput_per_s']:>9.1f} {stats['p50']:>9.2f} "
+                f"{stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+        if baseline:
+            base = baseline["operations"].get(name) if name != "TOTAL" else baseline["total"]
+            if base and base["p95"]:
+                line += f"  {(stats['p95'] - base['p95']) / base['p95'] * 100:+6.1f}%"
+        print(line)
+    print(f"\npeak RSS {results['memory_mb']['peak_rss']} MiB, seeded in {results['seed_seconds']} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--departments", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight pairs")
+    parser.add_argument("--bulk-size", type=int, default=100, help="rows per bulk import")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for the workload")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    results = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{results['commit'] or 'nocommit'}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved results to {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Shared HTTP client for talking to the HRMS backend API.
+
+One pooled requests.Session is reused across all Flask requests so TCP
+and TLS connections to the API stay open between page views. Independent
+API calls can be issued concurrently, and the departments list (needed
+on nearly every form) is cached for a few seconds.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class ApiClient:
+    """Pooled, retrying client for the backend API"""
+
+    def __init__(self, base_url, connect_timeout=3.05, read_timeout=10,
+                 retries=2, backoff_factor=0.2, pool_size=20,
+                 departments_ttl=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.departments_ttl = departments_ttl
+
+        # Retries apply to idempotent methods only; a failed POST is not replayed
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='api')
+        self._departments = None
+        self._departments_expires = 0.0
+        self._departments_lock = threading.Lock()
+
+    def get(self, path, **params):
+        return self.session.get(f'{self.base_url}{path}', params=params or None, timeout=self.timeout)
+
+    def post(self, path, json):
+        return self.session.post(f'{self.base_url}{path}', json=json, timeout=self.timeout)
+
+    def parallel(self, *calls):
+        """Run independent zero-argument calls concurrently, returning their results in order"""
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def departments(self):
+        """The departments list, cached for `departments_ttl` seconds"""
+        with self._departments_lock:
+            if self._departments is not None and time.monotonic() < self._departments_expires:
+                return self._departments
+
+        response = self.get('/departments/')
+        response.raise_for_status()
+        departments = response.json()
+
+        with self._departments_lock:
+            self._departments = departments
+            self._departments_expires = time.monotonic() + self.departments_ttl
+        return departments
+
+    def invalidate_departments(self):
+        with self._departments_lock:
+            self._departments = None
+
+
+api = ApiClient(
+    os.getenv('API_BASE_URL', 'http://localhost:8000/api/v1'),
+    connect_timeout=float(os.getenv('API_CONNECT_TIMEOUT', '3.05')),
+    read_timeout=float(os.getenv('API_READ_TIMEOUT', '10')),
+    retries=int(os.getenv('API_RETRIES', '2')),
+    backoff_factor=float(os.getenv('API_RETRY_BACKOFF', '0.2')),
+    pool_size=int(os.getenv('API_POOL_SIZE', '20')),
+    departments_ttl=float(os.getenv('API_DEPARTMENTS_TTL', '10')),
+)
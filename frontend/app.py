@@ -1,44 +1,37 @@
 from flask import Flask, render_template, request, redirect, url_for, flash
-import requests
 import os
 
+from api_client import api
+
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', os.urandom(24).hex())
 
-# API Configuration
-API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8000/api/v1')
-
 
 @app.route('/')
 def index():
     """Dashboard/Home page"""
     try:
-        # Get counts
-        departments_response = requests.get(f'{API_BASE_URL}/departments')
-        employees_response = requests.get(f'{API_BASE_URL}/employees')
-        
-        dept_count = len(departments_response.json()) if departments_response.ok else 0
-        emp_count = len(employees_response.json()) if employees_response.ok else 0
+        # Counts are aggregated server-side instead of downloading every row
+        response = api.get('/stats')
+        stats = response.json() if response.ok else {}
         
         return render_template('index.html', 
-                             dept_count=dept_count, 
-                             emp_count=emp_count)
+                             dept_count=stats.get('total_departments', 0), 
+                             emp_count=stats.get('total_employees', 0),
+                             active_count=stats.get('active_employees', 0),
+                             recent_joiners=stats.get('recent_joiners', 0))
     except Exception as e:
         flash(f'Error connecting to API: {str(e)}', 'error')
-        return render_template('index.html', dept_count=0, emp_count=0)
+        return render_template('index.html', dept_count=0, emp_count=0,
+                             active_count=0, recent_joiners=0)
 
 
 @app.route('/departments')
 def departments():
     """List all departments"""
     try:
-        response = requests.get(f'{API_BASE_URL}/departments')
-        if response.ok:
-            departments_list = response.json()
-            return render_template('departments.html', departments=departments_list)
-        else:
-            flash('Failed to fetch departments', 'error')
-            return render_template('departments.html', departments=[])
+        departments_list = api.departments()
+        return render_template('departments.html', departments=departments_list)
     except Exception as e:
         flash(f'Error: {str(e)}', 'error')
         return render_template('departments.html', departments=[])
@@ -57,8 +50,9 @@ def add_department():
         }
         
         try:
-            response = requests.post(f'{API_BASE_URL}/departments/', json=payload)
+            response = api.post('/departments/', json=payload)
             if response.ok:
+                api.invalidate_departments()
                 flash(f'Department "{name}" created successfully!', 'success')
                 return redirect(url_for('departments'))
             else:
@@ -74,13 +68,14 @@ def add_department():
 def employees():
     """List all employees"""
     try:
-        # Get employees and departments
-        emp_response = requests.get(f'{API_BASE_URL}/employees')
-        dept_response = requests.get(f'{API_BASE_URL}/departments')
+        # Get employees and departments concurrently
+        emp_response, departments_list = api.parallel(
+            lambda: api.get('/employees'),
+            api.departments,
+        )
         
-        if emp_response.ok and dept_response.ok:
+        if emp_response.ok:
             employees_list = emp_response.json()
-            departments_list = dept_response.json()
             
             # Create department lookup dictionary
             dept_dict = {dept['id']: dept['name'] for dept in departments_list}
@@ -103,9 +98,8 @@ def add_employee():
     """Add a new employee"""
     # Get departments for dropdown
     try:
-        dept_response = requests.get(f'{API_BASE_URL}/departments')
-        departments_list = dept_response.json() if dept_response.ok else []
-    except:
+        departments_list = api.departments()
+    except Exception:
         departments_list = []
     
     if request.method == 'POST':
@@ -124,7 +118,7 @@ def add_employee():
         }
         
         try:
-            response = requests.post(f'{API_BASE_URL}/employees/', json=payload)
+            response = api.post('/employees/', json=payload)
             if response.ok:
                 flash(f'Employee "{full_name}" created successfully!', 'success')
                 return redirect(url_for('employees'))
@@ -138,4 +132,5 @@ def add_employee():
 
 
 if __name__ == '__main__':
+    # Development server; run `python server.py` in production
     app.run(debug=True, port=5000)
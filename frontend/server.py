@@ -0,0 +1,89 @@
+"""
+Production WSGI server for the frontend (instead of Flask's dev server).
+
+    python server.py                     # from the frontend directory
+    python server.py --workers 4 --threads 16 --bind 0.0.0.0:5000
+
+Runs the Flask app under gunicorn with threaded workers: page views
+spend most of their time waiting on the backend API, so each worker
+serves several at once. Keep API_POOL_SIZE at least --threads so
+every thread can hold a pooled connection to the API.
+
+On SIGTERM workers stop accepting connections and finish in-flight
+requests for up to --graceful-timeout seconds. Options can also be set
+through the environment variable shown in --help.
+"""
+import argparse
+import os
+import secrets
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Server(BaseApplication):
+    """gunicorn application serving an import string with the given settings"""
+
+    def __init__(self, app_uri, options):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+        return import_app(self.app_uri)
+
+
+def parse_args(argv=None):
+    env = os.getenv
+    parser = argparse.ArgumentParser(description='Run the HRMS frontend with gunicorn')
+    parser.add_argument('--bind', default=env('BIND', f"0.0.0.0:{env('PORT', '5000')}"),
+                        help='address to listen on (BIND, or PORT)')
+    parser.add_argument('--workers', type=int,
+                        default=int(env('WEB_CONCURRENCY', '0')) or os.cpu_count() or 1,
+                        help='worker processes (WEB_CONCURRENCY, default: CPU count)')
+    parser.add_argument('--threads', type=int, default=int(env('THREADS', '8')),
+                        help='request threads per worker (THREADS)')
+    parser.add_argument('--keepalive', type=int, default=int(env('KEEPALIVE', '5')),
+                        help='seconds to hold idle keep-alive connections (KEEPALIVE)')
+    parser.add_argument('--backlog', type=int, default=int(env('BACKLOG', '2048')),
+                        help='pending connections queued by the kernel (BACKLOG)')
+    parser.add_argument('--graceful-timeout', type=int, default=int(env('GRACEFUL_TIMEOUT', '30')),
+                        help='seconds to drain in-flight requests on shutdown (GRACEFUL_TIMEOUT)')
+    parser.add_argument('--timeout', type=int, default=int(env('WORKER_TIMEOUT', '60')),
+                        help='restart a worker that stops responding for this long (WORKER_TIMEOUT)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Every worker must sign session cookies (flash messages) with the
+    # same key, or a redirect served by another worker loses them
+    if 'FLASK_SECRET_KEY' not in os.environ:
+        print('FLASK_SECRET_KEY is not set; generated one for this run', file=sys.stderr)
+        os.environ['FLASK_SECRET_KEY'] = secrets.token_hex(32)
+
+    Server('app:app', {
+        'bind': args.bind,
+        'chdir': FRONTEND_DIR,
+        'workers': args.workers,
+        'worker_class': 'gthread',
+        'threads': args.threads,
+        'keepalive': args.keepalive,
+        'backlog': args.backlog,
+        'graceful_timeout': args.graceful_timeout,
+        'timeout': args.timeout,
+        'accesslog': '-',
+    }).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
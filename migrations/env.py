@@ -0,0 +1,60 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import DATABASE_URL, Base, engine as app_engine
+from app.migrate import include_object_for
+import app.models  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logging", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Each revision commits on its own, so a revision can leave its
+# transaction (op.get_context().autocommit_block()) for statements like
+# CREATE INDEX CONCURRENTLY without affecting earlier ones.
+CONFIGURE_OPTIONS = dict(
+    target_metadata=target_metadata,
+    transaction_per_migration=True,
+    include_object=include_object_for(app_engine.dialect.name),
+    render_as_batch=DATABASE_URL.startswith("sqlite"),
+)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout (`python -m app.migrate upgrade --sql`)"""
+    context.configure(
+        url=DATABASE_URL,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        **CONFIGURE_OPTIONS,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(connection=connection, **CONFIGURE_OPTIONS)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    # A dedicated, unpooled engine: migrations run once per deploy
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+    finally:
+        await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,50 @@
+"""Initial schema: departments and employees
+
+Matches the tables as first created by `Base.metadata.create_all`, so an
+existing database can be stamped at this revision (`python -m app.migrate
+upgrade` does that automatically) and brought forward from here.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "departments",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_departments_id", "departments", ["id"])
+    op.create_index("ix_departments_name", "departments", ["name"], unique=True)
+
+    op.create_table(
+        "employees",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=200), nullable=False),
+        sa.Column("role", sa.String(length=100), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("joined_date", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_employees_id", "employees", ["id"])
+    op.create_index("ix_employees_email", "employees", ["email"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("employees")
+    op.drop_table("departments")
@@ -0,0 +1,50 @@
+"""Indexes for keyset pagination, listing filters and name/email search
+
+Built with CREATE INDEX CONCURRENTLY on Postgres so the employees table
+stays writable while they are created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+from app.migrate import create_index_concurrently, drop_index_concurrently
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BTREE_INDEXES = {
+    "ix_employees_full_name_id": ["full_name", "id"],
+    "ix_employees_joined_date_id": ["joined_date", "id"],
+    "ix_employees_department_id_is_active": ["department_id", "is_active"],
+    "ix_employees_role_is_active": ["role", "is_active"],
+}
+TRIGRAM_INDEXES = {
+    "ix_employees_full_name_trgm": "full_name",
+    "ix_employees_email_trgm": "email",
+}
+
+
+def upgrade() -> None:
+    for name, columns in BTREE_INDEXES.items():
+        create_index_concurrently(name, "employees", columns)
+
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, column in TRIGRAM_INDEXES.items():
+            create_index_concurrently(
+                name, "employees", [column],
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    names = list(BTREE_INDEXES)
+    if op.get_context().dialect.name == "postgresql":
+        names += list(TRIGRAM_INDEXES)
+    for name in names:
+        drop_index_concurrently(name, "employees")
@@ -0,0 +1,28 @@
+"""Trigram index on employees.role for /employees/search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+from app.migrate import create_index_concurrently, drop_index_concurrently
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        create_index_concurrently(
+            "ix_employees_role_trgm", "employees", ["role"],
+            postgresql_using="gin", postgresql_ops={"role": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        drop_index_concurrently("ix_employees_role_trgm", "employees")
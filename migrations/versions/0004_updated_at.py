@@ -0,0 +1,35 @@
+"""Add updated_at to departments and employees
+
+Existing rows are stamped with the migration time. On Postgres 11+ a
+column with a now() default is added without rewriting the table.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLES = ("departments", "employees")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # SQLite can't ALTER TABLE ADD COLUMN with a non-constant default;
+        # batch mode rebuilds the table there and is a plain ALTER elsewhere
+        with op.batch_alter_table(table) as batch:
+            batch.add_column(sa.Column(
+                "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False,
+            ))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
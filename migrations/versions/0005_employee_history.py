@@ -0,0 +1,79 @@
+"""Employee change history: employee_events and employee_snapshots
+
+On Postgres employee_events is partitioned by month on occurred_at,
+with a default partition and partitions for the next few months;
+`python -m app.history partitions` adds later ones. Existing employees
+get a first snapshot, so their state is known from this revision on.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.history import PARTITION_MONTHS_AHEAD, partition_statements
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    is_postgres = op.get_context().dialect.name == "postgresql"
+    op.create_table(
+        "employee_events",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), autoincrement=True, nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("actor", sa.String(length=255), nullable=True),
+        sa.Column("changes", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=False),
+        # As in app.models: id stays the key in the metadata (a BIGSERIAL on
+        # Postgres), but a partitioned table can't have a key without
+        # the partition column, so the constraint is only created elsewhere
+        sa.PrimaryKeyConstraint("id").ddl_if(dialect="sqlite"),
+        postgresql_partition_by="RANGE (occurred_at)",
+    )
+    if is_postgres:
+        op.execute("CREATE TABLE employee_events_default PARTITION OF employee_events DEFAULT")
+        for _, statement in partition_statements(date.today(), PARTITION_MONTHS_AHEAD + 1):
+            op.execute(statement)
+    op.create_index(
+        "ix_employee_events_employee_id_occurred_at", "employee_events", ["employee_id", "occurred_at", "id"]
+    )
+    op.create_index(
+        "ix_employee_events_created", "employee_events", ["employee_id", "occurred_at"],
+        sqlite_where=sa.text("kind = 'created'"), postgresql_where=sa.text("kind = 'created'"),
+    )
+
+    op.create_table(
+        "employee_snapshots",
+        sa.Column("snapshot_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=200), nullable=False),
+        sa.Column("role", sa.String(length=100), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("joined_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("snapshot_at", "employee_id"),
+    )
+    op.execute(
+        "INSERT INTO employee_snapshots "
+        "(snapshot_at, employee_id, email, full_name, role, is_active, joined_date, department_id, updated_at) "
+        "SELECT CURRENT_TIMESTAMP, id, email, full_name, role, is_active, joined_date, department_id, updated_at "
+        "FROM employees"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("employee_snapshots")
+    # Drops the partitions with it on Postgres
+    op.drop_table("employee_events")
@@ -0,0 +1,41 @@
+"""Add employees.manager_id for the org chart
+
+The column is nullable with no default, so on Postgres adding it is a
+catalog change; the index is built concurrently. Employee snapshots
+record it too.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.migrate import create_index_concurrently, drop_index_concurrently
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite can't add a foreign key in place; batch mode rebuilds the
+    # table there and is a plain ALTER elsewhere
+    with op.batch_alter_table("employees") as batch:
+        batch.add_column(sa.Column("manager_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_employees_manager_id_employees", "employees", ["manager_id"], ["id"], ondelete="SET NULL",
+        )
+    create_index_concurrently("ix_employees_manager_id", "employees", ["manager_id"])
+    op.add_column("employee_snapshots", sa.Column("manager_id", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("employee_snapshots") as batch:
+        batch.drop_column("manager_id")
+    drop_index_concurrently("ix_employees_manager_id", "employees")
+    with op.batch_alter_table("employees") as batch:
+        batch.drop_constraint("fk_employees_manager_id_employees", type_="foreignkey")
+        batch.drop_column("manager_id")
@@ -0,0 +1,33 @@
+"""Give server-defaulted joined_date values fractional seconds on SQLite
+
+SQLite keeps datetimes as text. now() writes 'YYYY-MM-DD HH:MM:SS' while
+SQLAlchemy writes and binds 'YYYY-MM-DD HH:MM:SS.ffffff', so rows
+stamped by the server default sorted and compared wrongly against
+cursor and filter values. joined_date is now set by the app; this pads
+the existing values. Other databases store real timestamps and are
+left alone.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "UPDATE employees SET joined_date = joined_date || '.000000' "
+            "WHERE length(joined_date) = 19"
+        )
+
+
+def downgrade() -> None:
+    # The padded values read back as the same instants
+    pass
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the API test suite.
+The app runs in-process against a throwaway SQLite database, so no
+network access or live Supabase instance is needed.
+"""
+import os
+import tempfile
+import time
+
+import pytest
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="hrms-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+# Each test starts from an empty file, so create the tables directly
+os.environ["SCHEMA_STARTUP"] = "create"
+# Tests run background jobs themselves (see tests/test_jobs.py)
+os.environ["JOB_WORKERS"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app import crud  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    """Test client on a fresh, empty database"""
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    with TestClient(app) as test_client:
+        test_client.portal.call(crud.reset_caches)
+        yield test_client
+
+
+@pytest.fixture
+def department(client):
+    """A department to attach employees to"""
+    response = client.post("/api/v1/departments/", json={"name": "Engineering"})
+    assert response.status_code == 201
+    return response.json()
+
+
+def make_employees(client, department_id, count, prefix="emp"):
+    """Create `count` employees through the API and return them"""
+    created = []
+    for i in range(count):
+        response = client.post("/api/v1/employees/", json={
+            "email": f"{prefix}{i:04d}@company.com",
+            "full_name": f"{prefix.title()} {i:04d}",
+            "department_id": department_id,
+        })
+        assert response.status_code == 201, response.text
+        created.append(response.json())
+    return created
+
+
+def wait_until_started(client, timeout=10.0):
+    """Poll /health/ready until the startup checks have finished"""
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/health/ready")
+        if response.json()["status"] != "starting" or time.monotonic() > deadline:
+            return response
+        time.sleep(0.01)
@@ -0,0 +1,78 @@
+"""
+End-to-end checks of the HRMS Backend API.
+These used to be a print-based script run against a live server; they
+now run in-process against the test database (see conftest.py).
+"""
+
+
+def test_root(client):
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.json()["docs"] == "/docs"
+
+
+def test_health(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["database"] == "connected"
+
+
+def test_create_department(client):
+    data = {
+        "name": "Engineering",
+        "description": "Software development team"
+    }
+    response = client.post("/api/v1/departments/", json=data)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body == {**data, "id": body["id"], "updated_at": body["updated_at"]}
+
+
+def test_get_departments(client, department):
+    response = client.get("/api/v1/departments/")
+
+    assert response.status_code == 200
+    assert [d["id"] for d in response.json()] == [department["id"]]
+
+
+def test_create_employee(client, department):
+    data = {
+        "email": "john.doe@company.com",
+        "full_name": "John Doe",
+        "role": "Senior Software Engineer",
+        "is_active": True,
+        "department_id": department["id"]
+    }
+    response = client.post("/api/v1/employees/", json=data)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert {key: body[key] for key in data} == data
+    assert body["id"] and body["joined_date"]
+
+
+def test_get_employees(client, department):
+    created = client.post("/api/v1/employees/", json={
+        "email": "john.doe@company.com", "full_name": "John Doe", "department_id": department["id"],
+    }).json()
+
+    response = client.get("/api/v1/employees/")
+
+    assert response.status_code == 200
+    assert response.json() == [created]
+
+
+def test_get_employee_by_id(client, department):
+    created = client.post("/api/v1/employees/", json={
+        "email": "john.doe@company.com", "full_name": "John Doe", "department_id": department["id"],
+    }).json()
+
+    response = client.get(f"/api/v1/employees/{created['id']}")
+    missing = client.get("/api/v1/employees/999")
+
+    assert response.status_code == 200
+    assert response.json() == created
+    assert missing.status_code == 404
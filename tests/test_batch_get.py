@@ -0,0 +1,75 @@
+import asyncio
+
+from app.dataloader import DataLoader
+from tests.conftest import make_employees
+from tests.test_updates import record_statements
+
+
+def test_batch_get_preserves_order_and_reports_missing(client, department):
+    employees = make_employees(client, department["id"], 3)
+    ids = [employees[2]["id"], 999, employees[0]["id"], employees[2]["id"]]
+
+    statements, stop = record_statements()
+    try:
+        response = client.post("/api/v1/employees/batch-get", json={"ids": ids})
+    finally:
+        stop()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [e["id"] for e in body["employees"]] == [employees[2]["id"], employees[0]["id"]]
+    assert body["employees"][0] == employees[2]
+    assert body["missing"] == [999]
+    assert statements == ["SELECT"]
+
+
+def test_batch_get_validates_ids(client):
+    assert client.post("/api/v1/employees/batch-get", json={"ids": []}).status_code == 422
+    assert client.post("/api/v1/employees/batch-get", json={"ids": list(range(1001))}).status_code == 422
+
+
+def test_concurrent_department_lookups_share_one_query(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 2)
+
+    statements, stop = record_statements()
+    try:
+        response = client.post("/api/v1/employees/reassign", json={
+            "from_department_id": department["id"], "to_department_id": other["id"],
+        })
+    finally:
+        stop()
+
+    assert response.json() == {"affected": 2}
+    assert statements.count("SELECT") == 1
+
+
+def test_dataloader_merges_loads_from_one_tick():
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(keys)
+        return {key: key * 10 for key in keys if key != 3}
+
+    async def scenario():
+        loader = DataLoader(batch_load)
+        first = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+        second = await loader.load_many([4, 5])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == [10, 20, 10, None]
+    assert second == [40, 50]
+    assert calls == [[1, 2, 3], [4, 5]]
+
+
+def test_dataloader_propagates_batch_errors():
+    async def batch_load(keys):
+        raise RuntimeError("database unavailable")
+
+    async def scenario():
+        loader = DataLoader(batch_load)
+        return await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
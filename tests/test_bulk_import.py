@@ -0,0 +1,93 @@
+def test_bulk_departments_json(client):
+    response = client.post("/api/v1/departments/bulk", json=[
+        {"name": "Engineering"}, {"name": "Sales", "description": "Revenue"}, {"name": "Engineering"},
+    ])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["created"], body["failed"], body["committed"]) == (2, 1, True)
+    assert [r["status"] for r in body["results"]] == ["created", "created", "error"]
+    assert len(client.get("/api/v1/departments/").json()) == 2
+
+
+def test_bulk_employees_partial_mode_reports_per_row(client, department):
+    client.post("/api/v1/employees/", json={
+        "email": "taken@company.com", "full_name": "Taken", "department_id": department["id"],
+    })
+    ndjson = "\n".join([
+        '{"email": "a@company.com", "full_name": "A", "department_id": %d}' % department["id"],
+        '{"email": "taken@company.com", "full_name": "Dup", "department_id": %d}' % department["id"],
+        '{"email": "b@company.com", "full_name": "B", "department_id": 999}',
+        '{"email": "not-an-email", "full_name": "C", "department_id": %d}' % department["id"],
+        '{"email": "a@company.com", "full_name": "A again", "department_id": %d}' % department["id"],
+    ])
+
+    response = client.post(
+        "/api/v1/employees/bulk", content=ndjson,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created", "error", "error", "error", "error"]
+    assert "already exists" in results[1]["error"]
+    assert "not found" in results[2]["error"]
+    assert results[3]["error"].startswith("email")
+    assert "already exists" in results[4]["error"]
+    assert client.get(f"/api/v1/employees/{results[0]['id']}").json()["email"] == "a@company.com"
+
+
+
+def test_bulk_row_rejected_for_its_department_does_not_claim_its_email(client, department):
+    response = client.post("/api/v1/employees/bulk", json=[
+        {"email": "a@company.com", "full_name": "Wrong Department", "department_id": 999},
+        {"email": "a@company.com", "full_name": "Fixed", "department_id": department["id"]},
+    ])
+
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["error", "created"]
+    assert "Department with id 999" in results[0]["error"]
+
+
+def test_bulk_employees_csv_across_chunks(client, department, monkeypatch):
+    from app import crud
+    monkeypatch.setattr(crud, "BULK_CHUNK_SIZE", 2)
+    lines = ["email,full_name,role,is_active,department_id"] + [
+        f"user{i}@company.com,User {i},,{'true' if i % 2 else 'false'},{department['id']}"
+        for i in range(5)
+    ]
+
+    response = client.post(
+        "/api/v1/employees/bulk", content="\n".join(lines),
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.json()["created"] == 5
+    employees = client.get("/api/v1/employees/").json()
+    assert [emp["role"] for emp in employees] == ["Employee"] * 5
+    assert [emp["is_active"] for emp in employees] == [False, True, False, True, False]
+
+
+def test_bulk_atomic_mode_writes_nothing_on_failure(client, department):
+    rows = [
+        {"email": "ok@company.com", "full_name": "Ok", "department_id": department["id"]},
+        {"email": "bad@company.com", "full_name": "Bad", "department_id": 999},
+    ]
+
+    response = client.post("/api/v1/employees/bulk", params={"atomic": True}, json=rows)
+
+    body = response.json()
+    assert (body["created"], body["failed"], body["committed"]) == (0, 1, False)
+    assert [r["status"] for r in body["results"]] == ["skipped", "error"]
+    assert client.get("/api/v1/employees/").json() == []
+
+    rows[1]["department_id"] = department["id"]
+    response = client.post("/api/v1/employees/bulk", params={"atomic": True}, json=rows)
+    assert response.json()["created"] == 2
+
+
+def test_bulk_rejects_unparseable_body(client):
+    response = client.post(
+        "/api/v1/departments/bulk", content="{not json",
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,94 @@
+import asyncio
+
+from app.cache import MemoryBackend, ReadThroughCache
+
+
+def test_department_reads_hit_cache_and_create_invalidates(client, department):
+    client.get("/api/v1/departments/")
+    client.get("/api/v1/departments/")
+    client.get(f"/api/v1/departments/{department['id']}")
+    client.get(f"/api/v1/departments/{department['id']}")
+
+    stats = client.get("/metrics/cache").json()["departments"]
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+    client.post("/api/v1/departments/", json={"name": "Sales"})
+    names = [d["name"] for d in client.get("/api/v1/departments/").json()]
+    assert names == ["Engineering", "Sales"]
+
+
+def test_conditional_get_returns_304(client, department):
+    first = client.get("/api/v1/departments/")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    unchanged = client.get("/api/v1/departments/", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    client.post("/api/v1/departments/", json={"name": "Sales"})
+    changed = client.get("/api/v1/departments/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_memory_backend_ttl_and_lru():
+    async def scenario():
+        backend = MemoryBackend(max_entries=2)
+        await backend.set("a", "1")
+        await backend.set("b", "2")
+        await backend.get("a")
+        await backend.set("c", "3")
+        assert await backend.get("b") is None  # least recently used
+        assert await backend.get("a") == "1"
+
+        await backend.set("short", "x", ex=1)
+        backend._entries["short"] = ("x", 0)  # force expiry
+        assert await backend.get("short") is None
+
+    asyncio.run(scenario())
+
+
+def test_fill_racing_an_invalidation_is_not_served():
+    async def scenario():
+        cache = ReadThroughCache("test", MemoryBackend(), ttl=60)
+        generation = await cache.generation()
+        assert await cache.get("id:1", generation) is None
+        # A write commits and invalidates while the miss is loading the old row
+        await cache.invalidate()
+        await cache.set("id:1", {"name": "old"}, generation)
+
+        assert await cache.get("id:1") is None
+
+    asyncio.run(scenario())
+
+
+def test_cache_works_with_any_redis_compatible_backend():
+    class FakeRedis:
+        def __init__(self):
+            self.data = {}
+
+        async def get(self, key):
+            return self.data.get(key)
+
+        async def set(self, key, value, ex=None):
+            assert isinstance(value, str)
+            self.data[key] = value
+
+        async def delete(self, *keys):
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+        async def incr(self, key):
+            self.data[key] = str(int(self.data.get(key, 0)) + 1)
+            return int(self.data[key])
+
+    async def scenario():
+        cache = ReadThroughCache("test", FakeRedis(), ttl=60)
+        assert await cache.get("k") is None
+        await cache.set("k", {"id": 1})
+        assert await cache.get("k") == {"id": 1}
+        await cache.invalidate()
+        assert await cache.get("k") is None
+        assert cache.stats()["hits"] == 1
+
+    asyncio.run(scenario())
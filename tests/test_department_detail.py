@@ -0,0 +1,63 @@
+from sqlalchemy import event
+
+from app.database import engine
+from tests.conftest import make_employees
+
+
+def test_department_employees_paginated(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 5, prefix="eng")
+    make_employees(client, other["id"], 2, prefix="sales")
+
+    first = client.get(f"/api/v1/departments/{department['id']}/employees", params={"limit": 3})
+    second = client.get(f"/api/v1/departments/{department['id']}/employees", params={
+        "limit": 3, "cursor": first.headers["X-Next-Cursor"],
+    })
+
+    emails = [emp["email"] for emp in first.json() + second.json()]
+    assert emails == [f"eng{i:04d}@company.com" for i in range(5)]
+    assert client.get("/api/v1/departments/999/employees").status_code == 404
+
+
+def test_include_employees_on_detail_and_list(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 3, prefix="eng")
+    make_employees(client, other["id"], 4, prefix="sales")
+
+    detail = client.get(
+        f"/api/v1/departments/{department['id']}", params={"include": "employees"}
+    ).json()
+    assert len(detail["employees"]) == 3
+
+    statements = []
+    record = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        listing = client.get(
+            "/api/v1/departments/", params={"include": "employees", "employees_limit": 2}
+        ).json()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert [len(d["employees"]) for d in listing] == [2, 2]
+    assert listing[1]["employees"][0]["email"] == "sales0000@company.com"
+    assert len([s for s in statements if "FROM employees" in s]) == 1
+    assert "employees" not in client.get("/api/v1/departments/").json()[0]
+
+
+def test_department_stats(client, department):
+    make_employees(client, department["id"], 2)
+    client.post("/api/v1/employees/", json={
+        "email": "m@company.com", "full_name": "M", "role": "Manager",
+        "is_active": False, "department_id": department["id"],
+    })
+
+    stats = client.get(f"/api/v1/departments/{department['id']}/stats").json()
+
+    assert stats == {
+        "department_id": department["id"],
+        "headcount": 3,
+        "active_count": 2,
+        "inactive_count": 1,
+        "roles": {"Employee": 2, "Manager": 1},
+    }
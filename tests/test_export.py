@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+import tracemalloc
+
+from sqlalchemy import insert
+
+from app.database import engine
+from app.export import export_employees
+from app.models import Employee
+from tests.conftest import make_employees
+
+
+def test_export_ndjson_with_filters(client, department):
+    make_employees(client, department["id"], 3, prefix="keep")
+    make_employees(client, department["id"], 2, prefix="drop")
+
+    response = client.get("/api/v1/employees/export", params={"name": "keep"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["email"] for row in rows] == [f"keep{i:04d}@company.com" for i in range(3)]
+    assert set(rows[0]) == {
+        "id", "email", "full_name", "role", "is_active", "joined_date", "department_id", "manager_id",
+        "updated_at",
+    }
+
+
+def test_export_csv_gzip(client, department):
+    make_employees(client, department["id"], 4)
+
+    response = client.get(
+        "/api/v1/employees/export", params={"format": "csv"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 4
+    assert rows[0]["email"] == "emp0000@company.com"
+    for refused in ("gzip;q=0", "br, gzip; q=0.0", "identity", "*;q=0"):
+        plain = client.get(
+            "/api/v1/employees/export", params={"format": "csv"}, headers={"Accept-Encoding": refused},
+        )
+        assert "content-encoding" not in plain.headers, refused
+        assert plain.content == response.content
+    assert client.get(
+        "/api/v1/employees/export", headers={"Accept-Encoding": "identity, *;q=0.5"}
+    ).headers["content-encoding"] == "gzip"
+
+
+def test_export_memory_stays_bounded(client, department):
+    async def seed(start, count):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Employee), [
+                {"email": f"bulk{i}@company.com", "full_name": f"Bulk {i}",
+                 "department_id": department["id"]}
+                for i in range(start, start + count)
+            ])
+
+    async def peak_export_memory():
+        tracemalloc.start()
+        size = 0
+        async for chunk in export_employees("ndjson"):
+            size += len(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak, size
+
+    client.portal.call(seed, 0, 10_000)
+    small_peak, small_size = client.portal.call(peak_export_memory)
+    client.portal.call(seed, 10_000, 90_000)
+    large_peak, large_size = client.portal.call(peak_export_memory)
+
+    # Ten times the rows must not mean anywhere near ten times the memory
+    assert large_size > 9 * small_size
+    assert large_peak < 2 * small_peak
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal
+from app.models import Employee
+from tests.conftest import make_employees
+
+
+def test_filter_by_department_role_and_active(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 3, prefix="eng")
+    client.post("/api/v1/employees/", json={
+        "email": "lead@company.com", "full_name": "Team Lead", "role": "Manager",
+        "is_active": False, "department_id": other["id"],
+    })
+
+    by_dept = client.get("/api/v1/employees/", params={"department_id": other["id"]}).json()
+    by_role = client.get("/api/v1/employees/", params={"role": "Manager"}).json()
+    active = client.get("/api/v1/employees/", params={"is_active": True}).json()
+
+    assert [emp["email"] for emp in by_dept] == ["lead@company.com"]
+    assert [emp["email"] for emp in by_role] == ["lead@company.com"]
+    assert len(active) == 3
+
+
+def test_name_and_email_prefix_search_is_case_insensitive(client, department):
+    make_employees(client, department["id"], 3, prefix="alice")
+    make_employees(client, department["id"], 2, prefix="bob")
+
+    by_name = client.get("/api/v1/employees/", params={"name": "ALICE 000"}).json()
+    by_email = client.get("/api/v1/employees/", params={"email": "Bob"}).json()
+    wildcard = client.get("/api/v1/employees/", params={"name": "%"}).json()
+
+    assert len(by_name) == 3
+    assert len(by_email) == 2
+    assert wildcard == []
+
+
+def test_joined_date_range(client, department):
+    make_employees(client, department["id"], 2)
+
+    future = client.get("/api/v1/employees/", params={"joined_after": "2999-01-01T00:00:00"})
+    past = client.get("/api/v1/employees/", params={"joined_before": "2999-01-01T00:00:00"})
+
+    assert future.json() == []
+    assert len(past.json()) == 2
+
+
+def test_joined_date_bounds_within_one_second(client, department):
+    ids = [emp["id"] for emp in make_employees(client, department["id"], 4)]
+    at = datetime(2020, 3, 2, 9, 30, 15, tzinfo=timezone.utc)
+
+    async def stamp():
+        """Three hires in the same second, the first exactly on it; the last is left as created"""
+        async with AsyncSessionLocal() as db:
+            for i, offset in enumerate((0, 250_000, 999_999)):
+                await db.execute(
+                    update(Employee).where(Employee.id == ids[i]).values(joined_date=at + timedelta(microseconds=offset))
+                )
+            await db.commit()
+
+    client.portal.call(stamp)
+
+    def joined(**params):
+        response = client.get("/api/v1/employees/", params={key: value.isoformat() for key, value in params.items()})
+        assert response.status_code == 200, response.text
+        return [emp["id"] for emp in response.json()]
+
+    assert joined(joined_after=at, joined_before=at + timedelta(seconds=1)) == ids[:3]
+    assert joined(joined_after=at + timedelta(microseconds=1), joined_before=at + timedelta(seconds=1)) == ids[1:3]
+    assert joined(joined_before=at + timedelta(microseconds=999_999)) == ids[:2]
+    assert joined(joined_before=at) == []
+    # The same bounds written with a UTC offset
+    cest = timezone(timedelta(hours=2))
+    assert joined(joined_after=at.astimezone(cest), joined_before=(at + timedelta(seconds=1)).astimezone(cest)) == ids[:3]
+
+
+def test_fields_projection(client, department):
+    make_employees(client, department["id"], 3)
+
+    response = client.get("/api/v1/employees/", params={"fields": "email", "limit": 2})
+
+    assert response.status_code == 200
+    assert response.json() == [{"email": "emp0000@company.com"}, {"email": "emp0001@company.com"}]
+    assert "X-Next-Cursor" in response.headers
+    assert client.get("/api/v1/employees/", params={"fields": "salary"}).status_code == 400
+
+
+def test_count_applies_filters(client, department):
+    make_employees(client, department["id"], 4)
+
+    response = client.get("/api/v1/employees/count", params={"name": "emp 000"})
+
+    assert response.json() == {"total": 4, "estimated": False}
@@ -0,0 +1,68 @@
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from tests.conftest import DB_PATH
+
+
+def test_health_checks_database(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "healthy"
+    assert body["database"] == "connected"
+    assert 0 <= body["pool_saturation"] <= 1
+
+
+def test_health_reports_unreachable_database(client, monkeypatch):
+    from app import main
+
+    class BrokenEngine:
+        sync_engine = main.get_engine().sync_engine
+
+        def connect(self):
+            raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(main, "get_engine", BrokenEngine)
+
+    response = client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json()["database"] == "unreachable"
+
+
+
+def test_health_times_out_waiting_for_a_connection(client, monkeypatch):
+    from app import main
+
+    small = create_async_engine(
+        f"sqlite+aiosqlite:///{DB_PATH}", poolclass=AsyncAdaptedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=10,
+    )
+    monkeypatch.setattr(main, "get_engine", lambda: small)
+    monkeypatch.setattr(main, "HEALTH_DB_TIMEOUT", 0.2)
+    held = client.portal.call(small.connect().start)
+    try:
+        start = time.monotonic()
+        response = client.get("/health")
+        elapsed = time.monotonic() - start
+    finally:
+        client.portal.call(held.close)
+        client.portal.call(small.dispose)
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "TimeoutError"
+    assert elapsed < 2
+
+
+def test_pool_metrics(client, department):
+    client.get("/api/v1/departments/")
+
+    stats = client.get("/metrics/pool").json()
+
+    assert stats["size"] == 10
+    assert stats["checked_out"] == 0
+    assert stats["wait_seconds"]["count"] >= 1
+    assert stats["wait_seconds"]["buckets"]["+Inf"] == stats["wait_seconds"]["count"]
@@ -0,0 +1,125 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app import history
+from app.database import AsyncSessionLocal
+from tests.conftest import make_employees
+
+
+def moment():
+    """A timestamp strictly between the writes before and after it"""
+    time.sleep(0.01)
+    at = datetime.now(timezone.utc)
+    time.sleep(0.01)
+    return at
+
+
+def snapshot(client):
+    async def take():
+        async with AsyncSessionLocal() as db:
+            return await history.take_snapshot(db)
+
+    return client.portal.call(take)
+
+
+@pytest.fixture
+def snapshot_only(monkeypatch):
+    """Replay no events from before a snapshot, so states must come from it"""
+    monkeypatch.setattr(history, "SNAPSHOT_OVERLAP_SECONDS", 0)
+
+
+def as_of(client, at, **params):
+    response = client.get("/api/v1/employees/", params={"as_of": at.isoformat(), **params})
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_history_records_who_changed_what(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    admin = {"X-Actor": "admin@company.com"}
+    employee = client.post("/api/v1/employees/", headers=admin, json={
+        "email": "ada@company.com", "full_name": "Ada", "role": "Engineer", "department_id": department["id"],
+    }).json()
+    client.patch(f"/api/v1/employees/{employee['id']}", headers=admin, json={"role": "Lead"})
+    client.post("/api/v1/employees/reassign", json={
+        "from_department_id": department["id"], "to_department_id": other["id"],
+    })
+    # A rolled back write leaves no event behind
+    failed = client.patch(f"/api/v1/employees/{employee['id']}", json={"department_id": 999})
+    client.post("/api/v1/employees/deactivate", headers=admin, params={"role": "Lead"})
+    client.delete(f"/api/v1/employees/{employee['id']}", headers=admin)
+
+    events = client.get(f"/api/v1/employees/{employee['id']}/history").json()
+
+    assert failed.status_code == 404
+    assert [event["kind"] for event in events] == ["created", "updated", "updated", "updated", "deleted"]
+    assert events[0]["changes"]["role"] == "Engineer"
+    assert events[0]["actor"] == "admin@company.com"
+    assert events[1]["changes"] == {"role": "Lead"}
+    assert events[1]["previous"] == {"role": "Engineer"}
+    assert events[2]["changes"] == {"department_id": other["id"]}
+    assert events[2]["previous"] == {"department_id": department["id"]}
+    assert events[2]["actor"].startswith("ip:")
+    assert events[3]["changes"] == {"is_active": False}
+    assert events[4]["previous"]["is_active"] is False
+    assert client.get("/api/v1/employees/999/history").status_code == 404
+
+
+def test_bulk_writes_record_events(client, department):
+    body = "\n".join(f'{{"email": "b{i}@company.com", "full_name": "B {i}", "department_id": {department["id"]}}}'
+                     for i in range(3))
+    created = client.post("/api/v1/employees/bulk", content=body,
+                          headers={"Content-Type": "application/x-ndjson"}).json()
+    client.delete(f"/api/v1/departments/{department['id']}")
+
+    for result in created["results"]:
+        events = client.get(f"/api/v1/employees/{result['id']}/history").json()
+        assert [event["kind"] for event in events] == ["created", "deleted"]
+
+
+def test_as_of_rebuilds_past_states(client, department, snapshot_only):
+    before_anyone = moment()
+    ada, bob, cy = make_employees(client, department["id"], 3)
+    after_hiring = moment()
+    client.patch(f"/api/v1/employees/{ada['id']}", json={"role": "Lead"})
+    snapshot(client)
+    after_snapshot = moment()
+    client.delete(f"/api/v1/employees/{bob['id']}")
+    client.patch(f"/api/v1/employees/{cy['id']}", json={"is_active": False})
+    now = moment()
+
+    assert as_of(client, before_anyone).json() == []
+    hired = as_of(client, after_hiring).json()
+    assert [(e["id"], e["role"]) for e in hired] == [(ada["id"], "Employee"), (bob["id"], "Employee"),
+                                                     (cy["id"], "Employee")]
+    assert hired[0]["email"] == ada["email"]
+    assert hired[0]["joined_date"] is not None
+    assert [(e["id"], e["role"]) for e in as_of(client, after_snapshot).json()] == [
+        (ada["id"], "Lead"), (bob["id"], "Employee"), (cy["id"], "Employee"),
+    ]
+    assert [(e["id"], e["is_active"]) for e in as_of(client, now).json()] == [
+        (ada["id"], True), (cy["id"], False),
+    ]
+    active = as_of(client, now, is_active=True, fields="id,role").json()
+    assert active == [{"id": ada["id"], "role": "Lead"}]
+
+
+def test_as_of_pages_with_cursor(client, department, snapshot_only):
+    employees = make_employees(client, department["id"], 5)
+    snapshot(client)
+    make_employees(client, department["id"], 2, prefix="late")
+    at = moment()
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = as_of(client, at, **params)
+        seen += [employee["id"] for employee in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == [employee["id"] for employee in employees] + [employees[-1]["id"] + 1, employees[-1]["id"] + 2]
+    assert client.get("/api/v1/employees/", params={"as_of": at.isoformat(), "sort": "email"}).status_code == 400
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Request
+
+from app.http_cache import versions_etag
+from app.schemas import DepartmentResponse
+from app.routers import employees as employees_router
+from tests.conftest import make_employees
+
+
+def test_large_responses_are_gzipped(client, department):
+    make_employees(client, department["id"], 30)
+
+    large = client.get("/api/v1/employees/", headers={"Accept-Encoding": "gzip"})
+    small = client.get(f"/api/v1/departments/{department['id']}", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/api/v1/employees/", headers={"Accept-Encoding": "identity"})
+    refused = client.get("/api/v1/employees/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in large.headers["vary"].lower()
+    assert len(large.json()) == 30
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in plain.headers
+    assert "content-encoding" not in refused.headers
+
+
+def test_unchanged_list_page_is_not_reserialized(client, department, monkeypatch):
+    make_employees(client, department["id"], 5)
+    first = client.get("/api/v1/employees/", params={"limit": 3})
+    etag = first.headers["ETag"]
+
+    calls = []
+    original = employees_router.rows_to_dicts
+    monkeypatch.setattr(employees_router, "rows_to_dicts", lambda *a: calls.append(a) or original(*a))
+
+    unchanged = client.get("/api/v1/employees/", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert calls == []
+
+    other_fields = client.get(
+        "/api/v1/employees/", params={"limit": 3, "fields": "id"}, headers={"If-None-Match": etag}
+    )
+    assert other_fields.status_code == 200
+
+
+def test_list_etag_tracks_updates_and_deletes(client, department):
+    employees = make_employees(client, department["id"], 3)
+
+    def etag():
+        return client.get("/api/v1/employees/").headers["ETag"]
+
+    seen = [etag()]
+    client.patch(f"/api/v1/employees/{employees[0]['id']}", json={"role": "Lead"})
+    seen.append(etag())
+    client.post("/api/v1/employees/deactivate", params={"role": "Lead"})
+    seen.append(etag())
+    client.delete(f"/api/v1/employees/{employees[2]['id']}")
+    seen.append(etag())
+
+    assert len(set(seen)) == 4
+
+
+def test_detail_last_modified(client, department):
+    employee = make_employees(client, department["id"], 1)[0]
+    url = f"/api/v1/employees/{employee['id']}"
+
+    first = client.get(url)
+    last_modified = first.headers["Last-Modified"]
+    assert last_modified.endswith("GMT")
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    client.patch(url, json={"full_name": "Renamed"})
+    changed = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert changed.json()["full_name"] == "Renamed"
+    assert changed.json()["updated_at"] > employee["updated_at"]
+
+
+def test_department_detail_validators(client, department):
+    url = f"/api/v1/departments/{department['id']}"
+    first = client.get(url)
+    embedded = client.get(url, params={"include": "employees"})
+
+    assert "Last-Modified" in first.headers
+    assert "Last-Modified" not in embedded.headers
+
+    make_employees(client, department["id"], 1)
+    # A new employee changes the embedded view but not the department itself
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    refreshed = client.get(
+        url, params={"include": "employees"}, headers={"If-None-Match": embedded.headers["ETag"]}
+    )
+    assert refreshed.status_code == 200
+    assert len(refreshed.json()["employees"]) == 1
+
+
+
+def test_etag_ignores_how_the_time_zone_is_represented():
+    request = Request({"type": "http", "query_string": b"", "headers": [], "path": "/"})
+    stored = datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc)
+    # What a row rebuilt from a serialized cache entry carries: pydantic's own TzInfo
+    cached = DepartmentResponse(id=1, name="Engineering", updated_at=stored.isoformat()).updated_at
+    naive = stored.replace(tzinfo=None)
+
+    assert repr(cached) != repr(stored)
+    assert len({versions_etag(request, [(1, when)]) for when in (stored, cached, naive)}) == 1
+    assert versions_etag(request, [(1, stored)]) != versions_etag(request, [(1, stored + timedelta(microseconds=1))])
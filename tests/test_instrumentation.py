@@ -0,0 +1,44 @@
+import os
+
+from app import instrumentation
+from app.instrumentation import route_metrics
+
+
+def test_metrics_endpoint_reports_route_latency_and_sql(client, department):
+    route_metrics.reset()
+    client.get(f"/api/v1/departments/{department['id']}/stats")
+    client.get(f"/api/v1/departments/{department['id']}/stats")
+
+    body = client.get("/metrics").text
+
+    route = 'method="GET",route="/api/v1/departments/{department_id}/stats"'
+    assert f'hrms_http_request_duration_seconds_count{{{route}}} 2' in body
+    assert f'hrms_http_requests_total{{{route},status="200"}} 2' in body
+    # Department lookup is cached after the first call; the GROUP BY runs each time
+    assert f'hrms_db_statements_total{{{route}}} 3' in body
+    assert "# TYPE hrms_db_pool_wait_seconds histogram" in body
+    assert 'hrms_cache_hits_total{cache="departments"}' in body
+
+
+def test_slow_queries_and_requests_are_logged(client, department, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_SECONDS", 0)
+    monkeypatch.setattr(instrumentation, "SLOW_REQUEST_SECONDS", 0)
+
+    with caplog.at_level("WARNING", logger="app.instrumentation"):
+        client.get("/api/v1/employees/")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(m.startswith("Slow query") and "FROM employees" in m for m in messages)
+    assert any(m.startswith("Slow request GET /api/v1/employees/") for m in messages)
+
+
+def test_header_triggered_profile(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(instrumentation, "PROFILING", "header")
+    monkeypatch.setattr(instrumentation, "PROFILE_DIR", str(tmp_path))
+
+    plain = client.get("/api/v1/departments/")
+    profiled = client.get("/api/v1/departments/", headers={"X-Profile": "1"})
+
+    assert "x-profile-id" not in plain.headers
+    profile_id = profiled.headers["x-profile-id"]
+    assert os.path.exists(tmp_path / f"{profile_id}.txt")
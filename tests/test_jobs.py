@@ -0,0 +1,172 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from app import jobs, main
+from app.database import AsyncSessionLocal
+from app.models import Job
+from tests.conftest import DB_PATH, make_employees
+
+
+def run_jobs(client, concurrency=1):
+    """Run every queued job, as a worker process would"""
+    return client.portal.call(jobs.Worker(concurrency, name="test").drain)
+
+
+def job(client, job_id):
+    response = client.get(f"/api/v1/jobs/{job_id}")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_import_job(client, department):
+    body = "\n".join([
+        f'{{"email": "a@company.com", "full_name": "A", "department_id": {department["id"]}}}',
+        '{"email": "not-an-email", "full_name": "B"}',
+        f'{{"email": "c@company.com", "full_name": "C", "department_id": {department["id"]}}}',
+    ])
+    queued = client.post(
+        "/api/v1/jobs/employees/import", content=body,
+        headers={"Content-Type": "application/x-ndjson", "X-Actor": "hr@company.com"},
+    )
+
+    assert queued.status_code == 202
+    assert queued.json()["status"] == "queued"
+    assert queued.json()["progress"] == 0
+    assert queued.headers["Location"].endswith(f"/api/v1/jobs/{queued.json()['id']}")
+    assert client.get("/api/v1/employees/count").json()["total"] == 0
+
+    assert run_jobs(client) == 1
+    done = job(client, queued.json()["id"])
+    artifact = client.get(done["artifact_url"])
+
+    assert done["status"] == "succeeded"
+    assert done["progress"] == 100
+    assert (done["processed"], done["total"], done["attempts"]) == (3, 3, 1)
+    assert done["result"] == {"created": 2, "failed": 1, "committed": True}
+    assert [row["status"] for row in artifact.json()["results"]] == ["created", "error", "created"]
+    created = client.get(f"/api/v1/employees/{artifact.json()['results'][0]['id']}/history").json()
+    assert created[0]["actor"] == "hr@company.com"
+    bad = client.post("/api/v1/jobs/employees/import", content="{", headers={"Content-Type": "application/json"})
+    assert bad.status_code == 400
+
+
+def test_export_job(client, department):
+    make_employees(client, department["id"], 5)
+    client.post("/api/v1/employees/deactivate", params={"email": "emp0000"})
+    queued = client.post("/api/v1/jobs/employees/export", params={"format": "csv", "is_active": True}).json()
+
+    run_jobs(client)
+    done = job(client, queued["id"])
+    gzipped = client.get(done["artifact_url"], headers={"Accept-Encoding": "gzip"})
+    plain = client.get(done["artifact_url"], headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert done["result"] == {"rows": 4}
+    assert (done["processed"], done["total"]) == (4, 4)
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert 'filename="employees.csv"' in gzipped.headers["content-disposition"]
+    lines = plain.text.splitlines()
+    assert "content-encoding" not in plain.headers
+    assert lines[0].startswith("id,email,")
+    assert [line.split(",")[1] for line in lines[1:]] == [f"emp{i:04d}@company.com" for i in range(1, 5)]
+    # httpx decodes the gzipped body
+    assert gzipped.content == plain.content
+    assert client.get("/api/v1/jobs/999").status_code == 404
+    assert client.get("/api/v1/jobs/999/artifact").status_code == 404
+
+
+def test_reassign_job_moves_in_batches(client, department, monkeypatch):
+    monkeypatch.setattr(jobs, "REASSIGN_BATCH_SIZE", 2)
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 5)
+    body = {"from_department_id": department["id"], "to_department_id": other["id"]}
+
+    queued = client.post("/api/v1/jobs/employees/reassign", json=body).json()
+    missing = client.post("/api/v1/jobs/employees/reassign", json={**body, "to_department_id": 999})
+    run_jobs(client)
+    done = job(client, queued["id"])
+
+    assert done["status"] == "succeeded"
+    assert done["result"] == {"affected": 5}
+    assert done["artifact_url"] is None
+    assert missing.status_code == 404
+    moved = client.get("/api/v1/employees/", params={"department_id": other["id"]}).json()
+    assert len(moved) == 5
+
+
+def test_failed_job_reports_error(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 2)
+    queued = client.post("/api/v1/jobs/employees/reassign", json={
+        "from_department_id": department["id"], "to_department_id": other["id"],
+    }).json()
+    # The target goes away before a worker gets to the job
+    client.delete(f"/api/v1/departments/{other['id']}")
+
+    run_jobs(client)
+    done = job(client, queued["id"])
+
+    assert done["status"] == "failed"
+    assert "FOREIGN KEY" in done["error"]
+    assert done["finished_at"] is not None
+
+
+def test_claim_skips_locked_jobs():
+    sql = str(jobs.claim_statement("worker", datetime.now(timezone.utc)).compile(dialect=postgresql.dialect()))
+
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_concurrent_workers_run_each_job_once(client, department):
+    ids = [client.post("/api/v1/jobs/employees/export").json()["id"] for _ in range(6)]
+
+    assert run_jobs(client, concurrency=3) == 6
+    finished = [job(client, job_id) for job_id in ids]
+
+    assert all(done["status"] == "succeeded" and done["attempts"] == 1 for done in finished)
+    assert run_jobs(client, concurrency=3) == 0
+
+
+def test_jobs_of_lost_workers_run_again(client, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 2)
+    first, second = (client.post("/api/v1/jobs/employees/export").json()["id"] for _ in range(2))
+
+    async def crash(attempts):
+        """Claim both jobs for a worker that then goes quiet"""
+        async with AsyncSessionLocal() as db:
+            await jobs.claim(db, "crashed")
+            await jobs.claim(db, "crashed")
+            stale = datetime.now(timezone.utc) - timedelta(seconds=jobs.JOB_LEASE_SECONDS + 1)
+            await db.execute(update(Job).values(heartbeat_at=stale))
+            await db.execute(update(Job).where(Job.id == second).values(attempts=attempts))
+            await db.commit()
+            return await jobs.requeue_expired(db)
+
+    assert client.portal.call(crash, 2) == 1
+    assert job(client, second)["status"] == "failed"
+    assert job(client, second)["error"] == "Worker stopped responding"
+    assert job(client, first)["status"] == "queued"
+
+    run_jobs(client)
+
+    assert job(client, first)["status"] == "succeeded"
+    assert job(client, first)["attempts"] == 2
+
+
+def test_api_process_runs_jobs(monkeypatch):
+    monkeypatch.setattr(main, "JOB_WORKERS", 2)
+    monkeypatch.setattr(jobs, "JOB_POLL_SECONDS", 0.01)
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    with TestClient(main.app) as client:
+        job_id = client.post("/api/v1/jobs/employees/export").json()["id"]
+        deadline = time.monotonic() + 10
+        while job(client, job_id)["status"] != "succeeded" and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert job(client, job_id)["status"] == "succeeded"
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app import main
+from app.database import Base
+from app.migrate import alembic_config, head_revision, include_object_for
+from tests.conftest import DB_PATH, wait_until_started
+
+
+@pytest.fixture
+def empty_db():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+
+def upgrade_to_head():
+    config = alembic_config()
+    config.attributes["configure_logging"] = False
+    command.upgrade(config, "head")
+
+
+def test_migrations_match_models(empty_db):
+    upgrade_to_head()
+
+    engine = create_engine(f"sqlite:///{DB_PATH}")
+    try:
+        with engine.connect() as conn:
+            context = MigrationContext.configure(
+                conn, opts={"include_object": include_object_for("sqlite")}
+            )
+            assert context.get_current_revision() == head_revision()
+            assert compare_metadata(context, Base.metadata) == []
+    finally:
+        engine.dispose()
+
+
+def test_verify_startup_requires_migrations(empty_db, monkeypatch):
+    monkeypatch.setattr(main, "SCHEMA_STARTUP", "verify")
+
+    with TestClient(main.app) as client:
+        response = wait_until_started(client)
+        assert response.status_code == 503
+        assert response.json()["status"] == "failed"
+        assert "expected" in response.json()["checks"]["schema"]
+
+    upgrade_to_head()
+    with TestClient(main.app) as client:
+        assert wait_until_started(client).status_code == 200
+        assert client.get("/api/v1/departments/").status_code == 200
@@ -0,0 +1,116 @@
+import pytest
+
+from tests.test_updates import record_statements
+
+
+@pytest.fixture
+def org(client, department):
+    """ceo <- vp_a <- lead <- (dev1, dev2); ceo <- vp_b"""
+    people = {}
+
+    def hire(name, manager=None):
+        response = client.post("/api/v1/employees/", json={
+            "email": f"{name}@company.com", "full_name": name, "department_id": department["id"],
+            "manager_id": people[manager]["id"] if manager else None,
+        })
+        assert response.status_code == 201, response.text
+        people[name] = response.json()
+
+    hire("ceo")
+    hire("vp_a", "ceo")
+    hire("vp_b", "ceo")
+    hire("lead", "vp_a")
+    hire("dev1", "lead")
+    hire("dev2", "lead")
+    return {name: person["id"] for name, person in people.items()}
+
+
+def names(response):
+    assert response.status_code == 200, response.text
+    return [(row["full_name"], row["depth"]) for row in response.json()]
+
+
+def test_reports_subtree_and_chain(client, org):
+    reports = client.get(f"/api/v1/employees/{org['ceo']}/reports").json()
+    subtree = client.get(f"/api/v1/employees/{org['vp_a']}/subtree")
+    shallow = client.get(f"/api/v1/employees/{org['ceo']}/subtree", params={"max_depth": 1})
+    chain = client.get(f"/api/v1/employees/{org['dev2']}/chain")
+
+    assert [row["full_name"] for row in reports] == ["vp_a", "vp_b"]
+    assert names(subtree) == [("lead", 1), ("dev1", 2), ("dev2", 2)]
+    assert subtree.json()[0]["manager_id"] == org["vp_a"]
+    assert names(shallow) == [("vp_a", 1), ("vp_b", 1)]
+    assert names(chain) == [("lead", 1), ("vp_a", 2), ("ceo", 3)]
+    assert client.get(f"/api/v1/employees/{org['ceo']}/chain").json() == []
+    projected = client.get(f"/api/v1/employees/{org['lead']}/subtree", params={"fields": "id"}).json()
+    assert projected == [{"id": org["dev1"], "depth": 1}, {"id": org["dev2"], "depth": 1}]
+    assert client.get("/api/v1/employees/999/subtree").status_code == 404
+
+
+def test_subtree_is_one_query(client, org):
+    statements, stop = record_statements()
+    try:
+        response = client.get(f"/api/v1/employees/{org['ceo']}/subtree", params={"fields": "id"})
+    finally:
+        stop()
+
+    assert len(response.json()) == 5
+    assert statements == ["WITH"]
+
+
+def test_cycles_are_rejected(client, org):
+    under_own_report = client.patch(f"/api/v1/employees/{org['vp_a']}", json={"manager_id": org["dev1"]})
+    own_manager = client.patch(f"/api/v1/employees/{org['lead']}", json={"manager_id": org["lead"]})
+    unknown = client.patch(f"/api/v1/employees/{org['lead']}", json={"manager_id": 999})
+    moved = client.patch(f"/api/v1/employees/{org['lead']}", json={"manager_id": org["vp_b"]})
+
+    assert under_own_report.status_code == 400
+    assert own_manager.status_code == 400
+    assert unknown.status_code == 404
+    assert unknown.json()["detail"] == "Manager with id 999 not found"
+    assert moved.status_code == 200
+    assert names(client.get(f"/api/v1/employees/{org['dev1']}/chain")) == [("lead", 1), ("vp_b", 2), ("ceo", 3)]
+    # Moving to the top of the chart
+    assert client.patch(f"/api/v1/employees/{org['vp_b']}", json={"manager_id": None}).json()["manager_id"] is None
+
+
+
+def test_manager_too_deep_to_check_is_rejected(client, org, monkeypatch):
+    from app import crud
+    monkeypatch.setattr(crud, "MAX_REPORTING_DEPTH", 2)
+
+    # dev1 -> lead -> vp_a -> ceo: the walk stops at vp_a without seeing the top
+    too_deep = client.patch(f"/api/v1/employees/{org['vp_b']}", json={"manager_id": org["dev1"]})
+    # lead -> vp_a -> ceo reaches the top within the limit
+    within = client.patch(f"/api/v1/employees/{org['vp_b']}", json={"manager_id": org["lead"]})
+
+    assert too_deep.status_code == 400
+    assert "levels" in too_deep.json()["detail"]
+    assert within.status_code == 200
+
+
+def test_deleting_a_manager_detaches_reports(client, org):
+    assert client.delete(f"/api/v1/employees/{org['lead']}").status_code == 204
+
+    dev1 = client.get(f"/api/v1/employees/{org['dev1']}").json()
+    events = client.get(f"/api/v1/employees/{org['dev1']}/history").json()
+
+    assert dev1["manager_id"] is None
+    assert events[-1]["changes"] == {"manager_id": None}
+    assert events[-1]["previous"] == {"manager_id": org["lead"]}
+    assert names(client.get(f"/api/v1/employees/{org['vp_a']}/subtree")) == []
+
+
+def test_bulk_import_checks_managers(client, department, org):
+    body = (
+        f'{{"email": "new1@company.com", "full_name": "New 1", "department_id": {department["id"]},'
+        f' "manager_id": {org["dev1"]}}}\n'
+        f'{{"email": "new2@company.com", "full_name": "New 2", "department_id": {department["id"]},'
+        f' "manager_id": 999}}'
+    )
+    result = client.post(
+        "/api/v1/employees/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+    ).json()
+
+    assert [row["status"] for row in result["results"]] == ["created", "error"]
+    assert result["results"][1]["error"] == "Manager with id 999 not found"
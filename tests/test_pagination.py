@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal
+from app.models import Employee
+from app.pagination import encode_cursor
+from app.schemas import EmployeeFilter
+from tests.conftest import make_employees
+
+
+def page_ids(client, sort, limit):
+    """Ids of every employee, following cursors page by page"""
+    seen = []
+    params = {"limit": limit, "sort": sort}
+    for _ in range(20):
+        response = client.get("/api/v1/employees/", params=params)
+        assert response.status_code == 200, response.text
+        seen.extend(emp["id"] for emp in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+        params = {"limit": limit, "sort": sort, "cursor": cursor}
+    raise AssertionError(f"paging by {sort} never ended: {seen}")
+
+
+def test_cursor_pages_cover_all_rows_once(client, department):
+    make_employees(client, department["id"], 25)
+
+    seen = []
+    params = {"limit": 10}
+    while True:
+        response = client.get("/api/v1/employees/", params=params)
+        assert response.status_code == 200
+        seen.extend(emp["id"] for emp in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 10, "cursor": cursor}
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 25
+
+
+def test_cursor_with_descending_sort_column(client, department):
+    make_employees(client, department["id"], 7)
+
+    first = client.get("/api/v1/employees/", params={"limit": 4, "sort": "-full_name"})
+    second = client.get("/api/v1/employees/", params={
+        "limit": 4, "sort": "-full_name", "cursor": first.headers["X-Next-Cursor"],
+    })
+
+    names = [emp["full_name"] for emp in first.json() + second.json()]
+    assert names == sorted(names, reverse=True)
+    assert len(names) == 7
+    assert "X-Next-Cursor" not in second.headers
+
+
+
+def test_cursor_by_joined_date_with_shared_timestamps(client, department):
+    ids = [emp["id"] for emp in make_employees(client, department["id"], 7)]
+    same_second = datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc)
+
+    async def stamp():
+        """Employees hired in the same instant (all but the last two)"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Employee).where(Employee.id.in_(ids[:5])).values(joined_date=same_second))
+            await db.commit()
+
+    client.portal.call(stamp)
+
+    assert page_ids(client, "joined_date", 3) == ids
+    assert page_ids(client, "-joined_date", 3) == ids[::-1]
+    assert page_ids(client, "joined_date", 2) == ids
+
+
+def test_skip_limit_still_supported(client, department):
+    make_employees(client, department["id"], 5)
+
+    response = client.get("/api/v1/employees/", params={"skip": 3, "limit": 10})
+
+    assert [emp["email"] for emp in response.json()] == [
+        "emp0003@company.com", "emp0004@company.com",
+    ]
+
+
+def test_invalid_cursor_and_sort_rejected(client, department):
+    assert client.get("/api/v1/employees/", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/v1/employees/", params={"sort": "salary"}).status_code == 400
+
+    make_employees(client, department["id"], 2)
+    cursor = client.get("/api/v1/employees/", params={"limit": 1}).headers["X-Next-Cursor"]
+    mismatched = client.get("/api/v1/employees/", params={"cursor": cursor, "sort": "email"})
+    assert mismatched.status_code == 400
+    for sort, value in (("joined_date", 20240101), ("joined_date", "yesterday"), ("email", ["a"]), ("id", "1")):
+        wrong_type = client.get("/api/v1/employees/", params={"cursor": encode_cursor(sort, value, 1), "sort": sort})
+        assert wrong_type.status_code == 400, (sort, value)
+
+
+def test_count_endpoint(client, department):
+    make_employees(client, department["id"], 3)
+
+    response = client.get("/api/v1/employees/count", params={"exact": True})
+
+    assert response.status_code == 200
+    assert response.json() == {"total": 3, "estimated": False}
+
+
+def test_filtered_counts_cached_are_bounded(client, department, monkeypatch):
+    from app import crud
+    monkeypatch.setattr(crud, "EMPLOYEE_COUNT_CACHE_SIZE", 5)
+    make_employees(client, department["id"], 3)
+
+    for i in range(20):
+        client.get("/api/v1/employees/count", params={"name": f"prefix{i}"})
+    kept = client.get("/api/v1/employees/count", params={"name": "Emp"})
+
+    assert kept.json()["total"] == 3
+    assert len(crud._employee_count_cache) == 5
+    assert next(reversed(crud._employee_count_cache)) == EmployeeFilter(name="Emp").model_dump_json()
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from app.metrics import pool_waiting
+from app.ratelimit import MemoryRateLimitBackend, admission, parse_route_limits
+
+
+@pytest.fixture
+def limits(client):
+    """The app's admission rules, restored and zeroed after the test"""
+    admission.reset()
+    yield admission
+    admission.reset()
+
+
+def test_token_bucket_allows_burst_then_refills():
+    now = [0.0]
+    backend = MemoryRateLimitBackend(clock=lambda: now[0])
+
+    async def take():
+        return await backend.take("client", rate=2, burst=3)
+
+    async def scenario():
+        granted = [await take() for _ in range(3)]
+        refused = await take()
+        now[0] += 0.5  # one token back at 2/s
+        refilled = await take()
+        return granted, refused, refilled
+
+    granted, refused, refilled = asyncio.run(scenario())
+    assert granted == [0.0, 0.0, 0.0]
+    assert refused == pytest.approx(0.5)
+    assert refilled == 0.0
+
+
+def test_rate_limit_is_per_client(client, limits, monkeypatch):
+    monkeypatch.setattr(limits, "backend", MemoryRateLimitBackend())
+    monkeypatch.setattr(limits, "rate", 0.1)
+    monkeypatch.setattr(limits, "burst", 2)
+    batch = {"X-API-Key": "batch-job"}
+
+    statuses = [client.get("/api/v1/departments/", headers=batch).status_code for _ in range(3)]
+    other = client.get("/api/v1/departments/", headers={"X-API-Key": "frontend"})
+    limited = client.get("/api/v1/departments/", headers=batch)
+
+    assert statuses == [200, 200, 429]
+    assert other.status_code == 200
+    assert int(limited.headers["Retry-After"]) >= 1
+    # Health and metrics are never limited
+    assert client.get("/health", headers=batch).status_code == 200
+    assert "hrms_rate_limited_total" in client.get("/metrics").text
+    assert client.get("/metrics/limits").json()["limited"] == {"GET /api/v1/departments/": 2}
+
+
+def test_full_route_fails_fast(client, limits, monkeypatch):
+    monkeypatch.setattr(limits, "route_limits", {"GET /api/v1/employees/": 1})
+    limits.in_flight["GET /api/v1/employees/"] = 1
+
+    busy = client.get("/api/v1/employees/")
+    other_route = client.get("/api/v1/departments/")
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+    assert other_route.status_code == 200
+    assert limits.stats()["shed"] == {"GET /api/v1/employees/ (concurrency)": 1}
+
+
+def test_requests_are_shed_when_pool_queue_is_long(client, limits, monkeypatch):
+    monkeypatch.setattr(limits, "shed_threshold", 3)
+    pool_waiting.inc(3)
+    try:
+        shed = client.get("/api/v1/employees/1")
+    finally:
+        pool_waiting.dec(3)
+
+    assert shed.status_code == 503
+    assert 'hrms_shed_total{route="GET /api/v1/employees/{employee_id}",reason="pool"} 1' in client.get("/metrics").text
+    assert client.get("/api/v1/employees/1").status_code == 404
+
+
+def test_parse_route_limits():
+    assert parse_route_limits("GET  /api/v1/employees/export=2, POST /api/v1/employees/bulk=1,") == {
+        "GET /api/v1/employees/export": 2,
+        "POST /api/v1/employees/bulk": 1,
+    }
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import insert
+
+from app import main, replicas
+from app.database import Base, engine, make_engine
+from app.models import Department, Employee
+from app.replicas import ReplicaSet
+
+
+def replica_with(department_name):
+    """A second SQLite database standing in for a replica, holding one employee"""
+    path = os.path.join(tempfile.mkdtemp(prefix="hrms-replica-"), "replica.db")
+    replica = make_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def setup():
+        async with replica.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Department).values(id=1, name=department_name))
+            await conn.execute(insert(Employee).values(
+                email="replica@company.com", full_name="On Replica", department_id=1,
+            ))
+        # The app's event loop opens its own connections
+        await replica.dispose()
+
+    asyncio.run(setup())
+    return replica
+
+
+@pytest.fixture
+def use_replicas(client, monkeypatch):
+    def configure(*replica_engines):
+        replica_set = ReplicaSet(engine, list(replica_engines))
+        monkeypatch.setattr(replicas, "replica_set", replica_set)
+        monkeypatch.setattr(main, "replica_set", replica_set)
+        return replica_set
+
+    yield configure
+    client.portal.call(replicas.replica_set.dispose)
+
+
+def emails(client, **kwargs):
+    return [e["email"] for e in client.get("/api/v1/employees/", **kwargs).json()]
+
+
+def test_reads_go_to_replica_and_writes_to_primary(client, department, use_replicas):
+    use_replicas(replica_with("Replica Engineering"))
+
+    assert emails(client) == ["replica@company.com"]
+
+    created = client.post("/api/v1/employees/", json={
+        "email": "new@company.com", "full_name": "New Hire", "department_id": department["id"],
+    })
+    assert created.status_code == 201
+    assert "read_primary=1" in created.headers["set-cookie"]
+    # Pinned to the primary right after the write, so the new row is visible
+    assert emails(client) == ["new@company.com"]
+
+    client.cookies.clear()
+    assert emails(client) == ["replica@company.com"]
+    assert emails(client, headers={"X-Read-Primary": "1"}) == ["new@company.com"]
+
+
+def test_unreachable_replica_falls_back_to_primary(client, department, use_replicas):
+    missing_dir = os.path.join(tempfile.mkdtemp(prefix="hrms-replica-"), "gone")
+    replica_set = use_replicas(make_engine(f"sqlite+aiosqlite:///{missing_dir}/replica.db"))
+    client.post("/api/v1/employees/", json={
+        "email": "primary@company.com", "full_name": "On Primary", "department_id": department["id"],
+    })
+    client.cookies.clear()
+
+    response = client.get("/api/v1/employees/")
+
+    assert [e["email"] for e in response.json()] == ["primary@company.com"]
+    assert replica_set.healthy() == []
+    health = client.get("/health").json()
+    assert health["status"] == "degraded"
+    assert health["replicas"][0]["healthy"] is False
+
+
+def test_health_check_restores_replica(client, use_replicas):
+    replica = replica_with("Replica Engineering")
+    replica_set = use_replicas(replica)
+    replica_set.mark_down(replica, "connection refused")
+    assert replica_set.pick() is engine
+
+    client.portal.call(replica_set.check_all)
+
+    assert replica_set.pick() is replica
+    assert client.get("/health").json()["replicas"][0]["healthy"] is True
+
+
+def test_replica_reads_do_not_fill_the_department_cache(client, department, use_replicas):
+    use_replicas(replica_with("Replica Engineering"))
+
+    from_replica = client.get("/api/v1/departments/1")
+    from_primary = client.get("/api/v1/departments/1", headers={"X-Read-Primary": "1"})
+
+    assert from_replica.json()["name"] == "Replica Engineering"
+    assert from_primary.json()["name"] == department["name"]
+    # The primary's read filled the cache, which replicas are then served from too
+    assert client.get("/api/v1/departments/1").json()["name"] == department["name"]
+
+
+def test_batch_get_reads_from_replica_without_pinning(client, department, use_replicas):
+    use_replicas(replica_with("Replica Engineering"))
+    client.post("/api/v1/employees/", json={
+        "email": "new@company.com", "full_name": "New Hire", "department_id": department["id"],
+    })
+    client.cookies.clear()
+
+    response = client.post("/api/v1/employees/batch-get", json={"ids": [1]})
+
+    assert [e["email"] for e in response.json()["employees"]] == ["replica@company.com"]
+    assert "set-cookie" not in response.headers
+    assert emails(client) == ["replica@company.com"]
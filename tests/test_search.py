@@ -0,0 +1,100 @@
+import asyncio
+
+from app.search import TrigramIndex, trigrams
+
+
+def create(client, department_id, email, full_name, role="Employee"):
+    response = client.post("/api/v1/employees/", json={
+        "email": email, "full_name": full_name, "role": role, "department_id": department_id,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def search(client, q, **params):
+    response = client.get("/api/v1/employees/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_trigrams_pad_word_starts_only():
+    assert trigrams("Ali") == {"  a", " al", "ali"}
+    assert trigrams("a.b") == {"  a", "  b"}
+
+
+def test_index_tolerates_typos_and_ranks_names_first():
+    index = TrigramIndex(min_similarity=0.5)
+    index.add(1, "Alice Johnson", "ajohnson@company.com", "Engineer")
+    index.add(2, "Bob Smith", "alice.fan@company.com", "Engineer")
+    index.add(3, "Carol White", "carol@company.com", "Alice Liaison")
+
+    assert [employee_id for employee_id, _ in index.search("alice")] == [1, 2, 3]
+    assert index.search("jonson")[0][0] == 1
+    assert index.search("zzz") == []
+
+
+def test_index_remove_and_replace():
+    index = TrigramIndex()
+    index.add(1, "Alice Johnson", "alice@company.com", "Engineer")
+    index.add(1, "Alice Smith", "alice@company.com", "Manager")
+
+    assert index.search("johnson") == []
+    assert index.search("manager")[0][0] == 1
+    index.remove(1)
+    assert index.search("alice") == [] and len(index) == 0
+
+
+
+def test_writes_during_the_load_are_applied_after_it():
+    index = TrigramIndex()
+    index.track_add(9, "Before Load", "before@company.com", "Engineer")
+
+    async def load():
+        yield [(1, "Alice Johnson", "alice@company.com", "Engineer")]
+        # Committed while the load is between batches: one row it already
+        # read changes, one it has yet to read goes away, one is new
+        index.track_add(1, "Alice Smith", "alice@company.com", "Engineer")
+        index.track_remove(2)
+        index.track_add(3, "Carol White", "carol@company.com", "Manager")
+        yield [(2, "Bob Smith", "bob@company.com", "Engineer")]
+
+    asyncio.run(index.ensure_loaded(load))
+
+    assert index.loaded
+    assert index.search("johnson") == [] and index.search("smith")[0][0] == 1
+    assert index.search("bob") == []
+    assert index.search("carol")[0][0] == 3
+    # Writes before any load are left to the load itself
+    assert index.search("before") == []
+
+
+def test_search_endpoint(client, department):
+    alice = create(client, department["id"], "alice.johnson@company.com", "Alice Johnson")
+    create(client, department["id"], "bob@company.com", "Bob Smith", role="Recruiter")
+
+    results = search(client, "alic")
+    assert [r["id"] for r in results] == [alice["id"]]
+    assert results[0]["email"] == alice["email"]
+    assert results[0]["score"] == 1.0
+    assert search(client, "recruter")[0]["full_name"] == "Bob Smith"
+    assert client.get("/api/v1/employees/search", params={"q": ""}).status_code == 422
+
+
+def test_search_follows_writes(client, department):
+    employee = create(client, department["id"], "dana@company.com", "Dana Scully")
+    assert search(client, "scully")
+
+    client.patch(f"/api/v1/employees/{employee['id']}", json={"full_name": "Dana Mulder"})
+    assert search(client, "scully") == []
+    assert search(client, "mulder")[0]["id"] == employee["id"]
+
+    client.post("/api/v1/employees/bulk", json=[
+        {"email": "fox@company.com", "full_name": "Fox Mulder", "department_id": department["id"]},
+    ])
+    assert len(search(client, "mulder")) == 2
+
+    client.delete(f"/api/v1/employees/{employee['id']}")
+    assert [r["full_name"] for r in search(client, "mulder")] == ["Fox Mulder"]
+
+    client.delete(f"/api/v1/departments/{department['id']}")
+    assert search(client, "mulder") == []
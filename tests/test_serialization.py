@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, timezone
+
+from app.schemas import EmployeeResponse
+from app.serialization import FastJSONResponse
+from tests.conftest import make_employees
+
+
+def test_fast_path_matches_pydantic_output():
+    row = {
+        "id": 1, "email": "a@company.com", "full_name": "A", "role": "Employee",
+        "is_active": True, "department_id": 1, "manager_id": None,
+    }
+    for joined in (
+        datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+        datetime(2024, 1, 2, 3, 4, 5),
+    ):
+        data = {**row, "joined_date": joined, "updated_at": joined}
+        data = {name: data[name] for name in EmployeeResponse.model_fields}
+        expected = EmployeeResponse(**data).model_dump_json().encode()
+        assert FastJSONResponse([data]).body == b"[" + expected + b"]"
+
+
+def test_list_endpoint_matches_detail_endpoint(client, department):
+    make_employees(client, department["id"], 3)
+
+    listing = client.get("/api/v1/employees/").json()
+    details = [client.get(f"/api/v1/employees/{emp['id']}").json() for emp in listing]
+
+    assert listing == details
+    assert list(listing[0]) == list(EmployeeResponse.model_fields)
+
+
+def test_openapi_still_documents_employee_schema(client):
+    schema = client.get("/openapi.json").json()
+    listing = schema["paths"]["/api/v1/employees/"]["get"]["responses"]["200"]
+    items = listing["content"]["application/json"]["schema"]["items"]
+
+    assert items == {"$ref": "#/components/schemas/EmployeeResponse"}
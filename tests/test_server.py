@@ -0,0 +1,36 @@
+from app import server
+
+
+def test_options_from_environment(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("KEEPALIVE", "15")
+    monkeypatch.setenv("BACKLOG", "512")
+    monkeypatch.setenv("PORT", "9000")
+
+    options = server.gunicorn_options(server.parse_args([]))
+
+    assert options["workers"] == 3
+    assert options["keepalive"] == 15
+    assert options["backlog"] == 512
+    assert options["bind"] == "0.0.0.0:9000"
+    assert options["worker_class"] == "app.server.ApiWorker"
+
+
+def test_workers_default_to_cpu_count(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 6)
+
+    assert server.gunicorn_options(server.parse_args([]))["workers"] == 6
+    assert server.gunicorn_options(server.parse_args(["--workers", "2"]))["workers"] == 2
+
+
+def test_uvicorn_workers_drain_before_gunicorn_kills_them():
+    from gunicorn.config import Config
+    from gunicorn.glogging import Logger
+
+    cfg = Config()
+    cfg.set("graceful_timeout", 20)
+    worker = server.ApiWorker(0, 0, [], None, 30, cfg, Logger(cfg))
+
+    assert worker.config.timeout_graceful_shutdown == 19
+    assert worker.config.loop == "auto" and worker.config.http == "auto"
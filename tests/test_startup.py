@@ -0,0 +1,65 @@
+import asyncio
+import subprocess
+import sys
+
+from app import startup
+from app.startup import DB_POOL_WARM, Readiness
+from tests.conftest import wait_until_started
+
+
+def test_import_defers_engine_and_alembic():
+    # A fresh interpreter, so modules the test suite already loaded don't count
+    probe = (
+        "import sys, app.main, app.database as db; "
+        "print(db.engine_created(), 'alembic' in sys.modules, 'aiosqlite' in sys.modules)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", probe], text=True)
+    assert output.split() == ["False", "False", "False"]
+
+
+def test_liveness_is_separate_from_readiness(client):
+    assert client.get("/health/live").json() == {"status": "alive"}
+
+    ready = wait_until_started(client)
+
+    assert ready.status_code == 200
+    body = ready.json()
+    assert body["status"] == "ready"
+    assert body["checks"] == {"pool": "ok"}
+    assert body["seconds_to_ready"] >= 0
+
+
+def test_pool_is_warm_when_ready(client):
+    wait_until_started(client)
+
+    pool = client.get("/metrics/pool").json()
+
+    assert pool["checked_in"] >= DB_POOL_WARM
+    assert pool["checked_out"] == 0
+
+
+def test_failed_checks_are_retried_until_they_pass(monkeypatch):
+    monkeypatch.setattr(startup, "STARTUP_RETRY_SECONDS", 0.001)
+    readiness = Readiness()
+    attempts = []
+
+    async def flaky():
+        attempts.append(readiness.status()["checks"]["pool"])
+        if len(attempts) < 3:
+            raise ConnectionError("connection refused")
+
+    assert asyncio.run(readiness.run("pool", flaky))
+    assert attempts == ["pending", "connection refused", "connection refused"]
+    assert readiness.ready
+
+
+def test_retries_stop_at_shutdown(monkeypatch):
+    monkeypatch.setattr(startup, "STARTUP_RETRY_SECONDS", 0.001)
+    readiness = Readiness()
+
+    async def down():
+        readiness.stopping = True
+        raise ConnectionError("connection refused")
+
+    assert not asyncio.run(readiness.run("pool", down))
+    assert readiness.status()["status"] == "stopping"
@@ -0,0 +1,54 @@
+from tests.conftest import make_employees
+
+
+def test_company_stats(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    client.post("/api/v1/departments/", json={"name": "Empty"})
+    make_employees(client, department["id"], 3)
+    client.post("/api/v1/employees/", json={
+        "email": "m@company.com", "full_name": "M", "role": "Manager",
+        "is_active": False, "department_id": other["id"],
+    })
+
+    stats = client.get("/api/v1/stats").json()
+
+    assert stats["total_departments"] == 3
+    assert stats["total_employees"] == 4
+    assert (stats["active_employees"], stats["inactive_employees"]) == (3, 1)
+    assert stats["recent_joiners"] == 4
+    assert stats["by_role"] == {"Employee": 3, "Manager": 1}
+    assert [(d["name"], d["headcount"], d["active_count"]) for d in stats["by_department"]] == [
+        ("Engineering", 3, 3), ("Sales", 1, 0), ("Empty", 0, 0),
+    ]
+
+
+def test_company_stats_are_cached_until_a_write(client, department):
+    client.get("/api/v1/stats")
+    client.get("/api/v1/stats")
+    assert client.get("/metrics/cache").json()["stats"]["hits"] == 1
+
+    make_employees(client, department["id"], 1)
+
+    assert client.get("/api/v1/stats").json()["total_employees"] == 1
+
+
+def test_department_writes_refresh_cached_stats(client):
+    eng = client.post("/api/v1/departments/", json={"name": "Eng"}).json()
+    assert client.get("/api/v1/stats").json()["total_departments"] == 1
+
+    client.post("/api/v1/departments/", json={"name": "Sales"})
+    client.patch(f"/api/v1/departments/{eng['id']}", json={"name": "Engineering"})
+    client.post("/api/v1/departments/bulk", json=[{"name": "Support"}])
+    stats = client.get("/api/v1/stats").json()
+
+    assert stats["total_departments"] == 3
+    assert [d["name"] for d in stats["by_department"]] == ["Engineering", "Sales", "Support"]
+
+
+def test_deleting_a_missing_employee_keeps_cached_stats(client, department):
+    client.get("/api/v1/stats")
+
+    assert client.delete("/api/v1/employees/999").status_code == 404
+    client.get("/api/v1/stats")
+
+    assert client.get("/metrics/cache").json()["stats"]["hits"] == 1
@@ -0,0 +1,152 @@
+from sqlalchemy import event
+
+from app.database import engine
+from tests.conftest import make_employees
+
+
+def record_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("PRAGMA"):
+            statements.append(statement.split()[0])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_patch_employee(client, department):
+    employee = make_employees(client, department["id"], 1)[0]
+    other = make_employees(client, department["id"], 1, prefix="other")[0]
+
+    updated = client.patch(f"/api/v1/employees/{employee['id']}", json={"role": "Lead", "is_active": False})
+    duplicate = client.patch(f"/api/v1/employees/{employee['id']}", json={"email": other["email"]})
+    bad_department = client.patch(f"/api/v1/employees/{employee['id']}", json={"department_id": 999})
+    missing = client.patch("/api/v1/employees/999", json={"role": "Lead"})
+
+    assert updated.status_code == 200
+    assert updated.json()["role"] == "Lead"
+    assert updated.json()["is_active"] is False
+    assert updated.json()["email"] == employee["email"]
+    assert duplicate.status_code == 400
+    assert bad_department.status_code == 404
+    assert missing.status_code == 404
+
+
+def test_patch_rejects_null_for_required_fields(client, department):
+    employee = make_employees(client, department["id"], 1)[0]
+
+    for field in ("email", "full_name", "role", "is_active", "department_id"):
+        response = client.patch(f"/api/v1/employees/{employee['id']}", json={field: None})
+        assert response.status_code == 422, field
+    renamed = client.patch(f"/api/v1/departments/{department['id']}", json={"name": None})
+    cleared = client.patch(f"/api/v1/departments/{department['id']}", json={"description": None})
+
+    assert renamed.status_code == 422
+    assert cleared.status_code == 200
+    assert client.patch(f"/api/v1/employees/{employee['id']}", json={"manager_id": None}).status_code == 200
+    assert client.get(f"/api/v1/employees/{employee['id']}").json()["full_name"] == employee["full_name"]
+
+
+def test_delete_employee(client, department):
+    employee = make_employees(client, department["id"], 1)[0]
+
+    assert client.delete(f"/api/v1/employees/{employee['id']}").status_code == 204
+    assert client.get(f"/api/v1/employees/{employee['id']}").status_code == 404
+    assert client.delete(f"/api/v1/employees/{employee['id']}").status_code == 404
+
+
+def test_patch_and_delete_department(client, department):
+    other = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+
+    renamed = client.patch(f"/api/v1/departments/{department['id']}", json={"name": "Platform"})
+    duplicate = client.patch(f"/api/v1/departments/{department['id']}", json={"name": "Sales"})
+
+    assert renamed.status_code == 200
+    assert renamed.json()["name"] == "Platform"
+    # The cached listing reflects the rename straight away
+    assert client.get(f"/api/v1/departments/{department['id']}").json()["name"] == "Platform"
+    assert duplicate.status_code == 400
+
+    assert client.delete(f"/api/v1/departments/{other['id']}").status_code == 204
+    assert client.get(f"/api/v1/departments/{other['id']}").status_code == 404
+    assert client.delete(f"/api/v1/departments/{other['id']}").status_code == 404
+
+
+def test_delete_department_is_set_based(client, department):
+    make_employees(client, department["id"], 20)
+
+    statements, stop = record_statements()
+    try:
+        response = client.delete(f"/api/v1/departments/{department['id']}")
+    finally:
+        stop()
+
+    assert response.status_code == 204
+    # Detach reports elsewhere, delete the employees, then the department,
+    # then one batch of "deleted" events
+    assert statements == ["UPDATE", "DELETE", "DELETE", "INSERT"]
+    assert client.get("/api/v1/employees/count", params={"exact": True}).json()["total"] == 0
+
+
+def test_deactivate_by_filter(client, department):
+    make_employees(client, department["id"], 5, prefix="ops")
+    make_employees(client, department["id"], 3, prefix="dev")
+
+    statements, stop = record_statements()
+    try:
+        response = client.post("/api/v1/employees/deactivate", params={"email": "ops"})
+    finally:
+        stop()
+
+    assert response.json() == {"affected": 5}
+    assert statements == ["UPDATE", "INSERT"]
+    active = client.get("/api/v1/employees/count", params={"is_active": True, "exact": True}).json()
+    assert active["total"] == 3
+    # Already-inactive rows are not counted again
+    assert client.post("/api/v1/employees/deactivate", params={"email": "ops"}).json() == {"affected": 0}
+
+
+def test_bulk_updates_refresh_cached_counts_and_stats(client, department):
+    target = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    employee = make_employees(client, department["id"], 2)[0]
+    active_here = {"department_id": department["id"], "is_active": True}
+    # Prime the cached count and stats
+    assert client.get("/api/v1/employees/count", params=active_here).json()["total"] == 2
+    assert client.get("/api/v1/stats").json()["active_employees"] == 2
+
+    client.patch(f"/api/v1/employees/{employee['id']}", json={"is_active": False})
+    assert client.get("/api/v1/employees/count", params=active_here).json()["total"] == 1
+    client.post("/api/v1/employees/deactivate", params={"department_id": department["id"]})
+    assert client.get("/api/v1/employees/count", params=active_here).json()["total"] == 0
+    assert client.get("/api/v1/stats").json()["active_employees"] == 0
+    client.post("/api/v1/employees/reassign", json={
+        "from_department_id": department["id"], "to_department_id": target["id"],
+    })
+    assert client.get("/api/v1/employees/count", params={"department_id": target["id"]}).json()["total"] == 2
+
+
+def test_deactivate_requires_a_filter(client, department):
+    make_employees(client, department["id"], 2)
+
+    response = client.post("/api/v1/employees/deactivate")
+
+    assert response.status_code == 400
+    assert client.get("/api/v1/employees/count", params={"is_active": True, "exact": True}).json()["total"] == 2
+
+
+def test_reassign_department(client, department):
+    target = client.post("/api/v1/departments/", json={"name": "Sales"}).json()
+    make_employees(client, department["id"], 4)
+
+    response = client.post("/api/v1/employees/reassign", json={
+        "from_department_id": department["id"], "to_department_id": target["id"],
+    })
+    missing = client.post("/api/v1/employees/reassign", json={
+        "from_department_id": department["id"], "to_department_id": 999,
+    })
+
+    assert response.json() == {"affected": 4}
+    moved = client.get("/api/v1/employees/", params={"department_id": target["id"]}).json()
+    assert len(moved) == 4
+    assert missing.status_code == 404
@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+from app.database import engine
+
+
+def test_create_employee_maps_constraint_errors(client, department):
+    payload = {"email": "dup@company.com", "full_name": "Dup", "department_id": department["id"]}
+    created = client.post("/api/v1/employees/", json=payload)
+    duplicate = client.post("/api/v1/employees/", json=payload)
+    missing_dept = client.post("/api/v1/employees/", json={**payload, "email": "x@company.com", "department_id": 999})
+
+    assert created.status_code == 201
+    assert created.json()["joined_date"] is not None
+    assert duplicate.status_code == 400
+    assert "already exists" in duplicate.json()["detail"]
+    assert missing_dept.status_code == 404
+    assert missing_dept.json()["detail"] == "Department with id 999 not found"
+
+
+def test_create_department_duplicate_name(client, department):
+    response = client.post("/api/v1/departments/", json={"name": department["name"]})
+
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"]
+
+
+def test_create_employee_is_one_insert_plus_its_event(client, department):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        client.post("/api/v1/employees/", json={
+            "email": "one@company.com", "full_name": "One", "department_id": department["id"],
+        })
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    inserts = [s for s in statements if not s.startswith("PRAGMA")]
+    assert [s.split()[:3] for s in inserts] == [["INSERT", "INTO", "employees"], ["INSERT", "INTO", "employee_events"]]